@@ -12,20 +12,27 @@
 # pylint: disable=unused-import
 
 from pathpy.algorithms.matrices import (adjacency_matrix,
-                                        transition_matrix)
+                                        transition_matrix,
+                                        laplacian_matrix)
 
 from pathpy.algorithms.shortest_paths import(distance_matrix,
                                              all_shortest_paths,
                                              single_source_shortest_paths,
+                                             shortest_path,
                                              shortest_path_tree,
                                              diameter,
+                                             eccentricity,
+                                             distance_statistics,
                                              avg_path_length,
                                              all_longest_paths)
 
 from pathpy.algorithms.centralities import (betweenness_centrality,
+                                            edge_betweenness_centrality,
                                             closeness_centrality,
                                             degree_centrality,                                            
                                             eigenvector_centrality,
+                                            pagerank,
+                                            stationary_distribution,
                                             rank_centralities)
 
 from pathpy.algorithms.components import (find_connected_components,
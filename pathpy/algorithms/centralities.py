@@ -9,15 +9,19 @@
 # Copyright (c) 2016-2020 Pathpy Developers
 # =============================================================================
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, Optional
 from collections import defaultdict
+from concurrent.futures import Executor
+import heapq
 import operator
 import numpy as np
+from scipy import sparse
 from scipy.sparse import linalg as spl
 
 from pathpy import logger
 from pathpy.algorithms import shortest_paths
 from pathpy.algorithms.matrices import adjacency_matrix
+from pathpy.utils.parallel import map_partitions
 
 # pseudo load class for type checking
 if TYPE_CHECKING:
@@ -27,15 +31,22 @@ if TYPE_CHECKING:
 LOG = logger(__name__)
 
 
-def betweenness_centrality(network: Network, normalized: bool = False) -> Dict:
+def betweenness_centrality(network: Network, normalized: bool = False,
+                           weight: Union[str, bool, None] = None,
+                           endpoints: bool = False, k: Optional[int] = None,
+                           seed: Optional[int] = None,
+                           n_jobs: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> Dict:
     """Calculates the betweenness centrality of all nodes.
+
     .. note::
 
         If `normalized=False` (default) for each node v the betweenness
         centrality is given as $N_{st}[v]/N_{st}$, where $N_{st}[v]$ is the
         number of shortest paths between nodes s and t passing through v and
-        $N_{st}$ is the number of all shortest paths from s to t. Shortest paths
-        are calculated using the function `shortest_paths.all_shortest_paths`.
+        $N_{st}$ is the number of all shortest paths from s to t. Shortest
+        paths are counted with Brandes' algorithm in O(nm) time for
+        unweighted and O(nm + n^2 log n) time for weighted networks.
 
     Parameters
     ----------
@@ -48,6 +59,35 @@ def betweenness_centrality(network: Network, normalized: bool = False) -> Dict:
         If True the resulting centralities will be normalized such that the
         minimum centrality is zero and the maximum centrality is one.
 
+    weight : bool, str or None, optional (default = None)
+
+        If given, shortest paths are calculated based on the edge weights,
+        i.e. the costs of the edges. See :py:meth:`BaseClass.weight` for
+        details.
+
+    endpoints : bool, optional (default = False)
+
+        If True the source and target nodes of the shortest paths are
+        counted as well.
+
+    k : int, optional (default = None)
+
+        If given, the centralities are approximated based on the shortest
+        paths of k randomly sampled source nodes.
+
+    seed : int, optional (default = None)
+
+        Seed for the random sampling of the source nodes.
+
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the source nodes are partitioned.
+        ``-1`` uses all CPUs.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
     Examples
     --------
     Compute betweenness centrality in a simple network
@@ -61,30 +101,283 @@ def betweenness_centrality(network: Network, normalized: bool = False) -> Dict:
     2.0
 
     """
-    all_paths = shortest_paths.all_shortest_paths(network, weight=False, return_distance_matrix=False)
+    nodes, _ = _betweenness(network, weight, endpoints, k, seed, n_jobs,
+                            executor)
+
     bw: defaultdict = defaultdict(float)
+    for v, value in zip(network.csr.uids, nodes.tolist()):
+        bw[v] = value
+
+    if normalized:
+        _normalize(bw)
+
+    return bw
+
+
+def edge_betweenness_centrality(network: Network, normalized: bool = False,
+                                weight: Union[str, bool, None] = None,
+                                k: Optional[int] = None,
+                                seed: Optional[int] = None,
+                                n_jobs: Optional[int] = None,
+                                executor: Optional[Executor] = None) -> Dict:
+    """Calculates the betweenness centrality of all edges.
+
+    .. note::
+
+        For each edge e the betweenness centrality is given as
+        $N_{st}[e]/N_{st}$, where $N_{st}[e]$ is the number of shortest paths
+        between nodes s and t passing through e and $N_{st}$ is the number of
+        all shortest paths from s to t. Of multiple edges between the same
+        nodes only the edge with the smallest weight is used.
+
+    Parameters
+    ----------
+    network : Network
+
+        The :py:class:`Network` object that contains the network
+
+    normalized : bool
+
+        If True the resulting centralities will be normalized such that the
+        minimum centrality is zero and the maximum centrality is one.
+
+    weight : bool, str or None, optional (default = None)
+
+        If given, shortest paths are calculated based on the edge weights.
+
+    k : int, optional (default = None)
 
-    for s in all_paths:
-        for t in all_paths[s]:
-            for p in all_paths[s][t]:
-                for x in p[1:-1]:
-                    if s != t != x:
-                        bw[x] += 1.0 / len(all_paths[s][t])
+        If given, the centralities are approximated based on the shortest
+        paths of k randomly sampled source nodes.
 
-    # assign zero values to nodes not occurring on shortest paths
-    for v in network.nodes.uids:
-        bw[v] += 0
+    seed : int, optional (default = None)
+
+        Seed for the random sampling of the source nodes.
+
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the source nodes are partitioned.
+        ``-1`` uses all CPUs.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edge('a', 'x', uid='e1')
+    >>> net.add_edge('x', 'b', uid='e2')
+    >>> c = pp.algorithms.centralities.edge_betweenness_centrality(net)
+    >>> c['e1']
+    4.0
+
+    """
+    _, edges = _betweenness(network, weight, False, k, seed, n_jobs,
+                            executor)
+
+    bw: defaultdict = defaultdict(float)
+    for e, value in zip(network.csr.edges, edges.tolist()):
+        bw[e.uid] = value
 
     if normalized:
-        max_centr = max(bw.values())
-        min_centr = min(bw.values())
-        for v in bw:
-            bw[v] = (bw[v] - min_centr) / (max_centr - min_centr)
+        _normalize(bw)
 
     return bw
 
 
-def closeness_centrality(network: Network, normalized: bool = False) -> Dict:
+def _betweenness(network: Network, weight: Union[str, bool, None],
+                 endpoints: bool, k: Optional[int], seed: Optional[int],
+                 n_jobs: Optional[int],
+                 executor: Optional[Executor]) -> Tuple[np.ndarray,
+                                                        np.ndarray]:
+    """Helper function returning the node and edge betweenness arrays."""
+    csr = network.csr
+    n = csr.number_of_nodes()
+
+    if k is None or k >= n:
+        sources = np.arange(n)
+    else:
+        rng = np.random.default_rng(seed)
+        sources = np.sort(rng.choice(n, size=k, replace=False))
+
+    arrays = dict(zip(('indptr', 'indices', 'weights', 'edge_ids'),
+                      shortest_paths._simple_graph(network, weight)))
+    results = map_partitions(_brandes, arrays, sources, n,
+                             csr.number_of_edges(),
+                             weight is not None and weight is not False,
+                             endpoints, n_jobs=n_jobs, executor=executor)
+
+    # reduce the partial results of the source partitions
+    nodes = np.sum([r[0] for r in results], axis=0)
+    edges = np.sum([r[1] for r in results], axis=0)
+
+    # extrapolate the sampled values to all source nodes
+    if len(sources) < n and len(sources) > 0:
+        nodes *= n / len(sources)
+        edges *= n / len(sources)
+
+    return nodes, edges
+
+
+def _brandes(arrays: Dict[str, np.ndarray], sources: np.ndarray, n: int,
+             m: int, weighted: bool,
+             endpoints: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Brandes' algorithm for the given source nodes.
+
+    Parameters
+    ----------
+    arrays : Dict[str, np.ndarray]
+
+        The arrays ``indptr``, ``indices``, ``weights`` and ``edge_ids`` of
+        a graph without parallel edges, see :py:meth:`CSRGraph.simple`.
+
+    sources : np.ndarray
+
+        Integer indices of the source nodes.
+
+    Returns
+    -------
+    tuple
+
+        Returns the (unnormalized) betweenness of the nodes and edges.
+
+    """
+    graph = (arrays['indptr'], arrays['indices'], arrays['weights'],
+             arrays['edge_ids'])
+    nodes = np.zeros(n, dtype=float)
+    edges = np.zeros(m, dtype=float)
+
+    if not weighted:
+        for s in sources.tolist():
+            _bfs_dependencies(s, graph, nodes, edges, endpoints)
+        return nodes, edges
+
+    # pylint: disable=too-many-locals
+    indptr, indices, weights, edge_ids = (a.tolist() for a in graph)
+    _nodes = nodes.tolist()
+    _edges = edges.tolist()
+
+    for s in sources.tolist():
+        order, pred, sigma = _dijkstra_dag(s, indptr, indices, weights, n)
+
+        # accumulate the dependencies in reverse order of the distances
+        delta = [0.0] * n
+        if endpoints:
+            _nodes[s] += len(order) - 1
+        for w in reversed(order):
+            coeff = (1.0 + delta[w]) / sigma[w]
+            for v, i in pred[w]:
+                c = sigma[v] * coeff
+                delta[v] += c
+                _edges[edge_ids[i]] += c
+            if w != s:
+                _nodes[w] += delta[w] + 1.0 if endpoints else delta[w]
+
+    return np.array(_nodes, dtype=float), np.array(_edges, dtype=float)
+
+
+def _bfs_dependencies(s: int, graph: Tuple[np.ndarray, ...],
+                      nodes: np.ndarray, edges: np.ndarray,
+                      endpoints: bool) -> None:
+    """Helper function adding the dependencies of an unweighted source.
+
+    The breadth-first search is processed level by level, where all edges
+    leaving the current level are handled at once.
+
+    """
+    indptr, indices, _, edge_ids = graph
+    n = len(indptr) - 1
+
+    dist = np.full(n, -1, dtype=np.int64)
+    sigma = np.zeros(n, dtype=float)
+    dist[s] = 0
+    sigma[s] = 1.0
+
+    # edges of the shortest path DAG per level
+    levels: list = []
+    frontier = np.array([s])
+    d = 0
+    while frontier.size:
+        starts = indptr[frontier]
+        counts = indptr[frontier+1] - starts
+        arcs = np.arange(counts.sum()) + np.repeat(
+            starts - np.cumsum(counts) + counts, counts)
+        heads = np.repeat(frontier, counts)
+        tails = indices[arcs]
+
+        frontier = np.unique(tails[dist[tails] < 0])
+        dist[frontier] = d + 1
+
+        mask = dist[tails] == d + 1
+        arcs, heads, tails = arcs[mask], heads[mask], tails[mask]
+        np.add.at(sigma, tails, sigma[heads])
+        levels.append((arcs, heads, tails))
+        d += 1
+
+    # accumulate the dependencies in reverse order of the distances
+    delta = np.zeros(n, dtype=float)
+    for arcs, heads, tails in reversed(levels):
+        c = sigma[heads] * (1.0 + delta[tails]) / sigma[tails]
+        np.add.at(delta, heads, c)
+        np.add.at(edges, edge_ids[arcs], c)
+
+    delta[s] = 0.0
+    nodes += delta
+    if endpoints:
+        reached = dist >= 0
+        nodes[reached] += 1.0
+        nodes[s] += np.count_nonzero(reached) - 2
+
+
+def _dijkstra_dag(s: int, indptr: List[int], indices: List[int],
+                  weights: List[float],
+                  n: int) -> Tuple[List[int], List[list], List[float]]:
+    """Helper function for the shortest path DAG of weighted graphs."""
+    dist = [np.inf] * n
+    done = [False] * n
+    sigma = [0.0] * n
+    pred: List[list] = [[] for _ in range(n)]
+    dist[s] = 0.0
+    sigma[s] = 1.0
+
+    order = []
+    heap = [(0.0, s)]
+    while heap:
+        d_v, v = heapq.heappop(heap)
+        if done[v]:
+            continue
+        done[v] = True
+        order.append(v)
+        for i in range(indptr[v], indptr[v+1]):
+            w = indices[i]
+            d_w = d_v + weights[i]
+            if d_w < dist[w]:
+                dist[w] = d_w
+                sigma[w] = sigma[v]
+                pred[w] = [(v, i)]
+                heapq.heappush(heap, (d_w, w))
+            elif d_w == dist[w] and not done[w]:
+                sigma[w] += sigma[v]
+                pred[w].append((v, i))
+
+    return order, pred, sigma
+
+
+def _normalize(values: Dict) -> None:
+    """Helper function for the min-max normalization of centralities."""
+    if not values:
+        return
+    max_centr = max(values.values())
+    min_centr = min(values.values())
+    for v in values:
+        values[v] = (values[v] - min_centr) / (max_centr - min_centr)
+
+
+def closeness_centrality(network: Network, normalized: bool = False,
+                         n_jobs: Optional[int] = None,
+                         executor: Optional[Executor] = None) -> Dict:
     """Calculates the closeness centrality of all nodes.
 
     .. note::
@@ -93,8 +386,8 @@ def closeness_centrality(network: Network, normalized: bool = False) -> Dict:
         is given as 1/sum_w(dist(v,w)) where dist(v,w) is the shortest path
         distance between v and w. For `normalized=True` the counter is
         multiplied by n-1 where n is the number of nodes in the
-        network. Shortest path distances are calculated using the function
-        `shortest_paths.distance_matrix`.
+        network. Shortest path distances are calculated for partitions of
+        the source nodes, i.e. the full distance matrix is not stored.
 
     Parameters
     ----------
@@ -107,6 +400,15 @@ def closeness_centrality(network: Network, normalized: bool = False) -> Dict:
         If True the resulting centralities will be normalized based on the
         average shortest path length.
 
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the source nodes are partitioned.
+        ``-1`` uses all CPUs.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
     Examples
     --------
     Compute closeness centrality in a simple network
@@ -120,26 +422,18 @@ def closeness_centrality(network: Network, normalized: bool = False) -> Dict:
     0.3333333333333333
 
     """
-    distances = shortest_paths.distance_matrix(network)
-    cl: defaultdict = defaultdict(float)
-
-    mapping = {v: k for k, v in network.nodes.index.items()}
-
     n = network.number_of_nodes()
-    # calculate closeness values
-    for d in range(n):
-        for x in range(n):
-            if d != x and distances[d, x] < np.inf:
-                cl[mapping[x]] += distances[d, x]
-
-    # assign centrality zero to nodes not occurring
-    # on higher-order shortest paths
-    for v in network.nodes.uids:
-        cl[v] += 0.0
-        if cl[v] > 0.0:
-            cl[v] = 1.0 / cl[v]
-        if normalized:
-            cl[v] *= n-1
+    sums = shortest_paths.distance_statistics(
+        network, n_jobs=n_jobs, executor=executor)['to_sum'].tolist()
+
+    cl: defaultdict = defaultdict(float)
+    for v, total in zip(network.nodes.keys(), sums):
+        if total > 0.0:
+            cl[v] = 1.0 / total
+            if normalized:
+                cl[v] *= n-1
+        else:
+            cl[v] = 0.0
 
     return cl
 
@@ -225,6 +519,194 @@ def eigenvector_centrality(network: Network, weight: Union[str, bool, None] = No
     return evcent
 
 
+def pagerank(network: Network, alpha: float = 0.85,
+             weight: Union[str, bool, None] = None,
+             personalization: Optional[Dict[str, float]] = None,
+             x0: Optional[Dict[str, float]] = None, tol: float = 1e-10,
+             max_iter: int = 1000, method: str = 'power') -> Dict:
+    """Calculates the PageRank of all nodes.
+
+    .. note::
+
+        The PageRank is the stationary distribution of a random walk which
+        follows an edge with probability `alpha` and otherwise teleports to
+        a node drawn from the personalization vector. Walkers in nodes
+        without successors always teleport. The result of a previous call
+        can be passed as `x0`, such that the PageRank of a slowly changing
+        network is obtained in a few iterations.
+
+    Parameters
+    ----------
+    network : Network
+
+        The :py:class:`Network` object that contains the network
+
+    alpha : float, optional (default = 0.85)
+
+        Probability to follow an edge.
+
+    weight : bool, str or None, optional (default = None)
+
+        If given, the edges are chosen proportional to their weights.
+
+    personalization : dict, optional (default = None)
+
+        Teleportation probabilities of the nodes, which are normalized to
+        one. Missing nodes have a probability of zero. If omitted the nodes
+        are chosen uniformly at random.
+
+    x0 : dict, optional (default = None)
+
+        Initial PageRank values, e.g. the result of a previous call. Nodes
+        which are missing are initialized with 1/n.
+
+    tol : float, optional (default = 1e-10)
+
+        Tolerance for the L1 norm of the change between two iterations.
+
+    max_iter : int, optional (default = 1000)
+
+        Maximum number of iterations.
+
+    method : str, optional (default = 'power')
+
+        Either 'power' for the power iteration or 'gauss-seidel'.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=True)
+    >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'))
+    >>> pr = pp.algorithms.centralities.pagerank(net)
+    >>> round(pr['a'], 4)
+    0.3333
+
+    """
+    A = adjacency_matrix(network, weight=weight)
+    degrees = np.ravel(A.sum(axis=1))
+    inv = np.divide(alpha, degrees, out=np.zeros_like(degrees, dtype=float),
+                    where=degrees > 0)
+    S = sparse.csr_matrix(sparse.diags(inv) @ A)
+
+    uids = list(network.nodes.keys())
+    p = None
+    if personalization is not None:
+        p = np.array([personalization.get(v, 0.0) for v in uids], dtype=float)
+    start = None
+    if x0 is not None:
+        start = np.array([x0.get(v, 1.0 / len(uids)) for v in uids],
+                         dtype=float)
+
+    x = stationary_distribution(S, personalization=p, x0=start, tol=tol,
+                                max_iter=max_iter, method=method)
+    return dict(zip(uids, x.tolist()))
+
+
+def stationary_distribution(matrix: sparse.spmatrix,
+                            personalization: Optional[np.ndarray] = None,
+                            x0: Optional[np.ndarray] = None,
+                            tol: float = 1e-10, max_iter: int = 1000,
+                            method: str = 'power') -> np.ndarray:
+    """Calculates the stationary distribution of a random walk.
+
+    The random walk is given by a sparse matrix S whose rows sum to at most
+    one. The probability missing in a row, e.g. in rows of nodes without
+    successors or due to a damping factor, is the probability to teleport
+    to a node drawn from the personalization vector p. Hence, the
+    stationary distribution x is the solution of
+
+    .. math::
+
+        x = S^T x + (1 - |S^T x|_1) p
+
+    which is found iteratively, where each iteration takes O(n + m)
+    time. If no probability is missing the iteration is applied to the lazy
+    random walk, which has the same stationary distribution but converges
+    for periodic walks as well.
+
+    Parameters
+    ----------
+    matrix : sparse.spmatrix
+
+        Sparse matrix S of the transition probabilities.
+
+    personalization : np.ndarray, optional (default = None)
+
+        Teleportation probabilities p, which are normalized to one. If
+        omitted p is the uniform distribution.
+
+    x0 : np.ndarray, optional (default = None)
+
+        Initial vector of the iteration, e.g. a previous solution.
+
+    tol : float, optional (default = 1e-10)
+
+        Tolerance for the L1 norm of the change between two iterations.
+
+    max_iter : int, optional (default = 1000)
+
+        Maximum number of iterations.
+
+    method : str, optional (default = 'power')
+
+        Either 'power' for the power iteration or 'gauss-seidel', where
+        each sweep solves a triangular system with the lower part of S^T.
+
+    Returns
+    -------
+    np.ndarray
+
+        Returns the stationary distribution ordered as the rows of the
+        matrix.
+
+    """
+    # pylint: disable=too-many-locals
+    if method not in ('power', 'gauss-seidel'):
+        LOG.error('Method must be \'power\' or \'gauss-seidel\'')
+        raise KeyError
+
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    ST = sparse.csr_matrix(matrix, dtype=float).transpose().tocsr()
+
+    if personalization is None:
+        p = np.full(n, 1.0 / n)
+    else:
+        p = np.asarray(personalization, dtype=float)
+        p = p / p.sum()
+
+    x = p.copy() if x0 is None else np.asarray(x0, dtype=float)
+    x = x / x.sum()
+
+    lazy = np.allclose(np.ravel(ST.sum(axis=0)), 1.0)
+
+    if method == 'gauss-seidel':
+        lower = sparse.csr_matrix(sparse.eye(n) - sparse.tril(ST))
+        upper = sparse.triu(ST, k=1, format='csr')
+
+    for _ in range(max_iter):
+        if method == 'power':
+            y = ST @ x
+            y += (1.0 - y.sum()) * p
+            if lazy:
+                y = (x + y) / 2
+        else:
+            missing = 1.0 - (ST @ x).sum()
+            y = spl.spsolve_triangular(lower, upper @ x + missing * p,
+                                       lower=True)
+        y /= y.sum()
+        delta = np.abs(y - x).sum()
+        x = y
+        if delta < tol:
+            break
+    else:
+        LOG.warning('Stationary distribution did not converge in %d '
+                    'iterations', max_iter)
+    return x
+
+
 def rank_centralities(centralities: Dict[str, float]) -> List[Tuple[str, float]]:
     """Returns a list of (node, centrality) tuples in which tuples are ordered
     by centrality in descending order
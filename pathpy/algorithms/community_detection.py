@@ -10,11 +10,12 @@
 # Copyright (c) 2016-2020 Pathpy Developers
 # =============================================================================
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict, Tuple, Iterable, Union
+from typing import TYPE_CHECKING, Dict, Tuple, Iterable, List, Optional, Union
 import numpy as np
-import random
+from scipy import sparse
 
-from pathpy import logger, tqdm
+from pathpy import logger
+from pathpy.statistics.modularity import Q_modularity
 
 # pseudo load class for type checking
 if TYPE_CHECKING:
@@ -24,18 +25,6 @@ if TYPE_CHECKING:
 LOG = logger(__name__)
 
 
-def _Q_merge(network: Network, A, D, n: int, m: int, C: Dict, merge: Set = set()) -> float:
-    """Helper function to compute modularity with merged partitions."""
-    
-    q = 0.0
-    for v in network.nodes.uids:
-        for w in network.nodes.uids:
-            if C[v] == C[w] or (C[v] in merge and C[w] in merge):
-                q += A[network.nodes.index[v], network.nodes.index[w]] - D[v]*D[w]/(2*m)
-    q /= 2*m
-    return q
-
-
 def color_map(network: Network, cluster_mapping: Union[Dict, Iterable], colors: List = None) -> Dict:
     """Returns a dictionary that maps nodes to colors based on their communities.
 
@@ -68,40 +57,378 @@ def color_map(network: Network, cluster_mapping: Union[Dict, Iterable], colors:
     return node_colors
 
 
-def modularity_maximisation(network: Network,
-                            iterations: int = 1000) -> Tuple[Dict, float]:
-    """Modularity maximisation."""
-
-    A = network.adjacency_matrix(weighted=False)    
-    D = network.degrees()
-    n = network.number_of_nodes()
-    m = network.number_of_edges()
-
-    C = {}
-    num_communities = n
-    community_to_nodes = {}
-    c = 0
-    for v in network.nodes.uids:
-        C[v] = c
-        community_to_nodes[c] = set([v])
-        c += 1
-    q = _Q_merge(network, A, D, n, m, C)
-    
-    for i in tqdm(range(iterations), desc='maximising modularity'):
-
-        # randomly choose two communities
-        x, y = random.sample(community_to_nodes.keys(), 2)
-
-        # check Q of merged communities
-        q_new = _Q_merge(network, A, D, n, m, C, merge=set([x, y]))
-
-        if q_new > q:
-            # merge communities
-            for v in community_to_nodes[x]:
-                C[v] = y
-            community_to_nodes[y] = community_to_nodes[y].union(community_to_nodes[x])
-            q = q_new
-            num_communities -=1
-            del community_to_nodes[x]
-        
-    return C, q
+def modularity_maximisation(network: Network, iterations: int = 1000,
+                            weight: Union[str, bool, None] = None,
+                            resolution: float = 1.0,
+                            seed: Optional[int] = None,
+                            refine: bool = True) -> Tuple[Dict, float]:
+    """Modularity maximisation.
+
+    The communities are detected with the Leiden algorithm (or the Louvain
+    algorithm if ``refine`` is False), see :py:func:`leiden`.
+
+    Parameters
+    ----------
+    network : Network
+
+        The network in which communities are detected.
+
+    iterations : int, optional (default = 1000)
+
+        Maximal number of sweeps over all nodes in the local moving phase of
+        every level.
+
+    weight : bool, str or None, optional (default = None)
+
+        The edge attribute used as weight.
+
+    resolution : float, optional (default = 1.0)
+
+        Resolution parameter, where larger values result in smaller
+        communities.
+
+    seed : int, optional (default = None)
+
+        Seed for the random order of the nodes.
+
+    refine : bool, optional (default = True)
+
+        Whether the communities are refined as in the Leiden algorithm.
+
+    Returns
+    -------
+    tuple
+
+        Returns a dictionary mapping node uids to communities and the
+        modularity of the communities as given by
+        :py:func:`pathpy.statistics.Q_modularity`.
+
+    """
+    return _detect_communities(network, weight, resolution, seed, refine,
+                               iterations)
+
+
+def louvain(network: Network, weight: Union[str, bool, None] = None,
+            resolution: float = 1.0,
+            seed: Optional[int] = None) -> Tuple[Dict, float]:
+    """Detects communities with the Louvain algorithm.
+
+    Nodes are repeatedly moved to the neighboring community with the
+    largest modularity gain, after which the communities are aggregated to
+    nodes of a new network and the procedure is repeated until the
+    modularity does not increase anymore [1]_. Modularity gains are
+    computed incrementally from the edge weights of a node to the
+    neighboring communities and the total degrees of the communities. For
+    directed networks the directed modularity with in- and out-degrees is
+    used.
+
+    Parameters
+    ----------
+    network : Network
+
+        The network in which communities are detected.
+
+    weight : bool, str or None, optional (default = None)
+
+        The edge attribute used as weight.
+
+    resolution : float, optional (default = 1.0)
+
+        Resolution parameter, where larger values result in smaller
+        communities.
+
+    seed : int, optional (default = None)
+
+        Seed for the random order of the nodes.
+
+    Returns
+    -------
+    tuple
+
+        Returns a dictionary mapping node uids to communities and the
+        modularity of the communities as given by
+        :py:func:`pathpy.statistics.Q_modularity`.
+
+    References
+    ----------
+    .. [1] V. D. Blondel, J.-L. Guillaume, R. Lambiotte and E. Lefebvre,
+       Fast unfolding of communities in large networks, J. Stat. Mech.
+       (2008) P10008.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'),
+    ...               ('d', 'e'), ('e', 'f'), ('f', 'd'), ('c', 'd'))
+    >>> mapping, q = pp.algorithms.community_detection.louvain(net, seed=1)
+    >>> mapping
+    {'a': 0, 'b': 0, 'c': 0, 'd': 1, 'e': 1, 'f': 1}
+
+    """
+    return _detect_communities(network, weight, resolution, seed, False)
+
+
+def leiden(network: Network, weight: Union[str, bool, None] = None,
+           resolution: float = 1.0,
+           seed: Optional[int] = None) -> Tuple[Dict, float]:
+    """Detects communities with the Leiden algorithm.
+
+    The Leiden algorithm extends the Louvain algorithm (see
+    :py:func:`louvain`) by a refinement of the communities before they are
+    aggregated, which guarantees that the detected communities are
+    connected [1]_.
+
+    Parameters
+    ----------
+    network : Network
+
+        The network in which communities are detected.
+
+    weight : bool, str or None, optional (default = None)
+
+        The edge attribute used as weight.
+
+    resolution : float, optional (default = 1.0)
+
+        Resolution parameter, where larger values result in smaller
+        communities.
+
+    seed : int, optional (default = None)
+
+        Seed for the random order of the nodes and the refinement.
+
+    Returns
+    -------
+    tuple
+
+        Returns a dictionary mapping node uids to communities and the
+        modularity of the communities as given by
+        :py:func:`pathpy.statistics.Q_modularity`.
+
+    References
+    ----------
+    .. [1] V. A. Traag, L. Waltman and N. J. van Eck, From Louvain to
+       Leiden: guaranteeing well-connected communities, Sci. Rep. 9, 5233
+       (2019).
+
+    """
+    return _detect_communities(network, weight, resolution, seed, True)
+
+
+def _detect_communities(network: Network, weight: Union[str, bool, None],
+                        resolution: float, seed: Optional[int], refine: bool,
+                        iterations: int = 1000) -> Tuple[Dict, float]:
+    """Helper function running the Louvain or Leiden algorithm."""
+    A = sparse.csr_matrix(network.adjacency_matrix(weight=weight),
+                          dtype=float)
+    if not network.directed:
+        # count undirected self-loops in both directions
+        A = sparse.csr_matrix(A + sparse.diags(A.diagonal()))
+
+    rng = np.random.default_rng(seed)
+    n = A.shape[0]
+    labels = np.arange(n)
+
+    if n > 0 and A.sum() > 0:
+        labels = _leiden(A, resolution, rng, refine, iterations)
+
+    mapping = dict(zip(network.nodes.keys(), labels.tolist()))
+
+    # the returned quality is the modularity as defined by Q_modularity,
+    # independent of the resolution and the directed objective
+    q = Q_modularity(network, labels) if network.number_of_edges() else 0.0
+    return mapping, float(q)
+
+
+def _leiden(A: sparse.csr_matrix, gamma: float, rng: np.random.Generator,
+            refine: bool, iterations: int) -> np.ndarray:
+    """Helper function returning the communities of the nodes.
+
+    The quality function is the (directed) modularity
+
+        Q = 1/M sum_ij (A_ij - gamma k_i^out k_j^in / M) delta(c_i, c_j)
+
+    which for symmetric adjacency matrices equals the undirected modularity.
+
+    """
+    M = A.sum()
+    labels = np.arange(A.shape[0])
+    partition = np.arange(A.shape[0])
+
+    while True:
+        partition = _move_nodes(A, partition, M, gamma, rng, iterations)
+        n = A.shape[0]
+        if len(np.unique(partition)) == n:
+            break
+
+        aggregate = partition
+        if refine:
+            refined = _refine(A, partition, M, gamma, rng)
+            if len(np.unique(refined)) < n:
+                aggregate = refined
+
+        # aggregate the (refined) communities to nodes
+        aggregate = np.unique(aggregate, return_inverse=True)[1].reshape(-1)
+        P = sparse.csr_matrix((np.ones(n), (np.arange(n), aggregate)))
+        A = sparse.csr_matrix(P.T @ A @ P)
+        labels = aggregate[labels]
+
+        # the aggregated nodes start in the communities of the moving phase
+        initial = np.empty(A.shape[0], dtype=np.int64)
+        initial[aggregate] = partition
+        partition = initial
+
+    return np.unique(partition[labels], return_inverse=True)[1].reshape(-1)
+
+
+def _move_nodes(A: sparse.csr_matrix, partition: np.ndarray, M: float,
+                gamma: float, rng: np.random.Generator,
+                iterations: int) -> np.ndarray:
+    """Helper function moving nodes to the best neighboring community.
+
+    The gain of moving node i into community c is proportional to
+
+        w_ic - gamma (k_i^out K_c^in + k_i^in K_c^out) / M
+
+    where w_ic is the weight of the edges between i and c in both directions
+    and K_c are the total degrees of the community without node i.
+
+    """
+    n = A.shape[0]
+    k_out = np.asarray(A.sum(axis=1)).ravel().tolist()
+    k_in = np.asarray(A.sum(axis=0)).ravel().tolist()
+
+    # neighbors in both directions without self-loops
+    S = sparse.csr_matrix(A + A.T)
+    S.setdiag(0)
+    S.eliminate_zeros()
+    indptr = S.indptr.tolist()
+    indices = S.indices.tolist()
+    data = S.data.tolist()
+
+    labels = partition.tolist()
+    K_out = np.bincount(partition, k_out, minlength=n).tolist()
+    K_in = np.bincount(partition, k_in, minlength=n).tolist()
+    g = gamma / M
+
+    for _ in range(iterations):
+        moved = False
+        for i in rng.permutation(n).tolist():
+            old = labels[i]
+            weights: Dict[int, float] = {old: 0.0}
+            for j in range(indptr[i], indptr[i+1]):
+                c = labels[indices[j]]
+                weights[c] = weights.get(c, 0.0) + data[j]
+
+            K_out[old] -= k_out[i]
+            K_in[old] -= k_in[i]
+
+            best = old
+            best_gain = weights[old] - g * (k_out[i] * K_in[old] +
+                                            k_in[i] * K_out[old])
+            for c, w in weights.items():
+                gain = w - g * (k_out[i] * K_in[c] + k_in[i] * K_out[c])
+                if gain > best_gain + 1e-12:
+                    best, best_gain = c, gain
+
+            K_out[best] += k_out[i]
+            K_in[best] += k_in[i]
+            if best != old:
+                labels[i] = best
+                moved = True
+        if not moved:
+            break
+
+    return np.array(labels, dtype=np.int64)
+
+
+def _refine(A: sparse.csr_matrix, partition: np.ndarray, M: float,
+            gamma: float, rng: np.random.Generator,
+            theta: float = 0.01) -> np.ndarray:
+    """Helper function refining the communities of the moving phase.
+
+    Starting from singletons, nodes are merged within their community with
+    nodes of the same community, if both are well connected to the rest of
+    the community. The merged community is chosen at random with a
+    probability proportional to exp(gain / theta).
+
+    """
+    n = A.shape[0]
+    k_out = np.asarray(A.sum(axis=1)).ravel()
+    k_in = np.asarray(A.sum(axis=0)).ravel()
+    k = (k_out + k_in).tolist()
+
+    # edges in both directions within the communities without self-loops
+    S = sparse.csr_matrix(A + A.T).tocoo()
+    mask = (partition[S.row] == partition[S.col]) & (S.row != S.col)
+    S = sparse.csr_matrix((S.data[mask], (S.row[mask], S.col[mask])),
+                          shape=(n, n))
+    indptr = S.indptr.tolist()
+    indices = S.indices.tolist()
+    data = S.data.tolist()
+
+    # total degrees of the communities and external weights of the nodes
+    K = np.bincount(partition, k_out + k_in, minlength=n).tolist()
+    external = np.asarray(S.sum(axis=1)).ravel().tolist()
+    parent = partition.tolist()
+
+    labels = list(range(n))
+    singleton = [True] * n
+    R_out = k_out.tolist()
+    R_in = k_in.tolist()
+    R = list(k)
+    k_out = k_out.tolist()
+    k_in = k_in.tolist()
+    g = gamma / M
+
+    for i in rng.permutation(n).tolist():
+        C = K[parent[i]]
+        if not singleton[i] or \
+           external[i] < g * k[i] * (C - k[i]) / 2:
+            continue
+
+        weights: Dict[int, float] = {}
+        for j in range(indptr[i], indptr[i+1]):
+            r = labels[indices[j]]
+            if r != i:
+                weights[r] = weights.get(r, 0.0) + data[j]
+
+        candidates = [i]
+        gains = [0.0]
+        for r, w in weights.items():
+            if external[r] < g * R[r] * (C - R[r]) / 2:
+                continue
+            gain = w - g * (k_out[i] * R_in[r] + k_in[i] * R_out[r])
+            if gain >= 0:
+                candidates.append(r)
+                gains.append(gain)
+
+        if len(candidates) == 1:
+            continue
+
+        p = np.exp((np.array(gains) - max(gains)) / (M * theta))
+        r = candidates[rng.choice(len(p), p=p / p.sum())]
+        if r == i:
+            continue
+
+        labels[i] = r
+        singleton[i] = False
+        singleton[r] = False
+        external[r] += external[i] - 2 * weights[r]
+        R_out[r] += k_out[i]
+        R_in[r] += k_in[i]
+        R[r] += k[i]
+
+    return np.array(labels, dtype=np.int64)
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
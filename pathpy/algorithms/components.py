@@ -9,10 +9,11 @@
 # Copyright (c) 2016-2020 Pathpy Developers
 # =============================================================================
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict
-from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Tuple
 
-from pathpy import logger, tqdm
+import numpy as np
+
+from pathpy import logger
 
 # pseudo load class for type checking
 if TYPE_CHECKING:
@@ -21,7 +22,63 @@ if TYPE_CHECKING:
 LOG = logger(__name__)
 
 
-def find_connected_components(network: Network) -> Dict:
+def connected_components(network: Network,
+                         connection: str = 'strong') -> Tuple[int, np.ndarray]:
+    """Computes the component labels of all nodes of a network.
+
+    Strongly connected components are computed with an iterative version of
+    Tarjan's algorithm, i.e. the recursion depth does not depend on the size
+    of the components. Weakly connected components, which are also the
+    components of undirected networks, are computed with a vectorized
+    union-find algorithm over the edge arrays.
+
+    Parameters
+    ----------
+    network : Network
+
+        Network instance
+
+    connection : str, optional (default = 'strong')
+
+        Either ``'strong'`` or ``'weak'``. The connection is ignored for
+        undirected networks.
+
+    Returns
+    -------
+    tuple
+
+        Returns the number of components and an integer array with the
+        component label of every node, ordered as ``network.nodes.index``.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=True)
+    >>> net.add_edges(('a', 'b'), ('b', 'a'), ('b', 'c'))
+    >>> pp.algorithms.components.connected_components(net)
+    (2, array([1, 1, 0]))
+    >>> pp.algorithms.components.connected_components(net, 'weak')
+    (1, array([0, 0, 0]))
+
+    """
+    if connection not in ('strong', 'weak'):
+        LOG.error('Connection "%s" is not supported, use "strong" or "weak"',
+                  connection)
+        raise KeyError
+
+    csr = network.csr
+    n = csr.number_of_nodes()
+
+    if connection == 'weak' or not network.directed:
+        labels = _union_find(csr.sources, csr.targets, n)
+    else:
+        labels = _tarjan(csr.indptr.tolist(), csr.indices.tolist(), n)
+
+    return (int(labels.max()) + 1 if n else 0), labels
+
+
+def find_connected_components(network: Network,
+                              connection: str = 'strong') -> Dict:
     """Computes connected components of a network.
 
     Parameters
@@ -31,67 +88,31 @@ def find_connected_components(network: Network) -> Dict:
 
         Network instance
 
+    connection : str, optional (default = 'strong')
+
+        Either ``'strong'`` or ``'weak'`` connected components of directed
+        networks.
+
     Returns
     -------
 
     dict
 
-        dictionary mapping node uids to components (represented as integer IDs)
+        dictionary mapping components (represented as integer IDs) to the
+        sets of node uids
 
     """
 
     if network.number_of_nodes()==0 or network.number_of_edges()==0:
         return dict()
 
-    # these are used as nonlocal variables in tarjan
-    index: int = 0
-    S: list = []
-    indices: defaultdict = defaultdict(lambda: None)
-    low_link: defaultdict = defaultdict(lambda: None)
-    on_stack: defaultdict = defaultdict(lambda: False)
-    components: dict = {}
-
-    def tarjan(v: str):
-        """Tarjan's algorithm"""
-        nonlocal index
-        nonlocal S
-        nonlocal indices
-        nonlocal low_link
-        nonlocal on_stack
-        nonlocal components
-
-        indices[v] = index
-        low_link[v] = index
-        index += 1
-        S.append(v)
-        on_stack[v] = True
-
-        for node in network.successors[v]:
-            w = node.uid
-            if indices[w] is None:
-                tarjan(w)
-                low_link[v] = min(low_link[v], low_link[w])
-            elif on_stack[w]:
-                low_link[v] = min(low_link[v], indices[w])
-
-        # create component of node v
-        if low_link[v] == indices[v]:
-            components[v] = set()
-            while True:
-                w = S.pop()
-                on_stack[w] = False
-                components[v].add(w)
-                if v == w:
-                    break
-
-    # compute strongly connected components
     LOG.debug('Computing connected components')
-    for v in tqdm(network.nodes.keys(), desc='component calculation'):
-        if indices[v] is None:
-            tarjan(v)
+    k, labels = connected_components(network, connection)
 
-    LOG.debug('Mapping component sizes')
-    return dict(zip(range(len(components)), components.values()))
+    components: Dict[int, set] = {i: set() for i in range(k)}
+    for v, i in zip(network.nodes.keys(), labels.tolist()):
+        components[i].add(v)
+    return components
 
 
 def mean_component_size(network: Network) -> float:
@@ -102,27 +123,22 @@ def mean_component_size(network: Network) -> float:
     return np.mean(component_sizes)
 
 
-def largest_connected_component(network: Network) -> Network:
+def largest_connected_component(network: Network,
+                                connection: str = 'strong') -> Network:
     """Returns the largest connected component of the network.
+
+    The component is returned as read-only view of the subgraph induced by
+    its nodes, see :py:meth:`Network.subgraph`, i.e. the network is not
+    copied.
     """
 
     LOG.debug('Computing connected components')
-    components = find_connected_components(network)
-    max_size = 0
-    max_comp: dict = {}
-    for i in components:
-        if len(components[i]) > max_size:
-            max_size = len(components[i])
-            max_comp = components[i]
-
-    LOG.debug('Copying network')
-    lcc = network.copy()
-
-    LOG.debug('Removing nodes outside largest component')
-    for v in list(lcc.nodes.keys()):
-        if v not in max_comp:
-            lcc.remove_node(v)
-    return lcc
+    k, labels = connected_components(network, connection)
+
+    nodes = np.zeros(len(labels), dtype=bool)
+    if k > 0:
+        nodes = labels == np.argmax(np.bincount(labels))
+    return network.subgraph(nodes)
 
 @property
 def is_connected(network: Network) -> bool:
@@ -138,3 +154,101 @@ def largest_component_size(network: Network) -> int:
         return max(map(len, components.values()))
     else:
         return 0
+
+
+def _tarjan(indptr: list, indices: list, n: int) -> np.ndarray:
+    """Helper function labeling the strongly connected components.
+
+    The depth-first search is performed with an explicit stack of nodes and
+    the positions of their next successors instead of recursive calls.
+
+    """
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    labels = [-1] * n
+    stack: list = []
+    counter = 0
+    k = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+
+        while work:
+            v, pos = work[-1]
+            end = indptr[v+1]
+            while pos < end:
+                w = indices[pos]
+                pos += 1
+                if index[w] == -1:
+                    # continue with the successor and return to v later
+                    work[-1] = (v, pos)
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr[w]))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                # all successors of v are visited
+                work.pop()
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        labels[w] = k
+                        if w == v:
+                            break
+                    k += 1
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+
+    return np.array(labels, dtype=np.int64)
+
+
+def _union_find(sources: np.ndarray, targets: np.ndarray,
+                n: int) -> np.ndarray:
+    """Helper function labeling the weakly connected components.
+
+    In every round the roots of the end points of all edges are linked to
+    the smaller root, followed by path compression via pointer jumping.
+
+    """
+    parent = np.arange(n)
+    while True:
+        u = parent[sources]
+        v = parent[targets]
+        mask = u != v
+        if not mask.any():
+            break
+        np.minimum.at(parent, np.maximum(u[mask], v[mask]),
+                      np.minimum(u[mask], v[mask]))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    return np.unique(parent, return_inverse=True)[1].reshape(-1)
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
@@ -9,7 +9,7 @@
 # Copyright (c) 2016-2019 Pathpy Developers
 # =============================================================================
 from __future__ import annotations
-from typing import Any, List, Union, Optional
+from typing import Any, Union, Optional
 from functools import singledispatch
 
 import numpy as np
@@ -91,8 +91,10 @@ def _network(self, weight: Union[str, bool, None] = None,
     #     for uid, frequency in self.edges.counter().items():
     #         self.edges[uid][weight] = frequency
 
-    # return an adjacency matrix
-    return _adjacency_matrix(self, weight, transposed, directed)
+    # return a copy of the cached adjacency matrix
+    return _cached(self, ('adjacency', weight, transposed, directed), weight,
+                   lambda: _adjacency_matrix(self, weight, transposed,
+                                             directed))
 
 
 # @adjacency_matrix.register(BaseHigherOrderNetwork)
@@ -124,28 +126,23 @@ def _adjacency_matrix(self, weight: Union[str, bool, None] = None,
                       directed: Optional[bool] = None, loops: int = 1) -> sparse.csr_matrix:
     """Function to generate the adjacency matrix."""
 
-    # initializing variables
-    rows: List[int] = list()
-    cols: List[int] = list()
-    entries: List[float] = list()
+    # get the integer indexed topology of the network
+    csr = self.csr
+    n = csr.number_of_nodes()
 
-    # get number of nodes
-    n = self.number_of_nodes()
+    rows = csr.sources
+    cols = csr.targets
+    entries = csr.edge_weights(weight)
 
-    # iterate over the edges of the network
-    for e in self.edges:
-
-        # directed network
-        rows.append(self.nodes.index[e.v.uid])
-        cols.append(self.nodes.index[e.w.uid])
-        entries.append(e.weight(weight))
-
-        # add additional nodes if not directed
-        if directed is False or not self.directed:
-            if e.v.uid != e.w.uid or loops == 2:
-                rows.append(self.nodes.index[e.w.uid])
-                cols.append(self.nodes.index[e.v.uid])
-                entries.append(e.weight(weight))
+    # add additional entries if not directed
+    if directed is False or not self.directed:
+        if loops == 2:
+            mask = np.ones(len(rows), dtype=bool)
+        else:
+            mask = rows != cols
+        rows, cols = (np.concatenate((rows, cols[mask])),
+                      np.concatenate((cols, rows[mask])))
+        entries = np.concatenate((entries, entries[mask]))
 
     A = sparse.csr_matrix((entries, (rows, cols)), shape=(n, n))
     if transposed:
@@ -180,21 +177,96 @@ def transition_matrix(self, weight: Union[str, bool, None] = None,
         Returns the transition matrix, corresponding to the network.
 
     """
-    A = self.adjacency_matrix(weight=weight, transposed=False, **kwargs)
+    def _transition_matrix():
+        A = self.adjacency_matrix(weight=weight, transposed=False, **kwargs)
 
-    # Ignore division by zero warning
-    with np.errstate(divide='ignore'):
-        D = sparse.diags(1/A.sum(axis=1).A1)
+        # Ignore division by zero warning
+        with np.errstate(divide='ignore'):
+            D = sparse.diags(1/A.sum(axis=1).A1)
 
-    # calculate transition matrix
-    T = D*A
+        # calculate transition matrix
+        T = D*A
 
-    # transpose matrix if needed
-    if transposed:
-        T = T.transpose()
+        # transpose matrix if needed
+        if transposed:
+            T = T.transpose()
+
+        # return matrix if needed
+        return T
+
+    key = ('transition', weight, transposed, tuple(sorted(kwargs.items())))
+    return _cached(self, key, weight, _transition_matrix)
+
+
+def laplacian_matrix(self, weight: Union[str, bool, None] = None,
+                     normalized: bool = False,
+                     **kwargs: Any) -> sparse.csr_matrix:
+    """Returns the Laplacian matrix of the network.
 
-    # return matrix if needed
-    return T
+    The Laplacian matrix is the matrix
+
+    .. math::
+
+        L = D - A
+
+    where `D` is a matrix with the node out degrees on the diagonal and `A`
+    is the adjacency matrix of the network. The normalized Laplacian is given
+    by :math:`I - D^{-1/2} A D^{-1/2}`, where nodes without edges have a
+    zero row.
+
+    Parameters
+    ----------
+    weight : string or None, optional (default=None)
+       The name of an edge attribute that holds the numerical value used
+       as a weight.  If None or False, then each edge has weight 1.
+
+    normalized : bool, optional (default=False)
+       Whether to return the normalized Laplacian.
+
+    Returns
+    -------
+    laplacian_matrix : scipy.sparse.csr_matrix
+        Returns the Laplacian matrix, corresponding to the network.
+
+    Examples
+    --------
+    >>> from pathpy import Network
+    >>> net = Network(directed=False)
+    >>> net.add_edges(('a', 'b'), ('b', 'c'))
+    >>> net.laplacian_matrix().todense()
+    [[ 1. -1.  0.]
+     [-1.  2. -1.]
+     [ 0. -1.  1.]]
+
+    """
+    def _laplacian_matrix():
+        A = self.adjacency_matrix(weight=weight, transposed=False, **kwargs)
+        degrees = A.sum(axis=1).A1
+
+        if not normalized:
+            return sparse.csr_matrix(sparse.diags(degrees) - A)
+
+        # Ignore division by zero warning
+        with np.errstate(divide='ignore'):
+            scale = 1/np.sqrt(degrees)
+        scale[~np.isfinite(scale)] = 0
+        D = sparse.diags(scale)
+        I = sparse.diags((degrees > 0).astype(float))
+        return sparse.csr_matrix(I - D*A*D)
+
+    key = ('laplacian', weight, normalized, tuple(sorted(kwargs.items())))
+    return _cached(self, key, weight, _laplacian_matrix)
+
+
+def _cached(self, key: tuple, weight: Union[str, bool, None],
+            func: Any) -> sparse.spmatrix:
+    """Helper function to return a copy of a cached matrix."""
+    cache = getattr(self, 'cache', None)
+    if cache is None:
+        return func()
+
+    attributes = weight is not None and weight is not False
+    return cache.get(key, func, attributes=attributes).copy()
 
 # =============================================================================
 # eof
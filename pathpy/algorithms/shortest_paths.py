@@ -10,12 +10,15 @@
 # =============================================================================
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any, List, Dict, Tuple, Optional, Union
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Executor
+import heapq
 import numpy as np
+from scipy import sparse  # pylint: disable=import-error
 from scipy.sparse import csgraph  # pylint: disable=import-error
-from queue import PriorityQueue
 
 from pathpy import logger, tqdm
+from pathpy.utils.parallel import map_partitions
 
 from ..core import network as net
 
@@ -29,15 +32,25 @@ if TYPE_CHECKING:
 # create logger
 LOG = logger(__name__)
 
+# maximal number of distances which are computed at once per process
+_BLOCK_ENTRIES = 2**22
+
 
 def distance_matrix(network: Network,
-                    weight: Union[str, bool, None] = None) -> np.ndarray:
+                    weight: Union[str, bool, None] = None,
+                    n_jobs: Optional[int] = None,
+                    executor: Optional[Executor] = None,
+                    out: Optional[str] = None) -> np.ndarray:
     """Calculates shortest path distances between all pairs of nodes
 
     .. note::
 
-        Shortest paths are calculated using the implementation 
-        of the Floyd-Warshall algorithm provided in `scipy.csgraph`.
+        Shortest paths are calculated row by row using the implementations
+        of breadth-first search and Dijkstra's algorithm provided in
+        `scipy.csgraph`. For large networks the matrix can be written to a
+        memory-mapped file instead of being held in memory, while aggregated
+        statistics like :py:func:`diameter` or :py:func:`eccentricity` never
+        generate the full matrix.
 
     Parameters
     ----------
@@ -49,6 +62,20 @@ def distance_matrix(network: Network,
 
         If True cheapest paths will be calculated.
 
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the rows of the matrix are
+        partitioned. ``-1`` uses all CPUs.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
+    out : str, optional (default = None)
+
+        If given, the matrix is written block by block to a memory-mapped
+        file with this name, which is returned as ``numpy.memmap``.
+
     Examples
     --------
     Generate a path and add it to the network.
@@ -67,12 +94,169 @@ def distance_matrix(network: Network,
     >>> m[0,3]
     2
     """
-
     A = network.adjacency_matrix(weight=weight)
-    dist_matrix = csgraph.floyd_warshall(
-        A, network.directed, unweighted=(not weight), overwrite=False)
+    n = network.number_of_nodes()
+
+    arrays = {'indptr': A.indptr, 'indices': A.indices, 'data': A.data}
+
+    if out is not None:
+        D = np.memmap(out, dtype=float, mode='w+', shape=(n, n))
+        del D
+        map_partitions(_write_distance_rows, arrays, np.arange(n), n,
+                       network.directed, bool(weight), out, n_jobs=n_jobs,
+                       executor=executor)
+        return np.memmap(out, dtype=float, mode='r+', shape=(n, n))
+
+    rows = map_partitions(_distance_rows, arrays, np.arange(n), n,
+                          network.directed, bool(weight), n_jobs=n_jobs,
+                          executor=executor)
+
+    # the partitions are returned in the order of the source nodes
+    return np.concatenate(rows) if n else np.zeros((0, 0))
+
+
+def eccentricity(network: Network, weight: Union[str, bool, None] = None,
+                 n_jobs: Optional[int] = None,
+                 executor: Optional[Executor] = None) -> Dict[str, float]:
+    """Calculates the eccentricity of all nodes.
+
+    The eccentricity of a node v is the largest shortest path distance from v
+    to any other node, i.e. it is infinite if not all nodes are reachable.
+    The distances are computed per block of source nodes, i.e. the full
+    distance matrix is not stored.
+
+    Parameters
+    ----------
+    network : Network
+
+        The :py:class:`Network` object that contains the network
+
+    weight : bool, str or None, optional (default = None)
+
+        If given, cheapest paths will be calculated.
+
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the source nodes are partitioned.
+        ``-1`` uses all CPUs.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edges(('a', 'x'), ('x', 'c'))
+    >>> pp.algorithms.shortest_paths.eccentricity(net)
+    {'a': 2.0, 'x': 1.0, 'c': 2.0}
 
-    return dist_matrix
+    """
+    ecc = distance_statistics(network, weight, n_jobs, executor)['max']
+    return dict(zip(network.nodes.keys(), ecc.tolist()))
+
+
+def distance_statistics(network: Network,
+                        weight: Union[str, bool, None] = None,
+                        n_jobs: Optional[int] = None,
+                        executor: Optional[Executor] = None
+                        ) -> Dict[str, Any]:
+    """Aggregates the shortest path distances without storing all of them.
+
+    The rows of the distance matrix are computed per block of source nodes
+    and aggregated immediately, i.e. the memory is linear in the number of
+    nodes.
+
+    Parameters
+    ----------
+    network : Network
+
+        The :py:class:`Network` object that contains the network
+
+    weight : bool, str or None, optional (default = None)
+
+        If given, cheapest paths will be calculated.
+
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the source nodes are partitioned.
+        ``-1`` uses all CPUs.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
+    Returns
+    -------
+    dict
+
+        Returns a dictionary with the largest distance from each node
+        (``max``), the sum of all finite distances to each node
+        (``to_sum``), the sum (``sum``) and the number (``nonzero``) of all
+        non-zero distances (including infinite ones). Arrays are ordered as
+        ``network.nodes.index``.
+
+    """
+    A = network.adjacency_matrix(weight=weight)
+    n = network.number_of_nodes()
+
+    arrays = {'indptr': A.indptr, 'indices': A.indices, 'data': A.data}
+    results = map_partitions(_distance_statistics, arrays, np.arange(n), n,
+                             network.directed, bool(weight), n_jobs=n_jobs,
+                             executor=executor)
+
+    # reduce the statistics of the source partitions
+    return {'max': np.concatenate([r['max'] for r in results]),
+            'to_sum': np.sum([r['to_sum'] for r in results], axis=0),
+            'sum': sum(r['sum'] for r in results),
+            'nonzero': sum(r['nonzero'] for r in results)}
+
+
+def _blocks(sources: np.ndarray, n: int) -> List[np.ndarray]:
+    """Helper function splitting sources into blocks of bounded memory."""
+    size = max(1, _BLOCK_ENTRIES // max(n, 1))
+    return [sources[i:i+size] for i in range(0, len(sources), size)]
+
+
+def _distance_rows(arrays: Dict[str, np.ndarray], sources: np.ndarray, n: int,
+                   directed: bool, weighted: bool) -> np.ndarray:
+    """Helper function computing the distances from the given sources."""
+    if len(sources) == 0:
+        return np.zeros((0, n))
+    A = sparse.csr_matrix((arrays['data'], arrays['indices'],
+                           arrays['indptr']), shape=(n, n))
+    return csgraph.shortest_path(A, directed=directed,
+                                 unweighted=not weighted, indices=sources)
+
+
+def _write_distance_rows(arrays: Dict[str, np.ndarray], sources: np.ndarray,
+                         n: int, directed: bool, weighted: bool,
+                         out: str) -> None:
+    """Helper function writing the distances to a memory-mapped file."""
+    D = np.memmap(out, dtype=float, mode='r+', shape=(n, n))
+    for block in _blocks(sources, n):
+        D[block] = _distance_rows(arrays, block, n, directed, weighted)
+    D.flush()
+
+
+def _distance_statistics(arrays: Dict[str, np.ndarray], sources: np.ndarray,
+                         n: int, directed: bool,
+                         weighted: bool) -> Dict[str, Any]:
+    """Helper function aggregating the distances from the given sources."""
+    stats: Dict[str, Any] = {'max': np.zeros(len(sources)),
+                             'to_sum': np.zeros(n), 'sum': 0.0, 'nonzero': 0}
+    start = 0
+    for block in _blocks(sources, n):
+        dist = _distance_rows(arrays, block, n, directed, weighted)
+        stats['max'][start:start+len(block)] = dist.max(axis=1)
+        stats['sum'] += dist.sum()
+        stats['nonzero'] += np.count_nonzero(dist)
+
+        dist[~np.isfinite(dist)] = 0.0
+        stats['to_sum'] += dist.sum(axis=0)
+        start += len(block)
+    return stats
 
 
 def all_shortest_paths(network: Network,
@@ -163,62 +347,129 @@ def all_shortest_paths(network: Network,
         return s_p
 
 
-def single_source_shortest_paths(network: Network, source: str, weight: Union[bool, str, None] = None) -> Union[dict, np.array]:
-    """Calculates all shortest paths from a single given source node using a 
-    custom implementation of Dijkstra's algorithm based on a priority queue.
-    """
-    Q: dict = dict()
-    dist = dict()
-    prev = dict()
-    dist[source] = 0
+def single_source_shortest_paths(network: Network, source: str,
+                                 weight: Union[bool, str, None] = None
+                                 ) -> Tuple[np.ndarray, dict]:
+    """Calculates all shortest paths from a single given source node.
 
-    for v in network.nodes.uids:
-        if v != source:
-            dist[v] = np.inf
-            prev[v] = None
-        Q[v] = dist[v]
-
-    while Q:
-        u = min(Q.keys(), key=(lambda k: Q[k])) # TODO: Do this more efficiently with a proper priority queue
-        del Q[u]
-        for v in network.successors[u]:
-            
-            # for networks with no edge costs, edges have constant cost
-            cost = 1
-            
-            if weight == True:
-                cost = list(network.edges[u,v])[0].attributes['weight']
-            elif weight != False and weight !=None:
-                cost = list(network.edges[u,v])[0].attributes[weight]
-
-            new_dist = dist[u] + cost
-
-            if new_dist < dist[v.uid]:                
-                dist[v.uid] = new_dist
-                prev[v.uid] = u
-                if v.uid in Q:
-                    Q[v.uid] = new_dist
-    
-    # calculate distance vector
-    dist_arr = np.zeros(network.number_of_nodes())
-    for v in network.nodes:
-        dist_arr[network.nodes.index[v.uid]] = dist[v.uid]
+    .. note::
+
+        For unweighted networks a breadth-first search is used, otherwise
+        Dijkstra's algorithm based on a binary heap, i.e. the paths are
+        calculated in O(n + m) and O(m log n) time respectively.
+
+    Parameters
+    ----------
+    network : Network
+
+        The :py:class:`Network` object that contains the network
 
-    # construct shortest paths 
+    source : str
+
+        The uid of the source node.
+
+    weight : bool, str or None, optional (default = None)
+
+        If given, cheapest paths are calculated based on the edge weights.
+
+    Returns
+    -------
+    tuple
+
+        Returns an array with the distances ordered as ``network.nodes.index``
+        and a dictionary mapping the uids of the target nodes to the shortest
+        path from the source (or None if the target is not reachable).
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network()
+    >>> net.add_edges(('a', 'x'), ('x', 'c'))
+    >>> dist, paths = pp.algorithms.shortest_paths.single_source_shortest_paths(net, 'a')
+    >>> dist
+    array([0., 1., 2.])
+    >>> paths['c']
+    ('a', 'x', 'c')
+
+    """
+    uids = network.csr.uids
+    s = network.csr.index[source]
+    dist, prev = _single_source(_simple_graph(network, weight), s,
+                                _weighted(weight))
+
+    # construct shortest paths
     s_p: dict = dict()
-    for dest in network.nodes:
-        if dest.uid != source:
-            path = [dest.uid]
-            x = dest.uid
-            while x != source and x != None:
-                x = prev[x]
-                path.append(x)
-            if x == None:
-                s_p[dest.uid] = None
-            else:
-                path.reverse()
-                s_p[dest.uid] = tuple(path)
-    return dist_arr, s_p
+    for t, uid in enumerate(uids):
+        if t != s:
+            s_p[uid] = _path(prev, s, t, uids)
+
+    return np.array(dist, dtype=float), s_p
+
+
+def shortest_path(network: Network, source: str, target: str,
+                  weight: Union[bool, str, None] = None,
+                  bidirectional: bool = False) -> Tuple[float, Optional[tuple]]:
+    """Calculates a shortest path between a single pair of nodes.
+
+    The search stops as soon as the target node is reached. If
+    ``bidirectional`` is True, the search is started simultaneously from the
+    source and (on the reversed network) from the target node, which
+    typically visits much fewer nodes in large networks.
+
+    Parameters
+    ----------
+    network : Network
+
+        The :py:class:`Network` object that contains the network
+
+    source : str
+
+        The uid of the source node.
+
+    target : str
+
+        The uid of the target node.
+
+    weight : bool, str or None, optional (default = None)
+
+        If given, cheapest paths are calculated based on the edge weights.
+
+    bidirectional : bool, optional (default = False)
+
+        If True, a bidirectional search is used.
+
+    Returns
+    -------
+    tuple
+
+        Returns the distance and a tuple of the node uids on the shortest
+        path. If the target is not reachable ``(inf, None)`` is returned.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network()
+    >>> net.add_edges(('a', 'x'), ('x', 'c'), ('a', 'c'))
+    >>> pp.algorithms.shortest_paths.shortest_path(net, 'a', 'c')
+    (1.0, ('a', 'c'))
+
+    """
+    uids = network.csr.uids
+    s = network.csr.index[source]
+    t = network.csr.index[target]
+    weighted = _weighted(weight)
+
+    if not bidirectional:
+        dist, prev = _single_source(_simple_graph(network, weight), s,
+                                    weighted, target=t)
+        return float(dist[t]), _path(prev, s, t, uids)
+
+    forward = _simple_graph(network, weight)
+    backward = _simple_graph(network, weight, transposed=network.directed)
+    distance, path = _bidirectional(forward, backward, s, t, weighted)
+    if path is None:
+        return np.inf, None
+    return distance, tuple(uids[v] for v in path)
 
 
 def shortest_path_tree(network: Network, source: str, weight: Union[bool, str, None] = None) -> Network:
@@ -227,52 +478,158 @@ def shortest_path_tree(network: Network, source: str, weight: Union[bool, str, N
 
     n_tree = net.Network(directed = True)
 
-    Q: dict = dict()
-    dist = dict()
-    prev = dict()
-    dist[source] = 0
+    uids = network.csr.uids
+    _, prev = _single_source(_simple_graph(network, weight),
+                             network.csr.index[source], _weighted(weight))
 
-    for v in network.nodes.uids:
-        if v != source:
-            dist[v] = np.inf
-            prev[v] = None
-        Q[v] = dist[v]
-
-    while Q:
-        u = min(Q.keys(), key=(lambda k: Q[k])) # TODO: Do this more efficiently with a proper priority queue
-        del Q[u]
-        for v in network.successors[u]:
-            # for networks with no edge costs, edges have constant cost
-            cost = 1
-            
-            if weight == True:
-                cost = list(network.edges[u,v])[0].attributes['weight']
-            elif weight != False and weight !=None:
-                cost = list(network.edges[u,v])[0].attributes[weight]
+    for k, v in enumerate(prev):
+        if v >= 0:
+            n_tree.add_edge(uids[v], uids[k])
 
-            new_dist = dist[u] + cost
-            
-            if new_dist < dist[v.uid]:                
-                dist[v.uid] = new_dist
-                prev[v.uid] = u
-                if v.uid in Q:
-                    Q[v.uid] = new_dist
+    return n_tree
 
-    for k, v in prev.items():
-        if v != None:
-            n_tree.add_edge(v, k)
 
-    return n_tree
+def _weighted(weight: Union[bool, str, None]) -> bool:
+    """Helper function returning if a weight is used."""
+    return weight is not None and weight is not False
+
+
+def _simple_graph(network: Network, weight: Union[bool, str, None],
+                  transposed: bool = False) -> Tuple[np.ndarray, ...]:
+    """Helper function returning the cached arrays without parallel edges."""
+    return network.cache.get(
+        ('simple', weight, transposed),
+        lambda: network.csr.simple(weight, transposed=transposed),
+        attributes=_weighted(weight))
+
+
+def _path(prev: List[int], s: int, t: int,
+          uids: Tuple[str, ...]) -> Optional[tuple]:
+    """Helper function to reconstruct a path from the predecessors."""
+    path = [t]
+    while path[-1] != s:
+        if prev[path[-1]] < 0:
+            return None
+        path.append(prev[path[-1]])
+    return tuple(uids[v] for v in reversed(path))
+
+
+def _single_source(graph: Tuple[np.ndarray, ...], s: int, weighted: bool,
+                   target: Optional[int] = None) -> Tuple[list, list]:
+    """Helper function for breadth-first search and Dijkstra's algorithm.
+
+    Returns the distances and predecessors of all nodes, where unreachable
+    nodes have the distance inf and the predecessor -1. If a target is
+    given the search stops as soon as the target is reached.
+
+    """
+    indptr, indices, weights, _ = graph
+    n = len(indptr) - 1
+    dist = [np.inf] * n
+    prev = [-1] * n
+    dist[s] = 0.0
+
+    if not weighted:
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            if v == target:
+                break
+            d_w = dist[v] + 1.0
+            for w in indices[indptr[v]:indptr[v+1]].tolist():
+                if dist[w] == np.inf:
+                    dist[w] = d_w
+                    prev[w] = v
+                    queue.append(w)
+        return dist, prev
+
+    done = [False] * n
+    heap = [(0.0, s)]
+    while heap:
+        d_v, v = heapq.heappop(heap)
+        if done[v]:
+            continue
+        done[v] = True
+        if v == target:
+            break
+        a, b = indptr[v], indptr[v+1]
+        for w, cost in zip(indices[a:b].tolist(), weights[a:b].tolist()):
+            d_w = d_v + cost
+            if d_w < dist[w]:
+                dist[w] = d_w
+                prev[w] = v
+                heapq.heappush(heap, (d_w, w))
+    return dist, prev
+
+
+def _bidirectional(forward: Tuple[np.ndarray, ...],
+                   backward: Tuple[np.ndarray, ...], s: int, t: int,
+                   weighted: bool) -> Tuple[float, Optional[List[int]]]:
+    """Helper function for the bidirectional Dijkstra's algorithm.
+
+    The searches from the source (on the graph) and from the target (on the
+    reversed graph) are expanded alternately until the sum of the smallest
+    distances in both heaps exceeds the shortest path found so far.
+
+    """
+    # pylint: disable=too-many-locals
+    graphs = (forward, backward)
+    dist: Tuple[dict, dict] = ({s: 0.0}, {t: 0.0})
+    prev: Tuple[dict, dict] = ({s: -1}, {t: -1})
+    done: Tuple[set, set] = (set(), set())
+    heaps: Tuple[list, list] = ([(0.0, s)], [(0.0, t)])
+
+    best = np.inf
+    meet = -1
+    if s == t:
+        best, meet = 0.0, s
+
+    side = 0
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        d_v, v = heapq.heappop(heaps[side])
+        if v not in done[side]:
+            done[side].add(v)
+            indptr, indices, weights, _ = graphs[side]
+            a, b = indptr[v], indptr[v+1]
+            costs = weights[a:b].tolist() if weighted else [1.0] * (b - a)
+            for w, cost in zip(indices[a:b].tolist(), costs):
+                d_w = d_v + cost
+                if d_w < dist[side].get(w, np.inf):
+                    dist[side][w] = d_w
+                    prev[side][w] = v
+                    heapq.heappush(heaps[side], (d_w, w))
+                # check if a shorter connection of both searches is found
+                if w in dist[1-side] and d_w + dist[1-side][w] < best:
+                    best = d_w + dist[1-side][w]
+                    meet = w
+        side = 1 - side
+
+    if meet < 0:
+        return np.inf, None
+
+    # combine the paths from the source and to the target
+    path = [meet]
+    while prev[0][path[-1]] >= 0:
+        path.append(prev[0][path[-1]])
+    path.reverse()
+    while prev[1][path[-1]] >= 0:
+        path.append(prev[1][path[-1]])
+    return best, path
 
 
 def diameter(network: Network,
-             weight: Union[str, bool, None] = None) -> float:
+             weight: Union[str, bool, None] = None,
+             n_jobs: Optional[int] = None,
+             executor: Optional[Executor] = None) -> float:
     """Calculates the length of the longest shortest path
 
     .. note::
 
-        Shortest path lengths are calculated using the implementation
-        of the Floyd-Warshall algorithm in scipy.csgraph.
+        Shortest path lengths are calculated per block of source nodes
+        using scipy.csgraph, see :py:func:`distance_statistics`.
 
     Parameters
     ----------
@@ -284,6 +641,14 @@ def diameter(network: Network,
 
         If True cheapest paths will be calculated.
 
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the source nodes are partitioned.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
     Examples
     --------
     Generate simple network
@@ -301,7 +666,8 @@ def diameter(network: Network,
     >>> pp.algorithms.shortest_paths.diameter(net)
     1
     """
-    return np.max(distance_matrix(network, weight=weight))
+    return np.max(distance_statistics(network, weight, n_jobs,
+                                      executor)['max'])
 
 
 def all_longest_paths(network: Network,
@@ -347,7 +713,9 @@ def all_longest_paths(network: Network,
 
 def avg_path_length(network: Network,
                     weight: Union[str, bool, None] = None,
-                    exclude_zero: bool = True) -> float:
+                    exclude_zero: bool = True,
+                    n_jobs: Optional[int] = None,
+                    executor: Optional[Executor] = None) -> float:
     """Calculates the average shortest path length in directed or undirected
     networks, according to the definition
 
@@ -359,8 +727,8 @@ def avg_path_length(network: Network,
 
     .. note::
 
-        Shortest path lengths are calculated using the implementation
-        of the Floyd-Warshall algorithm in scipy.csgraph.
+        Shortest path lengths are calculated per block of source nodes
+        using scipy.csgraph, see :py:func:`distance_statistics`.
 
     Parameters
     ----------
@@ -376,6 +744,14 @@ def avg_path_length(network: Network,
 
         If True, (zero) diagonal entries in the distance matrix will be included in the average shortest path length.
 
+    n_jobs : int, optional (default = None)
+
+        Number of processes among which the source nodes are partitioned.
+
+    executor : Executor, optional (default = None)
+
+        Process pool executor which is used instead of a new pool.
+
     Examples
     --------
     Generate a simple network with two edges.
@@ -397,8 +773,8 @@ def avg_path_length(network: Network,
     >>> pp.algorithms.shortest_paths.avg_path_length(net, exclude_zero=False)
     0.8888
     """
-    D = distance_matrix(network, weight=weight)
+    stats = distance_statistics(network, weight, n_jobs, executor)
 
     if exclude_zero:
-        D = D[np.nonzero(D)]
-    return np.sum(D)/np.size(D)
+        return np.float64(stats['sum'])/stats['nonzero']
+    return np.float64(stats['sum'])/network.number_of_nodes()**2
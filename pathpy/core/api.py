@@ -14,7 +14,7 @@
 from pathpy.core.node import Node
 from pathpy.core.edge import Edge
 from pathpy.core.path import Path
-from pathpy.core.network import Network
+from pathpy.core.network import Network, NetworkView
 
 # =============================================================================
 # eof
@@ -20,6 +20,15 @@ from .collecions import (
     BaseCollection,
 )
 
+from .storage import (
+    CSRGraph,
+    GraphStorage,
+)
+
+from .cache import (
+    MatrixCache,
+)
+
 from .classes import (
     BaseClass,
     BaseNode,
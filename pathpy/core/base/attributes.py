@@ -22,6 +22,10 @@ log = logger(__name__)
 class Attributes:
     """Wrapper for the object attributes."""
 
+    # counter of the attribute modifications of all objects, which is used to
+    # invalidate cached results depending on attributes, e.g. weights
+    revision: int = 0
+
     def __init__(self, uid: str = None, history: bool = None,
                  multi_attributes: bool = None, frequency: str = None,
                  ** kwargs: Any) -> None:
@@ -106,6 +110,8 @@ class Attributes:
 
         # update kwargs if given
         if kwargs:
+            Attributes.revision += 1
+
             # if noting is defiend overwrite empty dict
             if ((len(self.data) == 1 and not self.data[self.index]) or
                     (not self.history)):
@@ -254,6 +260,8 @@ class TemporalAttributes(Attributes):
 
         # update kwargs if given
         if kwargs:
+            Attributes.revision += 1
+
             # if noting is defiend overwrite empty dict
             if ((len(self.data) == 1 and not self.data[self.index]) or
                     (not self.history)):
@@ -0,0 +1,120 @@
+"""Cache for results derived from the network topology."""
+# !/usr/bin/python -tt
+# -*- coding: utf-8 -*-
+# =============================================================================
+# File      : cache.py -- Versioned cache for matrices of a network
+# Author    : agent <agent@local>
+# Time-stamp: <Fri 2026-10-16 19:42 agent>
+#
+# Copyright (c) 2016-2020 Pathpy Developers
+# =============================================================================
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from pathpy.core.base.attributes import Attributes
+
+
+class MatrixCache:
+    """Versioned cache for matrices and other results of a network.
+
+    The cache stores results, e.g. adjacency or transition matrices, under a
+    key which contains the arguments used to generate them. All entries are
+    tagged with the version of the network topology, which is given by the
+    callable ``version``. If the topology changes, e.g. because nodes or
+    edges were added or removed, all entries are invalidated. Entries which
+    depend on attributes, e.g. on edge weights, are additionally invalidated
+    if any attribute is modified.
+
+    Parameters
+    ----------
+    version : Callable
+
+        Function without arguments returning the current version of the
+        topology. The version has to change with every modification.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network()
+    >>> net.add_edges(('a', 'b'), ('b', 'c'))
+    >>> A = net.adjacency_matrix()
+    >>> A = net.adjacency_matrix()
+    >>> net.cache.info()
+    {'hits': 1, 'misses': 1, 'size': 1}
+
+    """
+
+    def __init__(self, version: Callable[[], Hashable]) -> None:
+        """Initialize the cache."""
+        self._version: Callable[[], Hashable] = version
+        self._current: Optional[Hashable] = None
+        self._entries: Dict[Hashable, tuple] = {}
+
+        # statistics of the cache usage
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        """Returns the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, func: Callable[[], Any],
+            attributes: bool = False) -> Any:
+        """Returns the cached entry for the key or generates it.
+
+        Parameters
+        ----------
+        key : Hashable
+
+            Key of the entry, which should contain all arguments used to
+            generate the entry.
+
+        func : Callable
+
+            Function without arguments generating the entry if it is not
+            cached yet.
+
+        attributes : bool, optional (default = False)
+
+            If True, the entry depends on attributes and is invalidated if
+            any attribute is modified.
+
+        """
+        version = self._version()
+        if version != self._current:
+            self._entries.clear()
+            self._current = version
+
+        revision = Attributes.revision if attributes else None
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] == revision:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = func()
+        self._entries[key] = (revision, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """Returns the number of hits, misses and cached entries."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries)}
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
@@ -9,7 +9,8 @@
 # Copyright (c) 2016-2019 Pathpy Developers
 # =============================================================================
 from __future__ import annotations
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, Mapping, Optional
+from types import MappingProxyType
 
 
 class BaseCollection:
@@ -20,6 +21,16 @@ class BaseCollection:
         # initialize variables
         self._map: dict = dict()
 
+        # stable integer slots of the stored objects, i.e. slots are assigned
+        # incrementally and are not reused if an object is removed
+        self._slots: dict = dict()
+        self._next_slot: int = 0
+
+        # counter of the modifications and cached index of the objects
+        self._version: int = 0
+        self._index: Optional[Dict[str, int]] = None
+        self._index_key: Optional[tuple] = None
+
     def __len__(self) -> int:
         """Returns the number of nodes"""
         return len(self._map)
@@ -35,9 +46,9 @@ class BaseCollection:
     def __contains__(self, item: Any) -> bool:
         """Returns if item is in nodes."""
         _contain: bool = False
-        if item in self._map.values():
+        if isinstance(item, str) and item in self._map:
             _contain = True
-        elif isinstance(item, str) and item in self._map:
+        elif hasattr(item, 'uid') and self._map.get(item.uid) is item:
             _contain = True
         return _contain
 
@@ -47,7 +58,11 @@ class BaseCollection:
 
     def __setitem__(self, key: Any, value: Any) -> None:
         """set a object"""
+        if key not in self._map:
+            self._slots[key] = self._next_slot
+            self._next_slot += 1
         self._map[key] = value
+        self._version += 1
 
     def items(self):
         """Return a new view of the container’s items ((key, value) pairs)."""
@@ -63,7 +78,9 @@ class BaseCollection:
 
     def pop(self, key, default: Any = KeyError) -> Any:
         """Pop item form dict"""
+        self._slots.pop(key, None)
         self._map.pop(key, default)
+        self._version += 1
 
     @property
     def uids(self) -> Set[str]:
@@ -71,20 +88,32 @@ class BaseCollection:
         return set(self._map)
 
     @property
-    def index(self) -> Dict[str, int]:
+    def index(self) -> Mapping[str, int]:
         """Returns a dictionary that maps object uids to  integer indices.
 
         The indices of nodes correspond to the row/column ordering of objects
         in any list/array/matrix representation generated by pathpy, e.g. for
         degrees.sequence or adjacency_matrix.
 
+        The index is cached and only regenerated if objects were added or
+        removed. Hence, a read-only view of the cached dictionary is returned.
+
         Returns
         -------
-        dict
+        Mapping
             maps node uids to zero-based integer index
 
         """
-        return dict(zip(self._map, range(len(self))))
+        key = (self._version, len(self._map))
+        if self._index is None or key != self._index_key:
+            self._index = dict(zip(self._map, range(len(self))))
+            self._index_key = key
+        return MappingProxyType(self._index)
+
+    @property
+    def version(self) -> int:
+        """Returns a counter which is increased with every modification."""
+        return self._version
 
     @property
     def dict(self) -> Dict:
@@ -94,7 +123,7 @@ class BaseCollection:
     def contain(self, other: Any) -> bool:
         """Returns true if node is available."""
         boolean: bool
-        if other not in self and other.uid not in self.uids:
+        if other not in self and other.uid not in self._map:
             boolean = False
         else:
             boolean = True
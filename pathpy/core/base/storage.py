@@ -0,0 +1,384 @@
+"""Array-backed storage of network topologies."""
+# !/usr/bin/python -tt
+# -*- coding: utf-8 -*-
+# =============================================================================
+# File      : storage.py -- Integer indexed storage for network topologies
+# Author    : agent <agent@local>
+# Time-stamp: <Fri 2026-10-16 19:36 agent>
+#
+# Copyright (c) 2016-2020 Pathpy Developers
+# =============================================================================
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, Tuple, Union, Optional
+
+import numpy as np
+from scipy import sparse  # pylint: disable=import-error
+
+# pseudo load class for type checking
+if TYPE_CHECKING:
+    from pathpy.core.base.collecions import BaseCollection
+
+# create custom types
+Weight = Union[str, bool, None]
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    """Helper function to lock an array against modifications."""
+    array.flags.writeable = False
+    return array
+
+
+def _offsets(rows: np.ndarray, n: int) -> np.ndarray:
+    """Helper function to compute the offsets of sorted row indices."""
+    indptr = np.zeros(n+1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr
+
+
+class CSRGraph:
+    """Read-only, integer indexed view of a network topology.
+
+    The view stores the topology of a network in the compressed sparse row
+    (CSR) and compressed sparse column (CSC) format. Nodes are represented by
+    integer indices in the range ``[0, n)`` which correspond to the ordering
+    of ``network.nodes.index``, i.e. to the row/column ordering of the
+    adjacency matrix.
+
+    The successors of the node ``i`` are stored in
+    ``indices[indptr[i]:indptr[i+1]]`` while ``edge_ids`` contains the
+    positions of the corresponding edges in ``sources``, ``targets`` and
+    ``edges``. Predecessors are stored analogously in ``in_indptr``,
+    ``in_indices`` and ``in_edge_ids``. For undirected networks every edge
+    appears in both directions (self-loops only once) and the CSC arrays are
+    identical to the CSR arrays.
+
+    .. note::
+
+        The view is a snapshot of the network at the time it was
+        generated. Use ``network.csr`` to obtain a view which is in sync
+        with the current state of the network.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network()
+    >>> net.add_edges(('a', 'b'), ('b', 'c'))
+    >>> net.csr.indptr
+    array([0, 1, 2, 2])
+    >>> net.csr.indices
+    array([1, 2], dtype=int32)
+
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, uids: Tuple[str, ...], sources: np.ndarray,
+                 targets: np.ndarray, edges: Tuple[Any, ...],
+                 directed: bool = True) -> None:
+        """Initialize the CSR view."""
+        n = len(uids)
+        m = len(edges)
+
+        # use compact integers if possible
+        dtype = np.int32 if max(n, 2*m) < np.iinfo(np.int32).max else np.int64
+
+        self._uids: Tuple[str, ...] = uids
+        self._edges: Tuple[Any, ...] = edges
+        self._directed: bool = directed
+        self._index: Optional[Dict[str, int]] = None
+
+        self.sources: np.ndarray = _readonly(sources.astype(dtype))
+        self.targets: np.ndarray = _readonly(targets.astype(dtype))
+
+        edge_ids = np.arange(m, dtype=dtype)
+        if directed:
+            rows, cols, ids = self.sources, self.targets, edge_ids
+        else:
+            # add the reverse direction for all edges except self-loops
+            mask = self.sources != self.targets
+            rows = np.concatenate((self.sources, self.targets[mask]))
+            cols = np.concatenate((self.targets, self.sources[mask]))
+            ids = np.concatenate((edge_ids, edge_ids[mask]))
+
+        order = np.argsort(rows, kind='stable')
+        self.indptr: np.ndarray = _readonly(_offsets(rows, n))
+        self.indices: np.ndarray = _readonly(cols[order])
+        self.edge_ids: np.ndarray = _readonly(ids[order])
+
+        if directed:
+            order = np.argsort(cols, kind='stable')
+            self.in_indptr: np.ndarray = _readonly(_offsets(cols, n))
+            self.in_indices: np.ndarray = _readonly(rows[order])
+            self.in_edge_ids: np.ndarray = _readonly(ids[order])
+        else:
+            self.in_indptr = self.indptr
+            self.in_indices = self.indices
+            self.in_edge_ids = self.edge_ids
+
+    def __repr__(self) -> str:
+        """Return the description of the view."""
+        return '{} with {} nodes and {} edges'.format(
+            self.__class__.__name__, self.number_of_nodes(),
+            self.number_of_edges())
+
+    @property
+    def directed(self) -> bool:
+        """Return if the underlying network is directed."""
+        return self._directed
+
+    @property
+    def uids(self) -> Tuple[str, ...]:
+        """Return the node uids ordered by their integer index."""
+        return self._uids
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Return a dictionary mapping node uids to integer indices."""
+        if self._index is None:
+            self._index = dict(zip(self._uids, range(len(self._uids))))
+        return self._index
+
+    @property
+    def edges(self) -> Tuple[Any, ...]:
+        """Return the edge objects ordered as ``sources`` and ``targets``."""
+        return self._edges
+
+    def number_of_nodes(self) -> int:
+        """Return the number of nodes."""
+        return len(self._uids)
+
+    def number_of_edges(self) -> int:
+        """Return the number of edges."""
+        return len(self._edges)
+
+    def edge_weights(self, weight: Weight = None) -> np.ndarray:
+        """Returns the weights of the edges ordered as ``edges``.
+
+        Parameters
+        ----------
+        weight : bool, str or None, optional (default = None)
+
+            The weight parameter defines which attribute is used as weight. If
+            ``None`` or ``False`` all weights are 1.0. See
+            :py:meth:`BaseClass.weight` for details.
+
+        """
+        m = self.number_of_edges()
+        if weight is None or weight is False:
+            return np.ones(m, dtype=float)
+        return np.fromiter((e.weight(weight) for e in self._edges),
+                           dtype=float, count=m)
+
+    def weights(self, weight: Weight = None) -> np.ndarray:
+        """Returns the weights aligned with the ``indices`` array."""
+        return self.edge_weights(weight)[self.edge_ids]
+
+    def in_weights(self, weight: Weight = None) -> np.ndarray:
+        """Returns the weights aligned with the ``in_indices`` array."""
+        return self.edge_weights(weight)[self.in_edge_ids]
+
+    def simple(self, weight: Weight = None,
+               transposed: bool = False) -> Tuple[np.ndarray, np.ndarray,
+                                                  np.ndarray, np.ndarray]:
+        """Returns the CSR arrays without parallel edges.
+
+        Of multiple edges between the same pair of nodes only the edge with
+        the smallest weight is kept, i.e. the returned arrays are suited for
+        shortest path calculations.
+
+        Parameters
+        ----------
+        weight : bool, str or None, optional (default = None)
+
+            The weight parameter defines which attribute is used as weight.
+
+        transposed : bool, optional (default = False)
+
+            If True the arrays of the predecessors are returned, i.e. the
+            arrays of the reversed graph.
+
+        Returns
+        -------
+        tuple
+
+            Returns the read-only arrays ``indptr``, ``indices``, ``weights``
+            and ``edge_ids`` of the simple graph.
+
+        """
+        n = self.number_of_nodes()
+        if transposed:
+            indptr, indices, edge_ids = (self.in_indptr, self.in_indices,
+                                         self.in_edge_ids)
+        else:
+            indptr, indices, edge_ids = self.indptr, self.indices, self.edge_ids
+
+        rows = np.repeat(np.arange(n, dtype=indices.dtype), np.diff(indptr))
+        weights = self.edge_weights(weight)[edge_ids]
+
+        order = np.lexsort((weights, indices, rows))
+        rows = rows[order]
+        cols = indices[order]
+
+        # keep the first (cheapest) edge of every pair of nodes
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        order = order[keep]
+
+        return (_readonly(_offsets(rows[keep], n)), _readonly(indices[order]),
+                _readonly(weights[order]), _readonly(edge_ids[order]))
+
+    def successors(self, i: int) -> np.ndarray:
+        """Returns the indices of the successors of node ``i``."""
+        return self.indices[self.indptr[i]:self.indptr[i+1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        """Returns the indices of the predecessors of node ``i``."""
+        return self.in_indices[self.in_indptr[i]:self.in_indptr[i+1]]
+
+    def outdegrees(self, weight: Weight = None) -> np.ndarray:
+        """Returns the (weighted) out-degrees of all nodes."""
+        return self._degrees(self.indptr, self.weights, weight)
+
+    def indegrees(self, weight: Weight = None) -> np.ndarray:
+        """Returns the (weighted) in-degrees of all nodes."""
+        return self._degrees(self.in_indptr, self.in_weights, weight)
+
+    def _degrees(self, indptr: np.ndarray, weights: Any,
+                 weight: Weight) -> np.ndarray:
+        """Helper function to sum the (weighted) entries per row."""
+        counts = np.diff(indptr)
+        if weight is None or weight is False:
+            return counts.astype(float)
+        rows = np.repeat(np.arange(self.number_of_nodes()), counts)
+        return np.bincount(rows, weights=weights(weight),
+                           minlength=self.number_of_nodes())
+
+    def to_scipy(self, weight: Weight = None,
+                 transposed: bool = False) -> sparse.csr_matrix:
+        """Returns the topology as sparse scipy adjacency matrix."""
+        n = self.number_of_nodes()
+        if transposed:
+            A = sparse.csr_matrix((self.in_weights(weight), self.in_indices,
+                                   self.in_indptr), shape=(n, n))
+        else:
+            A = sparse.csr_matrix((self.weights(weight), self.indices,
+                                   self.indptr), shape=(n, n))
+        A.sum_duplicates()
+        return A
+
+
+class GraphStorage:
+    """Incrementally maintained integer storage of a network topology.
+
+    Edges are stored as two growing arrays of source and target node slots,
+    where the slots are the stable integer slots assigned by the node
+    collection. Adding and removing an edge is done in amortized constant
+    time. The compressed :py:class:`CSRGraph` view is generated on demand
+    and cached until the topology changes.
+
+    """
+
+    def __init__(self, nodes: BaseCollection, directed: bool = True) -> None:
+        """Initialize the storage."""
+
+        # collection of nodes providing the node slots
+        self._nodes: BaseCollection = nodes
+
+        # inidcator whether the network is directed or undirected
+        self._directed: bool = directed
+
+        # node slots of the edge end points
+        self._sources: np.ndarray = np.empty(16, dtype=np.int64)
+        self._targets: np.ndarray = np.empty(16, dtype=np.int64)
+
+        # edge objects and their position in the arrays
+        self._edges: list = []
+        self._position: dict = {}
+
+        # counter of the topological changes and cached view
+        self._version: int = 0
+        self._view: Optional[CSRGraph] = None
+        self._view_key: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        """Returns the number of stored edges."""
+        return len(self._edges)
+
+    def __contains__(self, edge: Any) -> bool:
+        """Returns if the edge is stored."""
+        return edge.uid in self._position
+
+    def add(self, edge: Any) -> None:
+        """Add an edge to the storage."""
+        if edge.uid in self._position:
+            return
+
+        m = len(self._edges)
+        if m == len(self._sources):
+            self._sources = np.resize(self._sources, 2*m)
+            self._targets = np.resize(self._targets, 2*m)
+
+        slots = self._nodes._slots  # pylint: disable=protected-access
+        self._sources[m] = slots[edge.v.uid]
+        self._targets[m] = slots[edge.w.uid]
+        self._edges.append(edge)
+        self._position[edge.uid] = m
+        self._version += 1
+
+    def remove(self, edge: Any) -> None:
+        """Remove an edge from the storage."""
+        pos = self._position.pop(edge.uid, None)
+        if pos is None:
+            return
+
+        # move the last edge to the free position
+        last = len(self._edges) - 1
+        if pos != last:
+            moved = self._edges[last]
+            self._edges[pos] = moved
+            self._sources[pos] = self._sources[last]
+            self._targets[pos] = self._targets[last]
+            self._position[moved.uid] = pos
+        self._edges.pop()
+        self._version += 1
+
+    def clear(self) -> None:
+        """Remove all edges from the storage."""
+        self._edges = []
+        self._position = {}
+        self._version += 1
+
+    def view(self) -> CSRGraph:
+        """Returns a read-only CSR view of the stored topology."""
+        # pylint: disable=protected-access
+        nodes = self._nodes
+        key = (self._version, len(nodes), nodes._next_slot)
+
+        if self._view is None or key != self._view_key:
+            m = len(self._edges)
+            sources = self._sources[:m]
+            targets = self._targets[:m]
+
+            # map node slots to consecutive indices if nodes were removed
+            if nodes._next_slot != len(nodes):
+                remap = np.full(nodes._next_slot, -1, dtype=np.int64)
+                remap[np.fromiter(nodes._slots.values(), dtype=np.int64,
+                                  count=len(nodes))] = np.arange(len(nodes))
+                sources = remap[sources]
+                targets = remap[targets]
+
+            self._view = CSRGraph(tuple(nodes.keys()), sources, targets,
+                                  tuple(self._edges), self._directed)
+            self._view_key = key
+
+        return self._view
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
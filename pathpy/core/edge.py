@@ -414,10 +414,14 @@ class EdgeCollection(BaseCollection):
         # map single node to edges
         self._node_map: defaultdict = defaultdict(set)
 
+        # log of added (True) and removed (False) edges, which is only
+        # recorded if enabled by an owner, e.g. a network
+        self._log: Optional[list] = None
+
     def __contains__(self, item) -> bool:
         """Returns if item is in edges."""
         _contain: bool = False
-        if isinstance(item, Edge) and item in self._map.values():
+        if isinstance(item, Edge) and self._map.get(item.uid) is item:
             _contain = True
         elif isinstance(item, (tuple, list)):
             try:
@@ -571,6 +575,9 @@ class EdgeCollection(BaseCollection):
         self._node_map[_v].add(edge)
         self._node_map[_w].add(edge)
 
+        if self._log is not None:
+            self._log.append((edge, True))
+
     def remove(self, *edges: Union[str, tuple, list, Node, Edge],
                **kwargs: Any) -> None:
         """Remove multiple edges. """
@@ -657,6 +664,9 @@ class EdgeCollection(BaseCollection):
             if len(self._node_map[_a]) == 0:
                 self._node_map.pop(_a, None)
 
+        if self._log is not None:
+            self._log.append((edge, False))
+
 # =============================================================================
 # eof
 #
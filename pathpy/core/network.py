@@ -9,11 +9,14 @@
 # Copyright (c) 2016-2019 Pathpy Developers
 # =============================================================================
 from __future__ import annotations
-from typing import Any, Tuple, Optional, Union, Dict, Set
+from typing import Any, Tuple, Optional, Union, Dict, Set, Iterable, Callable
 from collections import defaultdict
+from itertools import compress, repeat
+
+import numpy as np
 
 from pathpy import logger
-from pathpy.core.base import BaseModel
+from pathpy.core.base import BaseModel, CSRGraph, GraphStorage, MatrixCache
 from pathpy.core.node import Node, NodeCollection
 from pathpy.core.edge import Edge, EdgeCollection
 
@@ -171,11 +174,13 @@ class Network(BaseModel):
     # load external functions to the network
     adjacency_matrix = matrices.adjacency_matrix  # type: ignore
     transition_matrix = matrices.transition_matrix  # type: ignore
+    laplacian_matrix = matrices.laplacian_matrix  # type: ignore
     distance_matrix = shortest_paths.distance_matrix  # type: ignore
     diameter = shortest_paths.diameter  # type: ignore
     avg_path_length = shortest_paths.avg_path_length
 
     betweenness_centrality = centralities.betweenness_centrality  # type: ignore
+    edge_betweenness_centrality = centralities.edge_betweenness_centrality  # type: ignore
     closeness_centrality = centralities.closeness_centrality  # type: ignore
 
     find_connected_components = components.find_connected_components  # type: ignore
@@ -195,6 +200,8 @@ class Network(BaseModel):
 
     avg_clustering_coefficient = clustering.avg_clustering_coefficient
     local_clustering_coefficient = clustering.local_clustering_coefficient
+    local_clustering_coefficients = clustering.local_clustering_coefficients
+    transitivity = clustering.transitivity
 
     plot = network_plot
 
@@ -226,6 +233,14 @@ class Network(BaseModel):
                                                      multiedges=multiedges,
                                                      nodes=self._nodes)
 
+        # integer indexed storage of the network topology
+        self._storage: GraphStorage = GraphStorage(self._nodes,
+                                                   directed=directed)
+
+        # cache for matrices which is invalidated if the network changes
+        self._cache: MatrixCache = MatrixCache(
+            lambda: (self.nodes.version, self.edges.version))
+
         # add attributes to the network
         self.attributes.update(**kwargs)
 
@@ -298,24 +313,9 @@ class Network(BaseModel):
         # TODO: add warnings if two networks have different properties
         # TODO: update also netork properties
 
-        # add nodes and edges of self to the new network
-        network.add_nodes(*self.nodes)
-        network.add_edges(*self.edges)
-
-        # add nodes and edges of the other to the new network
-        # iterate over all other nodes
-        for node in other.nodes:
-            # check if the node object already exists
-            if node not in network.nodes.values():
-                # add node to the network
-                network.add_node(node)
-
-        # iterate over all other edges
-        for edge in other.edges:
-            # check if the edge object already exists
-            if edge not in network.edges.values():
-                # add node to the network
-                network.add_edge(edge)
+        # add nodes and edges of self and other to the new network
+        network._add_objects(self.nodes.values(), self.csr.edges)
+        network._add_objects(other.nodes.values(), other.csr.edges)
 
         # return the new network
         return network
@@ -323,19 +323,11 @@ class Network(BaseModel):
     def __sub__(self, other: Network) -> Network:
         """Remove a network from a network."""
 
-        network = Network(directed=self.directed, temporal=self.temporal,
-                          multiedges=self.multiedges, **self.attributes.to_dict())
-
-        # add nodes and edges of self to a new network
-        network.add_nodes(*self.nodes)
-        network.add_edges(*self.edges)
-
-        # remove nodes and edges of the other network
-        network.remove_edges(*other.edges)
-        network.remove_nodes(*other.nodes)
-
-        # return the new network
-        return network
+        # view of the network without the nodes and edges of the other one
+        view = NetworkView(self,
+                           nodes=lambda node: node not in other.nodes,
+                           edges=lambda edge: edge not in other.edges)
+        return view.materialize()
 
     def __iadd__(self, other: Network) -> Network:
         """Add a network to it self."""
@@ -344,19 +336,7 @@ class Network(BaseModel):
         # TODO: update also netork properties
 
         # add nodes and edges of the other to the network
-        # iterate over all other nodes
-        for node in other.nodes:
-            # check if the node object already exists
-            if node not in self.nodes.values():
-                # add node to the network
-                self.add_node(node)
-
-        # iterate over all other edges
-        for edge in other.edges:
-            # check if the edge object already exists
-            if edge not in self.edges.values():
-                # add node to the network
-                self.add_edge(edge)
+        self._add_objects(other.nodes.values(), other.csr.edges)
 
         return self
 
@@ -488,6 +468,68 @@ class Network(BaseModel):
         """
         return self._edges
 
+    @property
+    def csr(self) -> CSRGraph:
+        """Return a read-only, integer indexed view of the network topology.
+
+        The view stores the network in the compressed sparse row format,
+        where nodes are represented by the integers given by
+        ``network.nodes.index``. It is kept in sync with the network and is
+        only regenerated if nodes or edges were added or removed.
+
+        Returns
+        -------
+        CSRGraph
+
+            Return the :py:class:`CSRGraph` of the network.
+
+        Examples
+        --------
+        Generate a simple network.
+
+        >>> from pathpy import Network
+        >>> net = Network()
+        >>> net.add_edges(('a', 'b'), ('b', 'c'), ('a', 'c'))
+
+        Get the successors of node 'a'.
+
+        >>> net.csr.successors(net.nodes.index['a'])
+        array([1, 2], dtype=int32)
+
+        """
+        # apply edges which were added or removed outside of the network,
+        # which are recorded in the log of the edge collection
+        self._update_properties()
+        return self._storage.view()
+
+    @property
+    def cache(self) -> MatrixCache:
+        """Return the cache of the matrices of the network.
+
+        Adjacency, transition and Laplacian matrices are cached for the used
+        arguments and are automatically invalidated if the network is
+        modified. Weighted matrices are also invalidated if an attribute is
+        changed.
+
+        Returns
+        -------
+        MatrixCache
+
+            Return the :py:class:`MatrixCache` of the network.
+
+        Examples
+        --------
+        >>> from pathpy import Network
+        >>> net = Network()
+        >>> net.add_edges(('a', 'b'), ('b', 'c'))
+        >>> A = net.adjacency_matrix()
+        >>> A = net.adjacency_matrix()
+        >>> net.cache.info()
+        {'hits': 1, 'misses': 1, 'size': 1}
+
+        """
+        return self._cache
+
     @property
     def successors(self) -> Dict[str, Set[Node]]:
         """Returns a dict of set of all successor nodes for a given node.
@@ -778,7 +820,7 @@ class Network(BaseModel):
 
         """
         self.edges.add(*edge, uid=uid, **kwargs)
-        self._add_properties()
+        self._update_properties()
 
     def add_nodes(self, *nodes: Union[str, Node],
                   **kwargs: Any) -> None:
@@ -841,7 +883,174 @@ class Network(BaseModel):
 
         """
         self.edges.add(*edges, **kwargs)
-        self._add_properties()
+        self._update_properties()
+
+    @classmethod
+    def from_arrays(cls, sources: Iterable, targets: Iterable,
+                    uids: Optional[Iterable] = None,
+                    attributes: Optional[Dict[str, Iterable]] = None,
+                    directed: bool = True, multiedges: bool = False,
+                    **kwargs: Any) -> Network:
+        """Create a network from arrays of source and target node uids.
+
+        In contrast to adding edges one by one, the nodes, the edges and all
+        network properties are created in a single pass over the arrays,
+        i.e. in linear time with respect to the number of edges.
+
+        Parameters
+        ----------
+        sources : Iterable
+
+            Uids of the source nodes ``v`` of the edges. Any iterable
+            (e.g. a list or a numpy array) can be used. Values are converted
+            to ``str``.
+
+        targets : Iterable
+
+            Uids of the target nodes ``w`` of the edges.
+
+        uids : Iterable, optional (default = None)
+
+            Uids of the edges. If ``None`` the default uids are used.
+
+        attributes : Dict[str, Iterable], optional (default = None)
+
+            Columns of edge attributes, i.e. a dictionary mapping the
+            attribute name to an iterable with one value per edge.
+
+        directed : bool, optional (default = True)
+
+            If ``True`` a directed network is created.
+
+        multiedges : bool, optional (default = False)
+
+            If ``True`` multiple edges between the same nodes are allowed.
+
+        kwargs : Any
+
+            Attributes assigned to the network as ``key=value`` pairs.
+
+        Returns
+        -------
+        Network
+
+            Return the new network.
+
+        Examples
+        --------
+        Generate a network from numpy arrays.
+
+        >>> import numpy as np
+        >>> from pathpy import Network
+        >>> net = Network.from_arrays(np.array([1, 2]), np.array([2, 3]),
+        ...                           attributes={'weight': [1.5, 2.0]})
+        >>> net.shape
+        (3, 2)
+        >>> net.edges['1', '2']['weight']
+        1.5
+
+        """
+        network = cls(directed=directed, multiedges=multiedges, **kwargs)
+
+        columns: Dict[str, Iterable] = {}
+        if attributes is not None:
+            columns = {key: _column(values)
+                       for key, values in attributes.items()}
+
+        rows: Iterable[dict]
+        if columns:
+            rows = (dict(zip(columns, values))
+                    for values in zip(*columns.values()))
+        else:
+            rows = repeat({})
+
+        if uids is None:
+            _uids: Iterable = repeat(None)
+        else:
+            _uids = _column(uids)
+
+        network._add_edges_from_arrays(_column(sources), _column(targets),
+                                       _uids, rows)
+        return network
+
+    @classmethod
+    def from_edgelist(cls, edgelist: Iterable[tuple], directed: bool = True,
+                      multiedges: bool = False, **kwargs: Any) -> Network:
+        """Create a network from a list of edges.
+
+        Parameters
+        ----------
+        edgelist : Iterable[tuple]
+
+            Iterable of ``(v, w)`` or ``(v, w, attributes)`` tuples, where
+            ``v`` and ``w`` are the node uids and ``attributes`` is a
+            dictionary of edge attributes.
+
+        directed : bool, optional (default = True)
+
+            If ``True`` a directed network is created.
+
+        multiedges : bool, optional (default = False)
+
+            If ``True`` multiple edges between the same nodes are allowed.
+
+        kwargs : Any
+
+            Attributes assigned to the network as ``key=value`` pairs.
+
+        Examples
+        --------
+        >>> from pathpy import Network
+        >>> net = Network.from_edgelist([('a', 'b'), ('b', 'c', {'weight': 2})])
+        >>> net.edges['b', 'c']['weight']
+        2
+
+        """
+        sources: list = []
+        targets: list = []
+        rows: list = []
+        for edge in edgelist:
+            sources.append(edge[0])
+            targets.append(edge[1])
+            rows.append(edge[2] if len(edge) > 2 else {})
+
+        network = cls(directed=directed, multiedges=multiedges, **kwargs)
+        network._add_edges_from_arrays(sources, targets, repeat(None), rows)
+        return network
+
+    def _add_edges_from_arrays(self, sources: Iterable, targets: Iterable,
+                               uids: Iterable, rows: Iterable[dict],
+                               unique_pairs: bool = True) -> None:
+        """Helper function to add edges without per edge dispatching.
+
+        If ``unique_pairs`` is False, repeated node pairs are added as
+        separate edges even without multi-edges, as for edge objects which
+        are added with :py:meth:`add_edge`.
+
+        """
+        # pylint: disable=protected-access
+        nodes = self.nodes
+        edges = self.edges
+
+        for v, w, uid, row in zip(sources, targets, uids, rows):
+            _nodes = []
+            for node in (str(v), str(w)):
+                if node not in nodes._map:
+                    nodes[node] = nodes._node_class(uid=node)
+                _nodes.append(nodes._map[node])
+
+            # check if the edge exists already
+            if uid is not None and str(uid) in edges._map:
+                edges._if_edge_exists(str(uid), **row)
+                continue
+            if (unique_pairs and not self.multiedges and
+                    (_nodes[0].uid, _nodes[1].uid) in edges._nodes_map):
+                edges._if_edge_exists(_nodes, **row)
+                continue
+
+            edges._add(Edge(_nodes[0], _nodes[1], uid=uid, **row))
+
+        self._update_properties()
 
     def remove_node(self, node: Union[str, Node]) -> None:
         """Remove a single node from the network.
@@ -876,8 +1085,10 @@ class Network(BaseModel):
 
         """
         if node in self.nodes:
-            for _edge in list(self.incident_edges[self.nodes[node].uid]):
+            _node = self.nodes[node]
+            for _edge in list(self._properties['incident_edges'][_node]):
                 self.remove_edge(_edge)
+            self._remove_node_properties(_node)
         self.nodes.remove(node)
 
     def remove_edge(self, *edge: Union[str, tuple, Node, Edge],
@@ -917,77 +1128,461 @@ class Network(BaseModel):
         # check if the right object is provided.
         # if edge obect is given
         self.edges.remove(*edge, uid=uid)
-        self._remove_properties()
+        self._update_properties()
 
     def remove_edges(self, *edges: Union[str, tuple, list, Node, Edge]) -> None:
         """Remove multiple edges from the network."""
         self.edges.remove(*edges)
-        self._remove_properties()
+        self._update_properties()
 
     def remove_nodes(self, *nodes: Union[str, Node]) -> None:
         """Remove multiple nodes from the network."""
         for node in nodes:
             self.remove_node(node)
 
-    def _add_properties(self):
-        """Helper function to update network properties."""
+    def subgraph(self, nodes: Iterable) -> NetworkView:
+        """Returns a view of the subgraph induced by the given nodes.
 
-        edges = set(self.edges).difference(self._properties['edges'])
+        The subgraph contains the given nodes and all edges between them. It
+        is returned as read-only :py:class:`NetworkView`, which shares the
+        node and edge objects with this network instead of copying them.
 
-        for edge in edges:
-            _nodes: list = [(edge.v, edge.w), (edge.w, edge.v)]
+        Parameters
+        ----------
+        nodes : Iterable
 
-            for _v, _w in _nodes:
-                self._properties['successors'][_v].add(_w)
-                self._properties['outgoing'][_v].add(edge)
-                self._properties['predecessors'][_w].add(_v)
-                self._properties['incoming'][_w].add(edge)
+            Either node uids or node objects, or a boolean mask ordered as
+            ``network.nodes.index``.
 
-                if self.directed:
-                    break
+        Returns
+        -------
+        NetworkView
 
-            for _v, _w in _nodes:
-                self._properties['neighbors'][_v].add(_w)
-                self._properties['incident_edges'][_v].add(edge)
+            Returns a view of the induced subgraph.
 
-                self._properties['indegrees'][_v] = len(
-                    self._properties['incoming'][_v])
-                self._properties['outdegrees'][_v] = len(
-                    self._properties['outgoing'][_v])
-                self._properties['degrees'][_v] = len(
-                    self._properties['incident_edges'][_v])
+        Examples
+        --------
+        >>> from pathpy import Network
+        >>> net = Network()
+        >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'd'))
+        >>> sub = net.subgraph(['a', 'b', 'c'])
+        >>> sub.number_of_edges()
+        2
+
+        """
+        return NetworkView(self, nodes=nodes)
+
+    def edge_subgraph(self, edges: Iterable) -> NetworkView:
+        """Returns a view of the subgraph induced by the given edges.
 
-            self._properties['edges'].add(edge)
+        The subgraph contains the given edges and the nodes they connect.
 
-    def _remove_properties(self):
-        """Helper function to update network properties."""
+        Parameters
+        ----------
+        edges : Iterable
+
+            Either edge uids or edge objects, or a boolean mask ordered as
+            ``network.csr.edges``.
+
+        Returns
+        -------
+        NetworkView
 
-        edges = self._properties['edges'].difference(set(self.edges))
+            Returns a view of the induced subgraph.
+
+        """
+        source = self.csr
+        mask = _mask(edges, source.number_of_edges(), lambda: source.edges)
+        nodes = np.zeros(source.number_of_nodes(), dtype=bool)
+        nodes[source.sources[mask]] = True
+        nodes[source.targets[mask]] = True
+        return NetworkView(self, nodes=nodes, edges=mask)
+
+    def filter(self, nodes: Optional[Union[Iterable, Callable]] = None,
+               edges: Optional[Union[Iterable, Callable]] = None
+               ) -> NetworkView:
+        """Returns a filtered view of the network.
+
+        Nodes and edges can be selected by uids, objects, boolean masks or
+        functions returning True for the node and edge objects to keep.
+        Edges are only kept if both of their nodes are kept.
+
+        Parameters
+        ----------
+        nodes : Iterable or Callable, optional (default = None)
+
+            Selection of the nodes, where masks are ordered as
+            ``network.nodes.index``. If ``None`` all nodes are selected.
+
+        edges : Iterable or Callable, optional (default = None)
+
+            Selection of the edges, where masks are ordered as
+            ``network.csr.edges``. If ``None`` all edges are selected.
+
+        Returns
+        -------
+        NetworkView
+
+            Returns a view of the filtered network.
+
+        Examples
+        --------
+        >>> from pathpy import Network
+        >>> net = Network()
+        >>> net.add_edge('a', 'b', weight=1)
+        >>> net.add_edge('b', 'c', weight=5)
+        >>> view = net.filter(edges=lambda e: e['weight'] > 2)
+        >>> view.number_of_nodes(), view.number_of_edges()
+        (3, 1)
+
+        """
+        return NetworkView(self, nodes=nodes, edges=edges)
+
+    def _add_objects(self, nodes: Iterable[Node],
+                     edges: Iterable[Edge]) -> None:
+        """Helper function to add existing node and edge objects at once.
+
+        Nodes and edges which are already part of the network are skipped,
+        while all network properties are updated once at the end.
+
+        """
+        # pylint: disable=protected-access
+        _nodes = self.nodes
+        _edges = self.edges
+
+        for node in nodes:
+            if _nodes._map.get(node.uid) is not node:
+                _nodes.add(node)
 
         for edge in edges:
-            _nodes: list = [(edge.v, edge.w), (edge.w, edge.v)]
+            if _edges._map.get(edge.uid) is edge:
+                continue
+            for node in (edge.v, edge.w):
+                if _nodes._map.get(node.uid) is not node:
+                    _nodes.add(node)
+            if edge.uid in _edges._map:
+                _edges._if_edge_exists(edge.uid)
+                continue
+            _edges._add(edge)
+
+        self._update_properties()
+
+    def _update_properties(self) -> None:
+        """Helper function to update network properties.
+
+        Only the edges which were added or removed since the last update are
+        considered, i.e. the costs of an update do not depend on the size of
+        the network.
+
+        """
+        # pylint: disable=protected-access
+        log = self.edges._log
+
+        # enable logging if not done yet, e.g. if the edge collection was
+        # replaced, and compare all edges once
+        if log is None:
+            edges = set(self.edges)
+            log = [(e, False) for e in self._properties['edges'] - edges]
+            log += [(e, True) for e in edges - self._properties['edges']]
+
+        self.edges._log = []
+
+        for edge, added in log:
+            if added:
+                self._add_edge_properties(edge)
+            else:
+                self._remove_edge_properties(edge)
+
+    def _add_edge_properties(self, edge: Edge) -> None:
+        """Helper function to add the properties of a single edge."""
+        successors = self._properties['successors']
+        predecessors = self._properties['predecessors']
+        outgoing = self._properties['outgoing']
+        incoming = self._properties['incoming']
+        neighbors = self._properties['neighbors']
+        incident_edges = self._properties['incident_edges']
+
+        _nodes: list = [(edge.v, edge.w), (edge.w, edge.v)]
+        if self.directed:
+            _directions = _nodes[:1]
+        else:
+            _directions = _nodes
+
+        for _v, _w in _directions:
+            successors[_v].add(_w)
+            outgoing[_v].add(edge)
+            predecessors[_w].add(_v)
+            incoming[_w].add(edge)
+
+        for _v, _w in _nodes:
+            neighbors[_v].add(_w)
+            incident_edges[_v].add(edge)
+            self._update_degrees(_v)
+
+        self._properties['edges'].add(edge)
+        self._storage.add(edge)
+
+    def _remove_edge_properties(self, edge: Edge) -> None:
+        """Helper function to remove the properties of a single edge."""
+        successors = self._properties['successors']
+        predecessors = self._properties['predecessors']
+        outgoing = self._properties['outgoing']
+        incoming = self._properties['incoming']
+        neighbors = self._properties['neighbors']
+        incident_edges = self._properties['incident_edges']
+
+        _nodes: list = [(edge.v, edge.w), (edge.w, edge.v)]
+        if self.directed:
+            _directions = _nodes[:1]
+        else:
+            _directions = _nodes
+
+        for _v, _w in _directions:
+            # keep adjacent nodes which are still connected by multi-edges
+            if not self._connected(_v, _w):
+                successors[_v].discard(_w)
+                predecessors[_w].discard(_v)
+            outgoing[_v].discard(edge)
+            incoming[_w].discard(edge)
+
+        for _v, _w in _nodes:
+            if not (self._connected(_v, _w) or self._connected(_w, _v)):
+                neighbors[_v].discard(_w)
+            incident_edges[_v].discard(edge)
+            self._update_degrees(_v)
+
+        self._properties['edges'].discard(edge)
+        self._storage.remove(edge)
+
+    def _connected(self, v: Node, w: Node) -> bool:
+        """Helper function to check if an edge from v to w exists."""
+        # pylint: disable=protected-access
+        return bool(self.edges._nodes_map.get((v.uid, w.uid)))
+
+    def _update_degrees(self, node: Node) -> None:
+        """Helper function to update the degrees of a node."""
+        self._properties['indegrees'][node] = len(
+            self._properties['incoming'][node])
+        self._properties['outdegrees'][node] = len(
+            self._properties['outgoing'][node])
+        self._properties['degrees'][node] = len(
+            self._properties['incident_edges'][node])
+
+    def _remove_node_properties(self, node: Node) -> None:
+        """Helper function to remove the properties of an isolated node."""
+        for key in ['successors', 'predecessors', 'outgoing', 'incoming',
+                    'neighbors', 'incident_edges', 'indegrees',
+                    'outdegrees', 'degrees']:
+            self._properties[key].pop(node, None)
+
+
+class NetworkView(Network):
+    """Read-only view of a subgraph of a network.
+
+    The view selects nodes and edges of a network via boolean masks over the
+    integer indexed topology of the network, i.e. it does not copy any node
+    or edge object. Its :py:class:`CSRGraph` is derived from the topology of
+    the network with array operations, so that algorithms based on the
+    adjacency matrix or the CSR arrays run on the view directly. The edge
+    collection and the network properties, e.g. ``successors``, are only
+    generated when they are accessed for the first time.
+
+    The view represents the topology of the network at the time it was
+    generated, while the attributes of its nodes and edges are shared with
+    the network. Nodes and edges can neither be added to nor removed from
+    the view, use :py:meth:`materialize` to obtain a modifiable network.
+
+    Parameters
+    ----------
+    network : Network
+
+        The network which is viewed.
+
+    nodes : Iterable or Callable, optional (default = None)
+
+        Either node uids or node objects, a boolean mask ordered as
+        ``network.nodes.index`` or a function returning True for the nodes
+        to select. If ``None`` all nodes are selected.
+
+    edges : Iterable or Callable, optional (default = None)
+
+        Either edge uids or edge objects, a boolean mask ordered as
+        ``network.csr.edges`` or a function returning True for the edges to
+        select. If ``None`` all edges between the selected nodes are
+        selected.
+
+    Examples
+    --------
+    >>> from pathpy import Network
+    >>> net = Network()
+    >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'd'))
+    >>> view = net.subgraph(['a', 'b', 'c'])
+    >>> view.adjacency_matrix().sum()
+    2.0
+    >>> copy = view.materialize()
+    >>> copy.add_edge('c', 'a')
+    >>> copy.number_of_edges()
+    3
+
+    """
+    # pylint: disable=too-many-ancestors
+
+    # the properties of the network are generated on demand
+    _pending: bool = False
+
+    def __init__(self, network: Network,
+                 nodes: Optional[Union[Iterable, Callable]] = None,
+                 edges: Optional[Union[Iterable, Callable]] = None) -> None:
+        """Initialize the view."""
+        super().__init__(directed=network.directed,
+                         temporal=network.temporal,
+                         multiedges=network.multiedges,
+                         **network.attributes.to_dict())
+
+        # topology of the viewed network
+        self._network: Network = network
+        self._source: CSRGraph = network.csr
+        source = self._source
+
+        # pylint: disable=protected-access
+        _map = network.nodes._map
+        self._node_mask: np.ndarray = _mask(
+            nodes, source.number_of_nodes(),
+            lambda: [_map[uid] for uid in source.uids])
+        self._edge_mask: np.ndarray = (
+            _mask(edges, source.number_of_edges(), lambda: source.edges) &
+            self._node_mask[source.sources] &
+            self._node_mask[source.targets])
+        self._view: Optional[CSRGraph] = None
+
+        # the topology of the view does not change
+        self._cache = MatrixCache(lambda: None)
+
+        # add the selected nodes directly to the collection
+        uids = list(compress(source.uids, self._node_mask))
+        nodes = self._nodes
+        nodes._map = {uid: _map[uid] for uid in uids}
+        nodes._slots = dict(zip(uids, range(len(uids))))
+        nodes._next_slot = len(uids)
+        nodes._version += 1
+
+        self._pending = True
+
+    @property
+    def network(self) -> Network:
+        """Return the network which is viewed."""
+        return self._network
 
-            for _v, _w in _nodes:
-                self._properties['successors'][_v].discard(_w)
-                self._properties['outgoing'][_v].discard(edge)
-                self._properties['predecessors'][_w].discard(_v)
-                self._properties['incoming'][_w].discard(edge)
+    @property
+    def edges(self) -> EdgeCollection:
+        """Return the associated edges of the view."""
+        if self._pending:
+            self._generate()
+        return self._edges
+
+    @property
+    def _properties(self) -> defaultdict:
+        """Return the network properties, which are generated on demand."""
+        if self._pending:
+            self._generate()
+        return self._view_properties
+
+    @_properties.setter
+    def _properties(self, value: defaultdict) -> None:
+        self._view_properties = value
+
+    @property
+    def csr(self) -> CSRGraph:
+        """Return a read-only, integer indexed view of the subgraph."""
+        if self._view is None:
+            source = self._source
+            remap = np.cumsum(self._node_mask) - 1
+            edges = np.flatnonzero(self._edge_mask)
+            self._view = CSRGraph(tuple(self.nodes.keys()),
+                                  remap[source.sources[edges]],
+                                  remap[source.targets[edges]],
+                                  tuple(compress(source.edges,
+                                                 self._edge_mask)),
+                                  self.directed)
+        return self._view
+
+    def number_of_edges(self) -> int:
+        """Return the number of edges in the view."""
+        return int(np.count_nonzero(self._edge_mask))
+
+    def materialize(self) -> Network:
+        """Returns the view as modifiable network.
+
+        The returned network contains the node and edge objects of the view,
+        i.e. the objects are shared with the viewed network and only the
+        network structure is created.
 
-                if self.directed:
-                    break
+        Returns
+        -------
+        Network
+
+            Returns a new network with the nodes and edges of the view.
+
+        """
+        network = Network(directed=self.directed, temporal=self.temporal,
+                          multiedges=self.multiedges,
+                          **self.attributes.to_dict())
+        network._add_objects(self.nodes.values(), self.csr.edges)
+        return network
+
+    def _generate(self) -> None:
+        """Helper function to generate the edges and network properties."""
+        # pylint: disable=protected-access
+        self._pending = False
+        for edge in self.csr.edges:
+            self._edges._add(edge)
+        self._update_properties()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        """Helper function preventing modifications of the view."""
+        LOG.error('The NetworkView "%s" is read-only, use materialize() to '
+                  'obtain a modifiable network', self.uid)
+        raise AttributeError
 
-            for _v, _w in _nodes:
-                self._properties['neighbors'][_v].discard(_w)
-                self._properties['incident_edges'][_v].discard(edge)
+    add_node = add_nodes = add_edge = add_edges = _read_only  # type: ignore
+    remove_node = remove_nodes = _read_only  # type: ignore
+    remove_edge = remove_edges = _read_only  # type: ignore
+    _add_edges_from_arrays = _add_objects = _read_only  # type: ignore
+    __iadd__ = __isub__ = _read_only  # type: ignore
 
-                self._properties['indegrees'][_v] = len(
-                    self._properties['incoming'][_v])
-                self._properties['outdegrees'][_v] = len(
-                    self._properties['outgoing'][_v])
-                self._properties['degrees'][_v] = len(
-                    self._properties['incident_edges'][_v])
 
-            self._properties['edges'].discard(edge)
+def _mask(selection: Optional[Union[Iterable, Callable]], n: int,
+          objects: Callable[[], Any]) -> np.ndarray:
+    """Helper function converting a selection to a boolean mask.
+
+    The function ``objects`` returns the selectable objects ordered by their
+    integer index and is only called if needed.
+
+    """
+    if selection is None:
+        return np.ones(n, dtype=bool)
+
+    if isinstance(selection, np.ndarray) and selection.dtype == bool:
+        if len(selection) != n:
+            LOG.error('The mask does not match the number of elements')
+            raise KeyError
+        return selection.copy()
+
+    if callable(selection):
+        return np.fromiter((bool(selection(x)) for x in objects()),
+                           dtype=bool, count=n)
+
+    index = {x.uid: i for i, x in enumerate(objects())}
+    mask = np.zeros(n, dtype=bool)
+    mask[[index[getattr(x, 'uid', x)] for x in selection]] = True
+    return mask
+
+
+def _column(values: Iterable) -> Iterable:
+    """Helper function to convert numpy and pandas columns to python types."""
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return values
 
 
 # =============================================================================
@@ -57,6 +57,9 @@ def from_dataframe(df: pd.DataFrame, directed: bool = True, loops: bool = True,
     columns (e.g. weight, type, time, etc.) will be assigned as edge
     attributes. kwargs will be assigned as network attributes.
 
+    Every row is added as a separate edge, i.e. repeated rows with the same
+    `v` and `w` result in multiple edges between these nodes.
+
     Parameters
     ----------
 
@@ -92,34 +95,24 @@ def from_dataframe(df: pd.DataFrame, directed: bool = True, loops: bool = True,
 
             LOG.debug('Creating %s network', directed)
 
+    if 'v' not in df.columns or 'w' not in df.columns:
+        LOG.error('DataFrame minimally needs columns \'v\' and \'w\'')
+        raise IOError
+
+    # remove self-loops if needed
+    if not loops:
+        df = df[df['v'].astype(str) != df['w'].astype(str)]
+
+    reserved_columns = set(['v', 'w', 'uid'])
+    columns = [col for col in df.columns if col not in reserved_columns]
+    rows = df[columns].to_dict(orient='records')
+    uids = df['uid'].tolist() if 'uid' in df.columns else [None] * len(df)
+
+    # repeated rows are added as separate edges as for edge objects
+    # pylint: disable=protected-access
     net = Network(directed=directed, multiedges=multiedges, **kwargs)
-    for row in df.to_dict(orient='records'):
-
-        # get edge
-        v = row.get('v', None)
-        w = row.get('w', None)
-        uid = row.get('uid', None)
-        if v is None or w is None:
-            LOG.error('DataFrame minimally needs columns \'v\' and \'w\'')
-            raise IOError
-        else:
-            v = str(v)
-            w = str(w)
-        if v not in net.nodes.uids:
-            net.add_node(v)
-        if w not in net.nodes.uids:
-            net.add_node(w)
-        if uid is None:
-            edge = Edge(net.nodes[v], net.nodes[w])
-        else:
-            edge = Edge(net.nodes[v], net.nodes[w], uid=uid)
-        if loops or edge.v != edge.w:
-            net.add_edge(edge)
-
-        reserved_columns = set(['v', 'w', 'uid'])
-        for k in row:
-            if k not in reserved_columns:
-                edge[k] = row[k]
+    net._add_edges_from_arrays(df['v'].tolist(), df['w'].tolist(), uids,
+                               rows, unique_pairs=False)
     return net
 
 
@@ -9,47 +9,240 @@
 # =============================================================================
 
 import datetime
+import contextlib
 import numpy as np
 import collections
-import itertools
 import pandas as pd
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 import math
 from copy import copy
 from sklearn.preprocessing import normalize
-from scipy.sparse import dok_matrix, csr_matrix, eye, issparse
-from scipy.linalg import toeplitz
+from scipy.sparse import coo_matrix, csr_matrix, eye, issparse
 from scipy.special import binom
-import scipy.sparse.linalg as sla
 import matplotlib.pyplot as plt
 from pathpy import logger, config, Network
+from pathpy.utils.helper import cumulative_rows
+from pathpy.utils.parallel import SharedArrays, map_partitions
+from pathpy.algorithms.centralities import stationary_distribution
 
 # create logger
 LOG = logger(__name__)
 
 ###############################################################################
 
+class StateTable:
+    """Table of multi-order states encoded by integer node ids.
+
+    The states form a prefix tree, i.e. the state i consists of the state
+    parent[i] followed by the node node[i] and has length order[i], where
+    states of length one have the parent -1. Nodes are numbered by the
+    position of their uid in labels, while the start marker '*' and the end
+    marker '+' have the ids START = len(labels) and END = len(labels) + 1.
+    Tuples of node uids are only created on request, e.g. by tuples().
+    """
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self.START = len(self.labels)
+        self.END = len(self.labels) + 1
+
+        self.parent = np.zeros(0, dtype=np.int64)
+        self.node = np.zeros(0, dtype=np.int64)
+        self.order = np.zeros(0, dtype=np.int64)
+
+        # sorted codes of the (parent, node) pairs and the corresponding states
+        self._codes = np.zeros(0, dtype=np.int64)
+        self._states = np.zeros(0, dtype=np.int64)
+        self._index = None
+
+    @classmethod
+    def from_tuples(cls, tuples):
+        """Returns a table and the ids of the given tuples of node uids."""
+        labels = sorted(set(x for t in tuples for x in t).difference({'*', '+'}))
+        table = cls(labels)
+        index = {v: i for i, v in enumerate(labels)}
+        index['*'] = table.START
+        index['+'] = table.END
+
+        ids = {(): -1}
+        for k in range(1, max(map(len, tuples), default=0) + 1):
+            prefixes = list(dict.fromkeys(t[:k] for t in tuples if len(t) >= k))
+            level = table.add([ids[p[:-1]] for p in prefixes], [index[p[-1]] for p in prefixes])
+            ids.update(zip(prefixes, level.tolist()))
+        return table, np.array([ids[t] for t in tuples], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, parents, nodes):
+        """Returns the ids of the states given by parent states and nodes.
+           States which are not in the table yet are appended to the table."""
+        parents, nodes = np.broadcast_arrays(np.asarray(parents, dtype=np.int64),
+                                             np.asarray(nodes, dtype=np.int64))
+        size = self.END + 1
+        codes = (parents + 1) * size + nodes
+        unique, inverse = np.unique(codes, return_inverse=True)
+
+        pos = np.searchsorted(self._codes, unique)
+        found = pos < len(self._codes)
+        found[found] = self._codes[pos[found]] == unique[found]
+
+        ids = np.empty(len(unique), dtype=np.int64)
+        ids[found] = self._states[pos[found]]
+
+        new = np.flatnonzero(~found)
+        if len(new):
+            ids[new] = len(self) + np.arange(len(new))
+            parent = unique[new] // size - 1
+            order = np.ones(len(new), dtype=np.int64)
+            order[parent >= 0] += self.order[parent[parent >= 0]]
+            self.parent = np.concatenate((self.parent, parent))
+            self.node = np.concatenate((self.node, unique[new] % size))
+            self.order = np.concatenate((self.order, order))
+
+            codes = np.concatenate((self._codes, unique[new]))
+            states = np.concatenate((self._states, ids[new]))
+            sorter = np.argsort(codes, kind='stable')
+            self._codes, self._states = codes[sorter], states[sorter]
+            self._index = None
+        return ids[inverse].reshape(parents.shape)
+
+    def find(self, parents, nodes):
+        """Returns the ids of the states given by parent states and nodes.
+           States which are not in the table have the id -1, i.e. in contrast to
+           add() the table is not modified."""
+        parents, nodes = np.broadcast_arrays(np.asarray(parents, dtype=np.int64),
+                                             np.asarray(nodes, dtype=np.int64))
+        codes = (parents + 1) * (self.END + 1) + nodes
+        ids = np.full(codes.shape, -1, dtype=np.int64)
+        if len(self._codes):
+            pos = np.minimum(np.searchsorted(self._codes, codes), len(self._codes) - 1)
+            found = (self._codes[pos] == codes) & (parents >= -1)
+            ids[found] = self._states[pos[found]]
+        return ids
+
+    def ends(self, ids):
+        """Returns a boolean array indicating the end states '+'."""
+        return self.node[ids] == self.END
+
+    def sequences(self, ids):
+        """Returns a matrix with the node ids of the states aligned to the right.
+           Rows of states shorter than the longest state are padded with -1."""
+        ids = np.asarray(ids, dtype=np.int64)
+        width = int(self.order[ids].max()) if len(ids) else 0
+        sequences = np.full((len(ids), width), -1, dtype=np.int64)
+        current = ids.copy()
+        for col in range(width - 1, -1, -1):
+            active = current >= 0
+            sequences[active, col] = self.node[current[active]]
+            current[active] = self.parent[current[active]]
+        return sequences
+
+    def tuples(self, ids=None):
+        """Returns the states as tuples of node uids."""
+        if ids is None:
+            ids = np.arange(len(self))
+        labels = self.labels + ['*', '+']
+        return [tuple(labels[v] for v in row if v >= 0)
+                for row in self.sequences(ids).tolist()]
+
+    @property
+    def index(self):
+        """Returns a dictionary mapping the tuples of node uids to state ids."""
+        if self._index is None:
+            self._index = dict(zip(self.tuples(), range(len(self))))
+        return self._index
+
+    def sort(self, ids, ends_last=False):
+        """Returns the ids sorted by the length and the last node of the states.
+           The nodes are compared by their uids, where '*' and '+' are treated as
+           uids as well. If ends_last is True the end states are sorted last."""
+        ids = np.asarray(ids, dtype=np.int64)
+        labels = self.labels + ['*', '+']
+        rank = np.empty(len(labels), dtype=np.int64)
+        rank[sorted(range(len(labels)), key=labels.__getitem__)] = np.arange(len(labels))
+        keys = [ids, rank[self.node[ids]], self.order[ids]]
+        if ends_last:
+            keys.append(self.ends(ids))
+        return ids[np.lexsort(keys)]
+
+
 class MultiOrderMatrix:
-    def __init__(self, matrix, node_id_dict):
+    """Matrix whose rows and columns correspond to multi-order states.
+       The states are given by the ids of a StateTable or by a dictionary
+       mapping tuples of node uids to the rows of the matrix."""
+
+    def __init__(self, matrix, node_id_dict=None, states=None, ids=None):
         assert matrix.shape[0] == matrix.shape[1] #square matrix
-        assert len(node_id_dict) == matrix.shape[0] #entry for each matrix row/col exists
-        assert min(node_id_dict.values()) == 0
-        assert max(node_id_dict.values()) == len(node_id_dict) - 1
-        assert len(set(node_id_dict.values())) == len(node_id_dict)
-        assert sum([type(x)==int for x in node_id_dict.values()]) == len(node_id_dict)
-        
+        if states is None:
+            assert len(node_id_dict) == matrix.shape[0] #entry for each matrix row/col exists
+            assert min(node_id_dict.values()) == 0
+            assert max(node_id_dict.values()) == len(node_id_dict) - 1
+            assert len(set(node_id_dict.values())) == len(node_id_dict)
+            assert sum([type(x)==int for x in node_id_dict.values()]) == len(node_id_dict)
+            node_id_dict = {(k,) if not type(k) == tuple else k: v for k, v in node_id_dict.items()}
+            states, ids = StateTable.from_tuples(sorted(node_id_dict, key=node_id_dict.get))
+        assert len(ids) == matrix.shape[0] #state for each matrix row/col exists
+
         self.matrix = csr_matrix(matrix)
-        self.node_id_dict = {(k,) if not type(k) == tuple else k: v for k, v in node_id_dict.items()}
-        self.id_node_dict = {v: k for k, v in self.node_id_dict.items()}
-        self.nodes = list(set((fon,) for hon in self.node_id_dict.keys() for fon in hon if not fon == '+'))
-        self.nodes += list(set(hon[-2:] for hon in self.node_id_dict.keys() if hon[-1] == '+'))
-        self.nodes = sorted(self.nodes, key=lambda x: (x[-1] == '+', len(x), x[-1]))
+        self.states = states
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self._node_id_dict = None
+        self._nodes = None
+
+    @property
+    def node_id_dict(self):
+        """Returns a dictionary mapping the states as tuples of node uids to rows."""
+        if self._node_id_dict is None:
+            self._node_id_dict = dict(zip(self.states.tuples(self.ids), range(len(self.ids))))
+        return self._node_id_dict
+
+    @property
+    def id_node_dict(self):
+        """Returns a dictionary mapping rows to the states as tuples of node uids."""
+        return {v: k for k, v in self.node_id_dict.items()}
+
+    @property
+    def nodes(self):
+        """Returns the first-order nodes as tuples of node uids."""
+        if self._nodes is None:
+            table, ids = self._first_order_states()
+            self._nodes = table.tuples(ids)
+        return self._nodes
+
+    def _first_order_states(self):
+        """Returns a state table and the sorted ids of the first-order states of
+           all nodes. These are the states of length one for all nodes contained
+           in the states and the end states of length two for the nodes before
+           '+'. The states are looked up in the table of the matrix, which is
+           shared with the model and not modified. If some states are missing,
+           a separate table of the first-order states is used instead."""
+        states = self.states
+        sequences = states.sequences(self.ids)
+        ends = states.ends(self.ids)
+        nodes = np.unique(sequences[(sequences >= 0) & (sequences != states.END)])
+        last = np.unique(states.node[states.parent[self.ids[ends]]])
+
+        table = states
+        first = states.find(-1, nodes)
+        end = states.find(states.find(-1, last), states.END)
+        if np.any(first < 0) or np.any(end < 0):
+            table = StateTable(states.labels)
+            first = table.add(-1, nodes)
+            end = table.add(table.add(-1, last), table.END)
+        return table, table.sort(np.unique(np.concatenate((first, end))), ends_last=True)
+
+    def _rows(self, mask):
+        """Returns the rows of the given mask and checks that the start exists."""
+        assert np.any(self.states.node[self.ids] == self.states.START)
+        return np.flatnonzero(mask)
         
     def __str__(self):
         decimals = 2
         
-        idx = [self.id_node_dict[i] for i in range(self.matrix.shape[0])]
+        idx = self.states.tuples(self.ids)
         
         if issparse(self.matrix):
             matrix = self.matrix.todense()
@@ -72,17 +265,22 @@ class MultiOrderMatrix:
 
     def __repr__(self):
         return self.__str__()
+
+    def _same_states(self, other):
+        if self.states is other.states and np.array_equal(self.ids, other.ids):
+            return True
+        return self.node_id_dict == other.node_id_dict
     
     def __add__(self, other):
-        assert self.node_id_dict == other.node_id_dict
-        return MultiOrderMatrix(self.matrix + other.matrix, self.node_id_dict)
+        assert self._same_states(other)
+        return MultiOrderMatrix(self.matrix + other.matrix, states=self.states, ids=self.ids)
     
     def __sub__(self, other):
-        assert self.node_id_dict == other.node_id_dict
-        return MultiOrderMatrix(self.matrix - other.matrix, self.node_id_dict)
+        assert self._same_states(other)
+        return MultiOrderMatrix(self.matrix - other.matrix, states=self.states, ids=self.ids)
     
     def to_dataframe(self, decimals=None):
-        idx = [self.id_node_dict[i] for i in range(self.matrix.shape[0])]
+        idx = self.states.tuples(self.ids)
         if decimals:
             matrix = np.round(self.matrix.todense(), decimals)
         else:
@@ -96,78 +294,152 @@ class MultiOrderMatrix:
         display(self.to_dataframe(decimals=decimals))
         
     def remove_zero_order(self):
-        assert ('*',) in self.node_id_dict.keys()
-        
-        idx = list(self.node_id_dict.values())
-        idx.remove(self.node_id_dict[('*',)])
-        for node in self.node_id_dict.keys():
-            if node[-1] == '+':
-                idx.remove(self.node_id_dict[node])
+        node = self.states.node[self.ids]
+        idx = self._rows((node != self.states.START) & (node != self.states.END))
         matrix = self.matrix[idx][:,idx]
-        
-        node_id_dict = {self.id_node_dict[idx]: v for v, idx in enumerate(sorted(idx))}
-                
-        return MultiOrderMatrix(matrix, node_id_dict)
+        return MultiOrderMatrix(matrix, states=self.states, ids=self.ids[idx])
         
     def integrate_zero_order(self):
-        assert ('*',) in self.node_id_dict.keys()
-        start_nodes = [('*',)]
-        end_nodes = [x for x in self.node_id_dict.keys() if x[-1] == '+']
-        idx = list(v for k, v in self.node_id_dict.items() if not k in start_nodes + end_nodes)
+        node = self.states.node[self.ids]
+        start = self._rows(node == self.states.START)
+        end = np.flatnonzero(node == self.states.END)
+        idx = np.flatnonzero((node != self.states.START) & (node != self.states.END))
 
-        start_dist = self.matrix[self.node_id_dict[('*',)],idx]
+        start_dist = self.matrix[start[0],idx]
                 
-        end_prob = self.matrix[idx,:][:,[self.node_id_dict[x] for x in end_nodes]]
+        end_prob = self.matrix[idx,:][:,end]
         
-        matrix = self.matrix[idx][:,idx].todense() + end_prob.sum(axis=1) @ start_dist
+        # the rank-one update is added as sparse outer product of the non-zeros
+        matrix = self.matrix[idx][:,idx] + csr_matrix(end_prob.sum(axis=1)) @ start_dist
         
-        node_id_dict = {self.id_node_dict[idx]: v for v, idx in enumerate(sorted(idx))}
-        
-        return MultiOrderMatrix(matrix, node_id_dict)
+        return MultiOrderMatrix(matrix, states=self.states, ids=self.ids[idx])
     
     def start_distribution(self):
-        assert ('*',) in self.node_id_dict.keys()
-        start_nodes = [('*',)]
-        end_nodes = [x for x in self.node_id_dict.keys() if x[-1] == '+']
-        
-        start_dist = self.to_dataframe().loc[
-            start_nodes,
-            [x for x in self.node_id_dict.keys() if x not in start_nodes + end_nodes]]
+        node = self.states.node[self.ids]
+        start = self._rows(node == self.states.START)
+        idx = np.flatnonzero((node != self.states.START) & (node != self.states.END))
+        tuples = self.states.tuples(self.ids)
+
+        start_dist = pd.DataFrame(self.matrix[start][:, idx].todense(),
+                                  index=[tuples[i] for i in start],
+                                  columns=[tuples[i] for i in idx])
         return start_dist
     
     def end_probability(self):
-        assert ('*',) in self.node_id_dict.keys()
-        start_nodes = [('*',)]
-        end_nodes = [x for x in self.node_id_dict.keys() if x[-1] == '+']
-        
-        end_prob = self.to_dataframe().loc[
-            [x for x in self.node_id_dict.keys() if x not in start_nodes + end_nodes],
-            end_nodes]
+        node = self.states.node[self.ids]
+        self._rows(node == self.states.START)
+        end = np.flatnonzero(node == self.states.END)
+        idx = np.flatnonzero((node != self.states.START) & (node != self.states.END))
+        tuples = self.states.tuples(self.ids)
+
+        end_prob = pd.DataFrame(self.matrix[idx][:, end].todense(),
+                                index=[tuples[i] for i in idx],
+                                columns=[tuples[i] for i in end])
         return end_prob
     
     def to_first_order(self):
-        fon_id_dict = {n: i for i, n in enumerate(self.nodes)}
-        
-        hon = np.matrix([fon_id_dict[(self.id_node_dict[i][-1],)
-                                     if self.id_node_dict[i][-1] != '+' else self.id_node_dict[i][-2:]]
-                         for i in range(max(self.id_node_dict) + 1)])
-        fon = np.matrix([fon_id_dict[n] for n in self.nodes])
-        N = csr_matrix(np.equal(hon.T,fon))
+        states = self.states
+        table, fon = self._first_order_states()
+
+        # first-order state of each row, i.e. its last node or (node, '+')
+        ends = states.ends(self.ids)
+        hon = table.find(-1, np.where(ends, states.node[states.parent[self.ids]], states.node[self.ids]))
+        hon[ends] = table.find(hon[ends], table.END)
+
+        lookup = np.argsort(fon)
+        cols = lookup[np.searchsorted(fon[lookup], hon)]
+        N = csr_matrix((np.ones(len(hon)), (np.arange(len(hon)), cols)), shape=(len(hon), len(fon)))
         
         matrix = normalize(N.T, norm='l1', axis=1) @ self.matrix @ N
         
-        return MultiOrderMatrix(matrix, fon_id_dict)
+        return MultiOrderMatrix(matrix, states=table, ids=fon)
+
 
 ###############################################################################
 
-def unwrap_self_count_transitions(arg, **kwarg):
-    return MOGen._count_transitions(arg, **kwarg)
+def _csr_keys(matrix):
+    """Returns the sorted (row, col) keys of the stored elements of a CSR matrix."""
+    return np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr)) * matrix.shape[1] + matrix.indices
+
+def _gather(keys, data, n, rows, cols):
+    """Returns the entries of a CSR matrix with n columns for arrays of rows and columns.
+       The entries are found by a binary search of the (row, col) keys in the
+       keys of the stored elements. Negative rows or columns give zeros."""
+    values = np.zeros(len(rows))
+    valid = np.flatnonzero((rows >= 0) & (cols >= 0))
+    queries = rows[valid] * n + cols[valid]
+    pos = np.minimum(np.searchsorted(keys, queries), max(len(keys) - 1, 0))
+    found = keys[pos] == queries if len(keys) else np.zeros(len(valid), dtype=bool)
+    values[valid[found]] = data[pos[found]]
+    return values
+
+def _transitions(arrays, part, order, start, offset=0):
+    """Returns the ids of the source and target states of the transitions of a
+       contiguous range of paths and their weights, i.e. the frequencies of the
+       paths. The states of all positions are taken from the sliding windows.
+       Only transitions to targets at a position of at least offset are
+       returned, where the end of a path with L nodes is at position L."""
+    lo, hi = arrays['ptr'][part[0]], arrays['ptr'][part[-1] + 1]
+    positions = arrays['positions'][lo:hi]
+    frequencies = arrays['frequencies'][lo:hi]
+
+    # states of all positions, sources of the returned transitions have at
+    # least min(offset, order) nodes
+    length = np.minimum(positions + 1, order)
+    states = np.empty(len(positions), dtype=np.int64)
+    for k in range(max(1, min(offset, order)), order + 1):
+        mask = length == k
+        states[mask] = arrays['windows{}'.format(k)][lo:hi][mask]
 
-def unwrap_self_get_log_likelihood_path(arg, **kwarg):
-    return MOGen._get_log_likelihood_path(arg, **kwarg)
+    first = np.flatnonzero(positions == 0) if offset == 0 else np.zeros(0, dtype=np.int64)
+    inner = np.flatnonzero(positions >= max(offset, 1))
+    last = np.append(positions[1:] == 0, True)
+    ends = last[last] & (positions[last] + 1 >= offset)
+    last = np.flatnonzero(last)[ends]
 
-def unwrap_self_generate_paths_chunk(arg, **kwarg):
-    return MOGen._generate_path_chunk(arg, **kwarg)
+    # transitions from the start, between the windows and to the end
+    source = np.concatenate((np.full(len(first), start), states[inner - 1], states[last]))
+    target = np.concatenate((states[first], states[inner],
+                             arrays['ends{}'.format(order)][part[0]:part[-1] + 1][ends]))
+    weights = np.concatenate((frequencies[first], frequencies[inner], frequencies[last]))
+    return source, target, weights
+
+def _count_transitions(arrays, part, order, start, size, offset=0):
+    """Counts the transitions of a range of paths by their (source, target) codes."""
+    source, target, weights = _transitions(arrays, part, order, start, offset)
+    unique, inverse = np.unique(source * size + target, return_inverse=True)
+    return unique, np.bincount(inverse.ravel(), weights=weights, minlength=len(unique))
+
+def _log_likelihood(arrays, part, order, start, n):
+    """Computes the log likelihood of a range of paths given the transition matrix."""
+    source, target, weights = _transitions(arrays, part, order, start)
+    rows = arrays['rows']
+    probabilities = _gather(arrays['keys'], arrays['data'], n, rows[source], rows[target])
+    with np.errstate(divide='ignore'):
+        return np.sum(weights * np.log(probabilities))
+
+def _generate_paths(arrays, part, start, seed):
+    """Generates paths by advancing all walkers of a partition in lockstep.
+       The next states are sampled by a binary search of uniform random numbers
+       in the row-offset cumulative probabilities of the transition matrix.
+       Returns the unique sequences of row ids (padded with -1) and their counts."""
+    indptr, indices = arrays['indptr'], arrays['indices']
+    cumulative, ends = arrays['cumulative'], arrays['ends']
+    rng = np.random.default_rng(None if seed is None else [seed, int(part[0])])
+
+    walks = [np.full(len(part), start)]
+    active = np.flatnonzero(~ends[walks[0]] & (indptr[walks[0] + 1] > indptr[walks[0]]))
+    while len(active):
+        rows = walks[-1][active]
+        j = np.searchsorted(cumulative, rows + rng.random(len(rows)), side='right')
+        j = np.clip(j, indptr[rows], indptr[rows + 1] - 1)
+        step = np.full(len(part), -1)
+        step[active] = indices[j]
+        walks.append(step)
+        # walkers stop in end states or states without successors
+        active = active[~ends[indices[j]] & (indptr[indices[j] + 1] > indptr[indices[j]])]
+
+    return np.unique(np.stack(walks, axis=1), axis=0, return_counts=True)
 
 class MOGen:
     """A generative mulit-order model for variable-length paths in networks."""
@@ -190,6 +462,25 @@ class MOGen:
         self.AIC = None
         self.models = collections.defaultdict(lambda: {})
         self.log_L_offset = None
+        self._pagerank = {}
+
+        # orders considered by the last fit, which might stop early
+        self._orders = None
+
+        # paths encoded as integer arrays, the table of all multi-order states
+        # and the states of the sliding windows of each length
+        self._arrays = None
+        self._states = None
+        self._windows = []
+
+        # counted transitions and powers of the adjacency matrix of the last
+        # computed order, which are reused by the next higher order
+        self._transitions = None
+        self._dof = None
+
+        # worker pool and arrays in shared memory used during fit and predict
+        self._executor = None
+        self._shared = None
         
     def update_max_order(self, max_order):
         """Updates the maximum order considered by MOGen's model selection.
@@ -215,72 +506,168 @@ class MOGen:
                 
         return log_factorial(sum(self.paths.values())) - sum(map(log_factorial, self.paths.values()))
         
-    def _chunks(self, iterable, n):
-        if n > len(iterable):
-            n = len(iterable)
-            
-        chunksize = len(iterable) / n
-        for i in range(n):
-            iterator = itertools.islice(iterable, int(i*chunksize), int((i+1)*chunksize))
-            if type(iterable) is list:
-                yield list(iterator)
-            elif type(iterable) is dict:
-                yield {x: iterable[x] for x in iterator}
+    def _encode_paths(self):
+        """Encodes the paths once as arrays of integer node ids.
+           The nodes of all paths are concatenated, where the path p consists of
+           nodes[ptr[p]:ptr[p+1]]. Node ids follow the sorted node uids, which
+           are the labels of the state table shared by all orders."""
+        if self._arrays is None:
+            labels = sorted(set(v for path in self.paths for v in path))
+            index = {v: i for i, v in enumerate(labels)}
+            lengths = np.fromiter(map(len, self.paths), dtype=np.int64, count=len(self.paths))
+            nodes = np.fromiter((index[v] for path in self.paths for v in path),
+                                dtype=np.int64, count=int(lengths.sum()))
+            ptr = np.concatenate(([0], np.cumsum(lengths)))
+            self._arrays = {
+                'nodes': nodes,
+                'ptr': ptr,
+                'positions': np.arange(len(nodes)) - np.repeat(ptr[:-1], lengths),
+                'frequencies': np.repeat(np.fromiter(self.paths.values(), dtype=float,
+                                                     count=len(self.paths)), lengths)}
+            self._states = StateTable(labels)
+            self._states.add(-1, self._states.START)
+        return self._arrays
+
+    def _get_windows(self, order):
+        """Returns the states of the sliding windows with up to order nodes.
+           The window of length k ending in the node at position i is the state
+           given by the window of length k-1 ending at position i-1 and the node
+           at i. Hence, the windows of length k are added to the state table by a
+           single vectorized call. The result contains an array for each length k
+           with the state id for each position (or -1 if the path is too short)."""
+        encoded = self._encode_paths()
+        nodes = encoded['nodes']
+
+        while len(self._windows) < order:
+            k = len(self._windows) + 1
+            if k == 1:
+                ids = self._states.add(-1, nodes)
             else:
-                assert True==False
-                
-    def _count_transitions(args):
-        counter = collections.Counter()
+                valid = np.flatnonzero(encoded['positions'] >= k - 1)
+                ids = np.full(len(nodes), -1)
+                ids[valid] = self._states.add(self._windows[-1][valid - 1], nodes[valid])
+            self._windows.append(ids)
+            encoded['windows{}'.format(k)] = ids
+        return self._windows[:order]
 
-        for path, frequency in args['paths'].items():
-            mask = toeplitz(min(len(path), args['order'])*[1] + \
-                            (len(path)-args['order'])*[0], \
-                            1*[1] + (len(path)-1)*[0])
-            multi_order_path = tuple(map(lambda x: tuple(x[x != None]), np.where(mask, path, None)))
-            multi_order_path = (('*',),) + multi_order_path + (multi_order_path[-1] + ('+',),)
+    def _get_ends(self, order):
+        """Returns the ids of the end states of all paths for the given order,
+           i.e. the states of the last windows followed by the end marker."""
+        encoded = self._encode_paths()
+        key = 'ends{}'.format(order)
+        if key not in encoded:
+            windows = self._get_windows(order)
+            lengths = np.minimum(np.diff(encoded['ptr']), order)
+            last = encoded['ptr'][1:] - 1
+            states = np.empty(len(last), dtype=np.int64)
+            for k, ids in enumerate(windows, start=1):
+                mask = lengths == k
+                states[mask] = ids[last[mask]]
+            encoded[key] = self._states.add(states, self._states.END)
+        return encoded[key]
 
-            for s, t in zip(multi_order_path, multi_order_path[1:]):
-                counter[(s,t)] += frequency
+    def _map(self, func, *args, arrays=None):
+        """Applies a function to partitions of the paths.
+           Without a worker pool the function is called once for all paths.
+           Otherwise, the path arrays are copied to shared memory once and only
+           the given per-call arrays are replaced, so that workers attach to
+           them instead of unpickling the arrays for every task."""
+        encoded = self._encode_paths()
+        items = np.arange(len(encoded['ptr']) - 1)
+        if self._executor is None:
+            return [func(dict(encoded, **(arrays or {})), items, *args)]
+
+        new = {k: v for k, v in encoded.items() if k not in self._shared}
+        self._shared.update(dict(new, **(arrays or {})))
+        return map_partitions(func, self._shared, items, *args, executor=self._executor)
+
+    @contextlib.contextmanager
+    def _pool(self, parallel, executor=None):
+        """Provides a worker pool and shared memory for the duration of a call.
+           A given executor is reused, otherwise a process pool is created if
+           parallel is the number of processes to use."""
+        own = executor is None and parallel > 1
+        if own:
+            executor = ProcessPoolExecutor(parallel)
+        self._executor = executor
+        self._shared = SharedArrays() if executor is not None else None
+        try:
+            yield
+        finally:
+            if self._shared is not None:
+                self._shared.close()
+            self._executor = None
+            self._shared = None
+            if own:
+                executor.shutdown()
+
+    def _no_of_processes(self, no_of_processes, no_of_items):
+        """Returns the number of processes used for the given number of items."""
+        return min(no_of_processes, math.ceil(no_of_items / config['MOGen']['paths_per_chunk']))
 
-        return counter  
-    
     def _get_multi_order_transitions(self, order, no_of_processes=multiprocessing.cpu_count(), verbose=True):
-        n = min(int(np.ceil(len(self.paths)/config['MOGen']['paths_per_chunk'])), no_of_processes)
-        
-        args = [{'paths': path_chunk, 'order': order} for path_chunk in self._chunks(self.paths, n)]
-        
-        counter = collections.Counter()
-        with multiprocessing.Pool(no_of_processes) as p:
-            with tqdm(total=len(args),
-                      desc='order:{1:>3}; T     ({0} prcs)'.format(no_of_processes, order),
-                      disable=not verbose) as pbar:
-                for c in p.imap_unordered(unwrap_self_count_transitions, args, chunksize=1):
-                    counter += c
-                    pbar.update(1)
-            
-        return counter
+        """Counts the transitions between the multi-order states of all paths.
+           Paths are encoded once as integer arrays, whose sliding windows are
+           counted with vectorized reductions per partition of the paths. Returns
+           the ids of the source and target states in the state table and the
+           frequencies of the transitions.
+
+           The transitions to targets at positions up to order-2 are the same
+           for the orders order-1 and order, i.e. exactly the transitions of
+           order-1 from the start or from states with less than order-1 nodes.
+           If order-1 was computed before, these counts are reused and only the
+           transitions to higher-order states are counted."""
+        processes = getattr(self._executor, '_max_workers', 1)
+        with tqdm(total=1,
+                  desc='order:{1:>3}; T     ({0} prcs)'.format(processes, order),
+                  disable=not verbose) as pbar:
+            self._get_ends(order)
+            start = self._states.add(-1, self._states.START)
+            size = len(self._states)
+
+            offset = 0
+            if self._transitions is not None and self._transitions[0] == order - 1:
+                _, source, target, counts = self._transitions
+                keep = (self._states.order[source] < order - 1) | (source == start)
+                reused = source[keep], target[keep], counts[keep]
+                offset = order - 1
+            results = self._map(_count_transitions, order, start, size, offset)
+
+            # merge the counts of the partitions
+            if len(results) == 1:
+                unique, counts = results[0]
+            else:
+                unique, inverse = np.unique(np.concatenate([r[0] for r in results]), return_inverse=True)
+                counts = np.bincount(inverse.ravel(), weights=np.concatenate([r[1] for r in results]),
+                                     minlength=len(unique))
+            source, target = unique // size, unique % size
+
+            # reused and new transitions are disjoint by the length of the source
+            if offset:
+                source, target, counts = (np.concatenate(x) for x in zip(reused, (source, target, counts)))
+            self._transitions = (order, source, target, counts)
+            pbar.update(1)
+
+        return source, target, counts
 
     
     def _get_multi_order_adjacency_matrix(self, order, no_of_processes=multiprocessing.cpu_count(), verbose=True):
-        multi_order_transitions = self._get_multi_order_transitions(order,
-                                                                    no_of_processes=no_of_processes,
-                                                                    verbose=verbose)
-
-        nodes = list(set(n for transition in multi_order_transitions.keys() for n in transition))
-        nodes.sort(key=lambda x: (x[-1] == '#', len(x), x[-1]))
-        node_id_dict = dict(zip(nodes, range(len(nodes))))
-
-        row = []
-        col = []
-        data = []
-        for s, t in multi_order_transitions:
-            row.append(node_id_dict[s])
-            col.append(node_id_dict[t])
-            data.append(multi_order_transitions[(s,t)])
-        A = dok_matrix((len(node_id_dict), len(node_id_dict)))
-        A[row, col] = data
-        
-        return MultiOrderMatrix(A, node_id_dict)
+        source, target, counts = self._get_multi_order_transitions(order,
+                                                                   no_of_processes=no_of_processes,
+                                                                   verbose=verbose)
+
+        # states of the transitions, marked in the table instead of sorting them
+        used = np.zeros(len(self._states), dtype=bool)
+        used[source] = True
+        used[target] = True
+        ids = self._states.sort(np.flatnonzero(used))
+        rows = np.full(len(self._states), -1)
+        rows[ids] = np.arange(len(ids))
+
+        # the counted transitions are unique, i.e. the COO matrix has no duplicates
+        A = coo_matrix((counts, (rows[source], rows[target])), shape=(len(ids), len(ids))).tocsr()
+        
+        return MultiOrderMatrix(A, states=self._states, ids=ids)
     
     
     def _get_multi_order_transition_matrix(self, order, no_of_processes=multiprocessing.cpu_count(),
@@ -295,38 +682,36 @@ class MOGen:
         return T
     
     
-    def _get_log_likelihood_path(args):
-        log_L = 0
-        for path, frequency in args['paths'].items():
-            mask = toeplitz(min(len(path), args['order'])*[1] + \
-                            (len(path)-args['order'])*[0], \
-                            1*[1] + (len(path)-1)*[0])
-            multi_order_path = tuple(map(lambda x: tuple(x[x != None]), np.where(mask, path, None)))
-            multi_order_path = (('*',),) + multi_order_path + (multi_order_path[-1] + ('+',),)          
-
-            for s, t in zip(multi_order_path, multi_order_path[1:]):
-                if s in args['node_id_dict'] and t in args['node_id_dict']:
-                    log_L += np.log(args['T'][args['node_id_dict'][s], args['node_id_dict'][t]]) * frequency
-                else: # the transition is not in the model and therefore has probability 0
-                    log_L += -np.inf
-        return log_L
-    
     def _compute_log_likelihood(self, order, T, no_of_processes=multiprocessing.cpu_count(), verbose=True):      
-        n = min(int(np.ceil(len(self.paths)/config['MOGen']['paths_per_chunk'])), no_of_processes)
-        
-        args = [{'paths': path_chunk,
-                 'order': order,
-                 'T': T.matrix,
-                 'node_id_dict': T.node_id_dict} for path_chunk in self._chunks(self.paths, n)]
-        
-        log_L = 0
-        with multiprocessing.Pool(no_of_processes) as p:
-            with tqdm(total=len(args),
-                      desc='order:{1:>3}; log_L ({0} prcs)'.format(no_of_processes, order),
-                      disable=not verbose) as pbar:
-                for log_likelihood_path in p.imap_unordered(unwrap_self_get_log_likelihood_path, args, chunksize=1):
-                    log_L += log_likelihood_path
-                    pbar.update(1)
+        """Computes the log likelihood of the paths given the transition matrix.
+           The rows and columns of all transitions are gathered into arrays and
+           the transition probabilities are looked up in the CSR data at once.
+           Transitions which are not in the model have probability 0. If the
+           transitions of the order have been counted, the log likelihood is
+           computed from the unique transitions without scanning the paths."""
+        processes = getattr(self._executor, '_max_workers', 1)
+        with tqdm(total=1,
+                  desc='order:{1:>3}; log_L ({0} prcs)'.format(processes, order),
+                  disable=not verbose) as pbar:
+            self._get_ends(order)
+            start = self._states.add(-1, self._states.START)
+
+            rows = np.full(len(self._states), -1)
+            rows[T.ids] = np.arange(len(T.ids))
+            matrix = csr_matrix(T.matrix)
+            if not matrix.has_sorted_indices:
+                matrix = matrix.sorted_indices()
+            arrays = {'rows': rows, 'keys': _csr_keys(matrix), 'data': matrix.data}
+
+            if self._transitions is not None and self._transitions[0] == order:
+                _, source, target, counts = self._transitions
+                probabilities = _gather(arrays['keys'], arrays['data'], matrix.shape[1],
+                                        rows[source], rows[target])
+                with np.errstate(divide='ignore'):
+                    log_L = np.sum(counts * np.log(probabilities))
+            else:
+                log_L = sum(self._map(_log_likelihood, order, start, matrix.shape[1], arrays=arrays))
+            pbar.update(1)
                 
         return log_L
     
@@ -334,12 +719,15 @@ class MOGen:
         # generate binary adjacency matrix
         A = self.network.adjacency_matrix(weight=None)
                 
-        # compute k
-        P = A.copy()
-        dof = A.shape[0] - 1 + P.sum()
-        for i in range(1, order):
-            P *= A
+        # compute k, continuing with the powers of A of a lower order
+        if self._dof is not None and self._dof[0] <= order:
+            k, P, dof = self._dof
+        else:
+            k, P, dof = 1, A.copy(), A.shape[0] - 1 + A.sum()
+        for i in range(k, order):
+            P = P * A
             dof += P.sum()
+        self._dof = (order, P, dof)
         return int(dof)
     
     def _compute_AIC(self, order, T, no_of_processes=multiprocessing.cpu_count(), verbose=True):
@@ -363,6 +751,14 @@ class MOGen:
         self.models[order]['dof'] = dof
         self.models[order]['AIC'] = AIC
     
+    def _get_orders(self):
+        """Returns the orders considered by the last model selection."""
+        if self._orders is not None:
+            return self._orders
+        if self.model_selection:
+            return list(range(1, self.max_order+1))
+        return [self.max_order]
+
     def summary(self, print_summary=True):
         """Returns a summary of the multi-order model."""
 
@@ -390,14 +786,9 @@ class MOGen:
         # add row for each order
         data = [[], [], [], [], []]
 
-        if self.model_selection:
-            orders = list(range(1, self.max_order+1))
-        else:
-            orders = [self.max_order]
-        
-        for order in orders:           
+        for order in self._get_orders():           
             try:
-                data[0].append(len(self.models[order]['A'].node_id_dict))
+                data[0].append(self.models[order]['A'].matrix.shape[0])
                 data[1].append(int(np.sum(np.sum(self.models[order]['A'].matrix))))
                 data[2].append(self.models[order]['log_L'])
                 data[3].append(self.models[order]['dof'])
@@ -431,8 +822,14 @@ class MOGen:
     def __repr__(self):
         return self.summary(print_summary=False)
     
-    def fit(self, no_of_processes=multiprocessing.cpu_count(), verbose=True):
-        """Estimate the optimal MOGen from all models up to max_order."""
+    def fit(self, no_of_processes=multiprocessing.cpu_count(), verbose=True, executor=None,
+            early_stopping=False):
+        """Estimate the optimal MOGen from all models up to max_order.
+           A single worker pool is used for all orders, either the given
+           executor or a process pool created for the duration of the fit.
+           Orders are computed in increasing order, reusing the counts of the
+           previous order. With early_stopping, the model selection stops once
+           the AIC of an order is larger than the AIC of the previous order."""
         
         LOG.debug('start estimate optimal order')
         a = datetime.datetime.now()
@@ -442,15 +839,23 @@ class MOGen:
             self.log_L_offset = self._get_log_likelihood_offset(self)
         
         # orders that still have to be computed
-        cur_orders = set(self.models.keys())
+        cur_orders = {order for order in self.models if 'AIC' in self.models[order]}
         if self.model_selection:
-            req_orders = set(range(1, self.max_order+1))
+            req_orders = list(range(1, self.max_order+1))
         else:
-            req_orders = {self.max_order}
+            req_orders = [self.max_order]
             
         # compute orders not yet computed
-        for order in req_orders.difference(cur_orders):
-            self._compute_order(order, no_of_processes=no_of_processes, verbose=verbose)
+        self._orders = []
+        with self._pool(self._no_of_processes(no_of_processes, len(self.paths)), executor):
+            for order in req_orders:
+                if order not in cur_orders:
+                    self._compute_order(order, no_of_processes=no_of_processes, verbose=verbose)
+                self._orders.append(order)
+                if early_stopping and len(self._orders) > 1 and \
+                   self.models[order]['AIC'] > self.models[self._orders[-2]]['AIC']:
+                    break
+        req_orders = self._orders
             
         AICs = collections.defaultdict(lambda: list())
         for order in req_orders:
@@ -475,10 +880,7 @@ class MOGen:
         return self
 
     def plot(self):
-        if self.model_selection:
-            orders = list(range(1, self.max_order+1))
-        else:
-            orders = [self.max_order]
+        orders = self._get_orders()
         
         assert all(order in self.models for order in orders)
         
@@ -510,85 +912,89 @@ class MOGen:
         plt.yscale('log')
         plt.show()
 
-    def _generate_path_chunk(args):
-        generated_paths_hon_chunk = collections.Counter()
-
-        for i in range(args['no_of_paths']):
-            generated_path = (args['start_node'],)
-            while generated_path[-1][-1] != '+':
-                c = np.random.choice(list(args['id_node_dict'].keys()),
-                                     p=np.ravel(args['mat'][args['node_id_dict'][generated_path[-1]]].todense()))
-                generated_path += ((args['id_node_dict'][c]),)
-            
-            generated_paths_hon_chunk[generated_path] += 1
-        
-        return generated_paths_hon_chunk
-        
-        
     def predict(self, no_of_paths, max_order=None, seed=None, start_node=('*',),
-                       no_of_processes=multiprocessing.cpu_count(), paths_per_process=1000):
-        
-        np.random.seed(None)
+                       no_of_processes=multiprocessing.cpu_count(), paths_per_process=1000, executor=None):
+        """Generates paths from the multi-order model.
+           All paths of a partition are generated in lockstep, where the worker
+           processes attach to the transition matrix in shared memory. Given a
+           seed, the generated paths are reproducible for the same partitions."""
         
         if max_order:
             assert max_order in self.models
-            mat = self.models[max_order]['T'].matrix
-            node_id_dict = self.models[max_order]['T'].node_id_dict
+            T = self.models[max_order]['T']
         else:
-            mat = self.T.matrix
-            node_id_dict = self.T.node_id_dict
-        id_node_dict = {v: k for k, v in node_id_dict.items()}
-        nodes = [id_node_dict[k] for k in sorted(id_node_dict)]
-        
-        assert start_node in node_id_dict.keys()
-
-        splits = []
-        for i in range(max(1, int(np.floor(no_of_paths / paths_per_process))),0,-1):
-            splits.append(round((no_of_paths-sum(splits))/i))
-        
-        args = [{'no_of_paths': split,
-                 'start_node': start_node,
-                 'id_node_dict': id_node_dict,
-                 'node_id_dict': node_id_dict,
-                 'mat': mat} for split in splits]
-                
+            T = self.T
+        
+        assert start_node in T.node_id_dict.keys()
+
+        matrix = csr_matrix(T.matrix)
+        if not matrix.has_sorted_indices:
+            matrix = matrix.sorted_indices()
+        arrays = {'indptr': matrix.indptr,
+                  'indices': matrix.indices,
+                  'cumulative': cumulative_rows(matrix),
+                  'ends': T.states.ends(T.ids)}
+        items = np.arange(no_of_paths)
+        start = T.node_id_dict[start_node]
+
         generated_paths_hon = collections.Counter()
-        with multiprocessing.Pool(no_of_processes) as p:
-            with tqdm(total=len(args)) as pbar:
-                for generated_paths_hon_chunk in p.imap_unordered(unwrap_self_generate_paths_chunk, args, chunksize=1):
-                    generated_paths_hon += generated_paths_hon_chunk
-                    pbar.update(1)
+        with self._pool(min(no_of_processes, math.ceil(no_of_paths / paths_per_process)), executor):
+            with tqdm(total=1) as pbar:
+                if self._executor is None:
+                    results = [_generate_paths(arrays, items, start, seed)]
+                else:
+                    self._shared.update(arrays)
+                    results = map_partitions(_generate_paths, self._shared, items, start, seed,
+                                             executor=self._executor)
+                for walks, counts in results:
+                    for walk, count in zip(walks.tolist(), counts.tolist()):
+                        generated_paths_hon[tuple(x for x in walk if x >= 0)] += count
+                pbar.update(1)
 
+        # tuples of node uids are only created for the generated paths
+        nodes = T.states.tuples(T.ids)
+        last = [T.states.labels[v] if v < T.states.START else None
+                for v in T.states.node[T.ids].tolist()]
         generated_paths = {}
         
         for k, v in generated_paths_hon.items():
             if start_node == ('*',):
-                generated_paths[tuple(x[-1] for x in k[1:-1])] = v
+                generated_paths[tuple(last[x] for x in k[1:-1])] = v
             else:
-                generated_paths[k[0] + tuple(x[-1] for x in k[1:-1])] = v
+                generated_paths[nodes[k[0]] + tuple(last[x] for x in k[1:-1])] = v
         
         return generated_paths
     
     
-    def pagerank(self, max_order=None):
+    def pagerank(self, max_order=None, **kwargs):
+        """Computes the PageRank of the nodes based on the multi-order model.
+           The stationary distribution of the multi-order states is computed
+           iteratively and warm started from the previous result, i.e. the
+           PageRank of a refitted model is obtained in a few iterations.
+           Keyword arguments are passed to stationary_distribution."""
         if max_order:
             T = self.models[max_order]['T'].integrate_zero_order()
         else:
             T = self.T.integrate_zero_order()
 
-        _, v = sla.eigs(T.matrix.T, k=1, which="LM")
-        v = list(map(np.abs, np.real(v)))
-        v = v / sum(v)
-        c = collections.defaultdict(lambda: 0)
-        for node in T.node_id_dict.keys():
-            pr = v[T.node_id_dict[node]]
-            if pr.imag == 0:
-                c[node[-1]] += pr.real
-            else:
-                assert True==False
-        pagerank = pd.DataFrame([v for k, v in c.items()],
-                                   index=c.keys(),
-                                   columns=['score']).sort_values('score', ascending=False)
+        # previous solution indexed by the ids of the state table
+        previous = self._pagerank.get(max_order)
+        if previous is not None and 'x0' not in kwargs:
+            x0 = np.zeros(len(T.states))
+            x0[previous[0]] = previous[1]
+            x0 = x0[T.ids]
+            if x0.sum() > 0:
+                kwargs['x0'] = x0
+
+        v = stationary_distribution(T.matrix, **kwargs)
+        self._pagerank[max_order] = (T.ids, v)
+
+        last = T.states.node[T.ids]
+        nodes = np.unique(last)
+        scores = np.bincount(last, weights=v)[nodes]
+        pagerank = pd.DataFrame(scores,
+                                index=[T.states.labels[x] for x in nodes.tolist()],
+                                columns=['score']).sort_values('score', ascending=False)
         return pagerank
     
     
@@ -598,22 +1004,20 @@ class MOGen:
         else:
             T = self.T.integrate_zero_order()
             
-        M = MultiOrderMatrix(np.zeros(shape=(len(T.node_id_dict), len(T.node_id_dict))), T.node_id_dict)
-        M.matrix = M.matrix.tolil()
+        # the passage times are computed from dense inverses of the transient matrices
+        T_dense = T.matrix.toarray()
+        I = np.eye(T_dense.shape[0])
+        M = np.zeros(T_dense.shape)
         
-        for target in T.node_id_dict.keys():
-            T_target = T.matrix.tolil()
-
-            for node in T.node_id_dict:    
-                if node == target:
-                    T_target[T.node_id_dict[node],:] = 0
-
-            res = np.linalg.inv(np.eye(T_target.shape[0]) - T_target) - np.eye(T_target.shape[0])
+        for target in range(T_dense.shape[0]):
+            T_target = T_dense.copy()
+            T_target[target,:] = 0
 
-            res = MultiOrderMatrix(res, T.node_id_dict)
+            res = np.linalg.inv(I - T_target) - I
             
-            M.matrix[:,[res.node_id_dict[target]]] = res.matrix @ np.ones(shape=(res.matrix.shape[0],1))
+            M[:,target] = res.sum(axis=1)
 
+        M = MultiOrderMatrix(M, states=T.states, ids=T.ids)
         M = M.to_first_order()
             
         if recurrence:
@@ -630,7 +1034,7 @@ class MOGen:
             T = self.T.remove_zero_order()
         
         N = np.linalg.inv(np.identity(T.matrix.shape[0]) - T.matrix)
-        return MultiOrderMatrix(N, T.node_id_dict)
+        return MultiOrderMatrix(N, states=T.states, ids=T.ids)
     
     
     def transient_matrix(self, max_order=None):
@@ -638,7 +1042,7 @@ class MOGen:
         
         H = (N.matrix - np.identity(N.matrix.shape[0])) @ np.linalg.inv(np.diag(np.diag(N.matrix.todense())))
         
-        return MultiOrderMatrix(H, N.node_id_dict)
+        return MultiOrderMatrix(H, states=N.states, ids=N.ids)
 
     
 # =============================================================================
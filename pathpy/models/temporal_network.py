@@ -20,6 +20,7 @@ from pathpy.core.node import Node, NodeCollection
 from pathpy.core.edge import Edge, EdgeCollection
 from pathpy.core.path import Path
 from pathpy.core.network import Network
+from pathpy.core.base import GraphStorage
 
 from pathpy.models.models import ABCTemporalNetwork
 
@@ -57,6 +58,10 @@ class TemporalNetwork(ABCTemporalNetwork, Network):
             multiedges=multiedges,
             nodes=self._nodes)
 
+        # integer indexed storage of the network topology
+        self._storage: GraphStorage = GraphStorage(self._nodes,
+                                                   directed=directed)
+
     def add_edge(self, *edge: Union[str, tuple, list, Node, Edge],
                  uid: Optional[str] = None, **kwargs: Any) -> None:
         """Add an temporal edge."""
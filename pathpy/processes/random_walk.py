@@ -10,17 +10,21 @@
 # =============================================================================
 from __future__ import annotations
 import abc
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 import numpy as np
 import scipy as sp  # pylint: disable=import-error
 from scipy.sparse import linalg as spl
-from scipy import linalg as spla
 
 from pathpy import logger, tqdm
+from pathpy.utils.helper import cumulative_rows
 # from pathpy.core.path import Path
+from pathpy.core.node import Node, NodeCollection
+from pathpy.core.edge import Edge, EdgeCollection
+from pathpy.core.path import Path, PathCollection
 from pathpy.core.network import Network
 from pathpy.algorithms.matrices import adjacency_matrix
+from pathpy.algorithms.centralities import stationary_distribution
 
 # create custom types
 Weight = Union[str, bool, None]
@@ -45,6 +49,70 @@ class BaseWalk:
         """Abstract state property."""
 
 
+class TeleportationMatrix(spl.LinearOperator):
+    """Transition matrix of a random walk with teleportation.
+
+    The matrix is given by
+
+    .. math::
+
+        T = S + r 1^T / n
+
+    where S is a sparse matrix, e.g. the row normalized adjacency matrix
+    multiplied by the probability to follow an edge, and r contains the
+    probabilities to teleport to a node chosen uniformly at random from the
+    n nodes. The dense rank-one term is never stored, i.e. the operator
+    needs O(n + m) memory and products with vectors take O(n + m) time.
+
+    Parameters
+    ----------
+    matrix : sparse.csr_matrix
+
+        The sparse part S of the transition matrix.
+
+    restart : np.ndarray
+
+        The teleportation probabilities r of all nodes.
+
+    """
+
+    def __init__(self, matrix: sp.sparse.csr_matrix,
+                 restart: np.ndarray) -> None:
+        """Initialize the operator."""
+        super().__init__(dtype=float, shape=matrix.shape)
+        self.sparse: sp.sparse.csr_matrix = matrix
+        self.restart: np.ndarray = np.asarray(restart, dtype=float)
+
+    def _matvec(self, x: np.ndarray) -> np.ndarray:
+        x = np.ravel(x)
+        return self.sparse @ x + self.restart * (x.sum() / self.shape[1])
+
+    def _rmatvec(self, x: np.ndarray) -> np.ndarray:
+        x = np.ravel(x)
+        return (self.sparse.transpose() @ x +
+                (self.restart @ x) / self.shape[1])
+
+    def _matmat(self, X: np.ndarray) -> np.ndarray:
+        return (self.sparse @ X +
+                np.outer(self.restart, X.sum(axis=0) / self.shape[1]))
+
+    def _rmatmat(self, X: np.ndarray) -> np.ndarray:
+        return (self.sparse.transpose() @ X +
+                np.outer(np.ones(self.shape[1]),
+                         self.restart @ X / self.shape[1]))
+
+    def row(self, i: int) -> np.ndarray:
+        """Returns the transition probabilities of node ``i``."""
+        return (np.ravel(self.sparse[i, :].toarray()) +
+                self.restart[i] / self.shape[1])
+
+    def toarray(self) -> np.ndarray:
+        """Returns the transition matrix as dense array."""
+        return (self.sparse.toarray() +
+                np.outer(self.restart, np.ones(self.shape[1])) /
+                self.shape[1])
+
+
 class RandomWalk(BaseWalk):
     """Class for a random walker
 
@@ -54,12 +122,15 @@ class RandomWalk(BaseWalk):
     """
 
     def __init__(self, network: Network, weight: Weight = None,
-                 start_node: Optional[str] = None, restart_prob = 0) -> None:
+                 start_node: Optional[str] = None, restart_prob = 0,
+                 seed: Union[int, np.random.Generator, None] = None) -> None:
         """Initialises a random walk process in a given start node.
 
         The initial time t of the random walk will be set to zero and the
         initial state is set to the given start node. If start_node is omitted a
-        node will be chosen uniformly at random.
+        node will be chosen uniformly at random. The ``seed`` initializes the
+        random number generator of the walk, which can also be a
+        ``numpy.random.Generator``.
 
         """
         # initialize variables
@@ -70,9 +141,15 @@ class RandomWalk(BaseWalk):
         # time of the random walk
         self._t: int = 0
 
+        # random number generator of the walk
+        self._rng: np.random.Generator = np.random.default_rng(seed)
+
         # transition matrix for the random walk
         self._transition_matrix = RandomWalk.transition_matrix(network, weight, restart_prob)
 
+        # arrays to sample the transitions, see _sampler
+        self._cumulative: Optional[tuple] = None
+
         # uids of the nodes
         self._node_uids: list = list(network.nodes.keys())
 
@@ -83,25 +160,15 @@ class RandomWalk(BaseWalk):
         # TODO: implement new path class
         # self._path = Path()
 
-        # eigenvectors and eigenvalues
-        if network.number_of_nodes()>2:
-            _, eigenvectors = spl.eigs(            
-                    self._transition_matrix.transpose(), k=1, which='LM')
-            pi = eigenvectors.reshape(eigenvectors.size, )
-        else:
-            eigenvals, eigenvectors = spla.eig(self._transition_matrix.transpose().toarray())
-            x = np.argsort(-eigenvals)
-            pi = eigenvectors[x][:,0]
-
-        # stationary probabilities
-        self._stationary_probabilities = np.real(pi/np.sum(pi))
+        # stationary probabilities, which are computed on first access
+        self._stationary_probabilities: Optional[np.ndarray] = None
 
         if start_node is None:
-            self._current_node = np.random.choice(self._node_uids)
+            self._current_node = self._rng.choice(self._node_uids)
         elif start_node not in network.nodes:
             LOG.warning('Invalid start node for random walk. '
                         'Picking random node.')
-            self._current_node = np.random.choice(self._node_uids)
+            self._current_node = self._rng.choice(self._node_uids)
         else:
             self._current_node = start_node
 
@@ -114,8 +181,12 @@ class RandomWalk(BaseWalk):
     def stationary_probabilities(self, **kwargs: Any) -> np.array:
         """Computes stationary visitation probabilities.
 
-        Computes stationary visitation probabilities of nodes based on the
-        leading eigenvector of the transition matrix.
+        Computes stationary visitation probabilities of nodes by iterating
+        the transition matrix, see
+        :py:func:`pathpy.algorithms.centralities.stationary_distribution`.
+        The probabilities are computed on first access and cached. If
+        arguments are given, they are recomputed starting from the cached
+        solution unless another initial vector ``x0`` is given.
 
         Parameters
         ----------
@@ -123,16 +194,18 @@ class RandomWalk(BaseWalk):
         **kwargs: Any
 
             Arbitrary key-value pairs that will be passed to the
-            scipy.sparse.linalg.eigs function.
+            stationary_distribution function, e.g. ``tol``, ``max_iter``,
+            ``x0`` or ``method``.
 
         """
-        _p = self._stationary_probabilities
-        if kwargs:
-            _, eigenvectors = sp.sparse.linalg.eigs(
-                self._transition_matrix.transpose(), k=1, which='LM', **kwargs)
-            pi = eigenvectors.reshape(eigenvectors.size, )
-            _p = np.real(pi/np.sum(pi))
-        return _p
+        if self._stationary_probabilities is None or kwargs:
+            kwargs.setdefault('x0', self._stationary_probabilities)
+            T = self._transition_matrix
+            if isinstance(T, TeleportationMatrix):
+                T = T.sparse
+            self._stationary_probabilities = stationary_distribution(
+                T, **kwargs)
+        return self._stationary_probabilities
 
     def visitation_frequencies(self) -> np.array:
         """Returns the visitation frequencies of nodes in the sequence of visited nodes.
@@ -152,9 +225,14 @@ class RandomWalk(BaseWalk):
         """
         assert start_node in self._network.nodes.uids
 
-        initial_dist = np.zeros(self._network.number_of_nodes())
-        initial_dist[self._network.nodes.index[start_node]] = 1.0
-        return np.dot(initial_dist, (self._transition_matrix**t).todense())
+        dist = np.zeros(self._network.number_of_nodes())
+        dist[self._network.nodes.index[start_node]] = 1.0
+
+        # propagate the distribution instead of computing the matrix power
+        T = self._transition_matrix.transpose()
+        for _ in range(t):
+            dist = T @ dist
+        return dist
 
     @property
     def total_variation_distance(self) -> float:
@@ -167,7 +245,8 @@ class RandomWalk(BaseWalk):
         current relaxation of the random walk process.
 
         """
-        return self.TVD(self._stationary_probabilities, self.visitation_frequencies())
+        return self.TVD(self.stationary_probabilities(),
+                        self.visitation_frequencies())
 
     def transition_probabilities(self, node: str) -> np.array:
         """Returns a vector that contains transition probabilities.
@@ -176,21 +255,28 @@ class RandomWalk(BaseWalk):
         node to all other nodes in the network.
 
         """
-        return np.nan_to_num(np.ravel(
-            self._transition_matrix[
-                self._network.nodes.index[node], :].todense()))
+        i = self._network.nodes.index[node]
+        if isinstance(self._transition_matrix, TeleportationMatrix):
+            return self._transition_matrix.row(i)
+        return np.ravel(self._transition_matrix[i, :].toarray())
 
     @staticmethod
     def TVD(a ,b) -> float:        
         return np.abs(a - b).sum()/2.0
 
     @staticmethod
-    def transition_matrix(network: Network,
-                          weight: Weight = None, restart_prob: float = 0) -> sp.sparse.csr_matrix:
+    def transition_matrix(network: Network, weight: Weight = None,
+                          restart_prob: float = 0
+                          ) -> Union[sp.sparse.csr_matrix,
+                                     TeleportationMatrix]:
         """Returns a transition matrix of the random walker.
 
         Returns a transition matrix that describes a random walk process in the
-        given network.
+        given network. The matrix is obtained by normalizing the rows of the
+        adjacency matrix in O(m) time. If ``restart_prob`` is larger than
+        zero, the teleportation to a node chosen uniformly at random is not
+        stored explicitly but represented as rank-one correction of the
+        sparse matrix, see :py:class:`TeleportationMatrix`.
 
         Parameters
         ----------
@@ -203,21 +289,36 @@ class RandomWalk(BaseWalk):
             Whether to account for edge weights when computing transition
             probabilities.
 
+        restart_prob: float
+
+            Probability to restart the walk in a node chosen uniformly at
+            random. Nodes without successors always restart if the
+            probability is larger than zero.
+
+        Returns
+        -------
+        csr_matrix or TeleportationMatrix
+
+            Returns a sparse matrix if ``restart_prob`` is zero and a
+            :py:class:`TeleportationMatrix` otherwise.
+
         """
-        A = adjacency_matrix(network, weight=weight)
-        D = A.sum(axis=1)
-        n = network.number_of_nodes()
-        T = sp.sparse.csr_matrix((n, n))
-        for i in range(n):
-            for j in range(n):
-                if D[i]>0:
-                    T[i,j] = restart_prob*(1./n) + (1-restart_prob)*A[i,j]/D[i]
-                else:                    
-                    LOG.warning('Computing transition matrix for node with zero out-degree')
-                    if restart_prob>0:
-                        T[i,j] = 1./n 
-                    else:     
-                        T[i,j] = 0.0
+        A = sp.sparse.csr_matrix(adjacency_matrix(network, weight=weight),
+                                 dtype=float)
+        D = np.ravel(A.sum(axis=1))
+        dangling = D == 0
+        if dangling.any():
+            LOG.warning('Computing transition matrix for %d nodes with zero '
+                        'out-degree', np.count_nonzero(dangling))
+
+        # row normalization of the adjacency matrix
+        inv = np.divide(1.0, D, out=np.zeros_like(D), where=~dangling)
+        T = sp.sparse.csr_matrix(
+            sp.sparse.diags((1 - restart_prob) * inv) @ A)
+
+        if restart_prob > 0:
+            restart = np.where(dangling, 1.0, restart_prob)
+            return TeleportationMatrix(T, restart)
         return T
 
     @property
@@ -282,13 +383,14 @@ class RandomWalk(BaseWalk):
         if self._current_node is None:
             # Terminate the iteration
             return None
+        node = np.array([self._network.nodes.index[self._current_node]])
         for t in tqdm(range(steps)):
-            prob = self.transition_probabilities(self._current_node)
-            if prob.sum() == 0:
+            node = self.next_nodes(node)
+            i = int(node[0])
+            if i < 0:
                 self._current_node = None
                 # Terminate the iteration
                 return None
-            i = np.random.choice(a=self._network.number_of_nodes(), p=prob)
             self._current_node = self._node_uids[i]
             self._visitations[i] += 1
             self._t += 1
@@ -299,6 +401,266 @@ class RandomWalk(BaseWalk):
             # yield the next visited node
             yield self._current_node
 
+    def next_nodes(self, nodes: np.ndarray) -> np.ndarray:
+        """Samples the next nodes of independent random walkers.
+
+        All walkers are advanced by a single step at once. The successor of
+        every walker is sampled by a binary search in the cumulative
+        transition probabilities of its current node, i.e. in O(log d) time
+        for a node with d successors, while teleportations are sampled
+        separately with the restart probability.
+
+        Parameters
+        ----------
+        nodes : np.ndarray
+
+            Integer indices of the current nodes of the walkers, ordered as
+            ``network.nodes.index``.
+
+        Returns
+        -------
+        np.ndarray
+
+            Returns the indices of the next nodes, where ``-1`` marks
+            walkers in nodes without successors, which cannot continue.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import pathpy as pp
+        >>> net = pp.Network(directed=True)
+        >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'))
+        >>> rw = pp.processes.RandomWalk(net, seed=1)
+        >>> rw.next_nodes(np.zeros(5, dtype=int))
+        array([1, 1, 1, 1, 1])
+
+        """
+        indptr, indices, cumulative, restart = self._sampler()
+        nodes = np.asarray(nodes, dtype=np.int64)
+        n = len(indptr) - 1
+        k = len(nodes)
+        if k == 0:
+            return nodes
+
+        # search the sampled value in the cumulative probabilities, which
+        # are offset by the node index to form a single increasing array
+        follow = np.full(k, -1, dtype=np.int64)
+        start = indptr[nodes]
+        end = indptr[nodes + 1]
+        active = end > start
+        if len(indices) > 0 and active.any():
+            x = nodes[active]
+            j = np.searchsorted(cumulative, x + self._rng.random(len(x)),
+                                side='right')
+            j = np.clip(j, start[active], end[active] - 1)
+            follow[active] = indices[j]
+
+        if restart is not None:
+            teleport = self._rng.random(k) < restart[nodes]
+            follow[teleport] = self._rng.integers(n, size=int(teleport.sum()))
+
+        return follow
+
+    def simulate(self, n_walkers: int, steps: int,
+                 start_nodes: Optional[Iterable] = None,
+                 out: Optional[str] = None,
+                 chunksize: int = 65536) -> np.ndarray:
+        """Simulates many independent random walks in lockstep.
+
+        All walkers are advanced at once by :py:meth:`next_nodes`, i.e. a
+        step of all walkers is a single vectorized operation. The state of
+        the random walk process, e.g. :py:attr:`t` and
+        :py:attr:`state`, is not changed.
+
+        Parameters
+        ----------
+        n_walkers : int
+
+            Number of independent random walkers.
+
+        steps : int
+
+            Number of steps of every walker.
+
+        start_nodes : Iterable, optional (default = None)
+
+            Start nodes of the walkers given as uids or integer indices. If
+            omitted the start nodes are chosen uniformly at random.
+
+        out : str, optional (default = None)
+
+            If given, the trajectories are written to a memory-mapped file
+            with this name, which is returned instead of an array in memory.
+
+        chunksize : int, optional (default = 65536)
+
+            Number of walkers which are simulated at once, i.e. the memory
+            needed besides the result is O(chunksize * steps).
+
+        Returns
+        -------
+        np.ndarray
+
+            Returns an int32 matrix of shape ``(n_walkers, steps + 1)``
+            whose rows contain the indices of the visited nodes, ordered as
+            ``network.nodes.index``. Walkers which reach a node without
+            successors stop and the remaining entries are ``-1``. Use
+            :py:meth:`to_paths` to obtain a :py:class:`PathCollection`.
+
+        Examples
+        --------
+        >>> import pathpy as pp
+        >>> net = pp.Network(directed=True)
+        >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'))
+        >>> rw = pp.processes.RandomWalk(net, seed=1)
+        >>> rw.simulate(2, 3, start_nodes=['a', 'b'])
+        array([[0, 1, 2, 0],
+               [1, 2, 0, 1]], dtype=int32)
+
+        """
+        n = self._network.number_of_nodes()
+        if start_nodes is None:
+            starts = self._rng.integers(n, size=n_walkers)
+        else:
+            index = self._network.nodes.index
+            starts = np.array([index[v] if isinstance(v, str) else v
+                               for v in start_nodes], dtype=np.int64)
+            if len(starts) != n_walkers:
+                LOG.error('A start node is needed for each of the %d '
+                          'walkers', n_walkers)
+                raise KeyError
+
+        shape = (n_walkers, steps + 1)
+        if out is not None:
+            trajectories = np.memmap(out, dtype=np.int32, mode='w+',
+                                     shape=shape)
+        else:
+            trajectories = np.empty(shape, dtype=np.int32)
+
+        for lo in range(0, n_walkers, chunksize):
+            hi = min(lo + chunksize, n_walkers)
+            block = np.full((hi - lo, steps + 1), -1, dtype=np.int32)
+            nodes = starts[lo:hi]
+            block[:, 0] = nodes
+
+            # only walkers which did not get stuck are advanced
+            alive = np.arange(hi - lo)
+            for t in range(1, steps + 1):
+                nodes = self.next_nodes(nodes)
+                moved = nodes >= 0
+                alive, nodes = alive[moved], nodes[moved]
+                if len(alive) == 0:
+                    break
+                block[alive, t] = nodes
+
+            trajectories[lo:hi] = block
+
+        if isinstance(trajectories, np.memmap):
+            trajectories.flush()
+        return trajectories
+
+    def to_paths(self, trajectories: np.ndarray) -> PathCollection:
+        """Returns the distinct trajectories of walkers as paths.
+
+        Identical trajectories are counted by sorting the rows of the
+        trajectory matrix, i.e. a path object is only created for each
+        distinct trajectory. The number of walkers which followed a path is
+        stored in its ``frequency`` attribute, which can be used to fit a
+        :py:class:`MOGen` model.
+
+        Parameters
+        ----------
+        trajectories : np.ndarray
+
+            Matrix of node indices as returned by :py:meth:`simulate`.
+
+        Returns
+        -------
+        PathCollection
+
+            Returns the distinct trajectories with their frequencies. The
+            node and edge objects are shared with the network, while new
+            edges are only created for teleportations and for undirected
+            edges traversed against their direction.
+
+        Examples
+        --------
+        >>> import pathpy as pp
+        >>> net = pp.Network(directed=True)
+        >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'))
+        >>> rw = pp.processes.RandomWalk(net, seed=1)
+        >>> paths = rw.to_paths(rw.simulate(10, 2, start_nodes=['a']*10))
+        >>> [p['frequency'] for p in paths]
+        [10]
+
+        """
+        rows, counts = np.unique(np.asarray(trajectories), axis=0,
+                                 return_counts=True)
+        lengths = np.where(rows < 0, 0, 1).argmin(axis=1)
+        lengths[np.all(rows >= 0, axis=1)] = rows.shape[1]
+
+        uids = self._network.nodes.keys()
+        nodes = {i: self._network.nodes[v] for i, v in enumerate(uids)}
+        network_edges = self._network.edges
+        edges: dict = {}
+        paths = []
+        for row, length, count in zip(rows.tolist(), lengths.tolist(),
+                                      counts.tolist()):
+            if length == 0:
+                continue
+            if length == 1:
+                paths.append(Path(nodes[row[0]], frequency=count))
+                continue
+            path = []
+            for v, w in zip(row[:length-1], row[1:length]):
+                if (v, w) not in edges:
+                    edges[v, w] = self._edge(network_edges, nodes[v], nodes[w])
+                path.append(edges[v, w])
+            paths.append(Path(*path, frequency=count))
+
+        nc = NodeCollection()
+        nc.add(*[nodes[i] for i in np.unique(rows[rows >= 0]).tolist()])
+
+        ec = EdgeCollection(nodes=nc)
+        for edge in edges.values():
+            ec._add(edge)
+
+        pc = PathCollection(nodes=nc, edges=ec)
+        for path in paths:
+            pc._add(path)
+
+        return pc
+
+    @staticmethod
+    def _edge(edges: EdgeCollection, v: Node, w: Node) -> Edge:
+        """Helper function returning the edge of the network from v to w."""
+        if (v.uid, w.uid) in edges:
+            edge = edges[v.uid, w.uid]
+            # multi-edges return the set of edges between the nodes
+            if not isinstance(edge, Edge):
+                edge = edge[-1]
+            if edge.v is v and edge.w is w:
+                return edge
+        # teleportation or undirected edge traversed against its direction
+        return Edge(v, w)
+
+    def _sampler(self) -> tuple:
+        """Helper function returning the arrays to sample transitions."""
+        if self._cumulative is None:
+            T = self._transition_matrix
+            restart = None
+            if isinstance(T, TeleportationMatrix):
+                T, restart = T.sparse, T.restart
+
+            T = sp.sparse.csr_matrix(T)
+            T.sum_duplicates()
+            T.eliminate_zeros()
+
+            # cumulative probabilities within the rows in (row, row + 1]
+            self._cumulative = (T.indptr, T.indices, cumulative_rows(T),
+                                restart)
+        return self._cumulative
+
     def transition(self) -> str:
         """Transition of the random walk.
 
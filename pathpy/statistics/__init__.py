@@ -14,6 +14,7 @@
 from pathpy.statistics.degrees import (degree_sequence,
                                        degree_distribution,
                                        degree_assortativity,
+                                       attribute_assortativity,
                                        degree_central_moment,
                                        degree_raw_moment,
                                        degree_generating_function,
@@ -22,13 +23,16 @@ from pathpy.statistics.degrees import (degree_sequence,
                                        )
 
 from pathpy.statistics.clustering import (local_clustering_coefficient,
+                                          local_clustering_coefficients,
                                           avg_clustering_coefficient,
+                                          transitivity,
                                           closed_triads,
                                           )
 
 from pathpy.statistics.modularity import (Q_modularity,
                                           Q_max_modularity,
                                           Q_assortativity_coefficient,
+                                          cluster_labels,
                                           )                                          
 
 # =============================================================================
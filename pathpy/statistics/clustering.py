@@ -11,6 +11,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Set
 import numpy as np
+from scipy import sparse  # pylint: disable=import-error
 
 from pathpy import logger
 
@@ -21,6 +22,9 @@ if TYPE_CHECKING:
 # create logger
 LOG = logger(__name__)
 
+# number of rows of the adjacency matrix which are multiplied at once
+_BLOCK_ROWS = 4096
+
 
 def local_clustering_coefficient(network: Network, v: str) -> float:
     """Calculates the local clustering coefficient of a node in a network.
@@ -37,6 +41,10 @@ def local_clustering_coefficient(network: Network, v: str) -> float:
 
         in undirected and directed networks respectively.
 
+    Here k(i) is the number of edges between the (out-)neighbors of i and d_i
+    is the number of (out-)neighbors of i, where self-loops and multiple edges
+    are ignored.
+
     Parameters
     ----------
     network : Network
@@ -48,23 +56,42 @@ def local_clustering_coefficient(network: Network, v: str) -> float:
         The node for which the local clustering coefficient shall be calculated
 
     """
-    lcc: float = 0.
-    d = network.degrees()
-    o = network.outdegrees()
+    A = _binary_adjacency(network)
+    i = network.nodes.index[v]
+    return float(_coefficients(A, _closed_pairs(A, i, i+1), i)[0])
+
+
+def local_clustering_coefficients(network: Network) -> np.ndarray:
+    """Calculates the local clustering coefficients of all nodes.
+
+    The coefficients are defined as in
+    :py:func:`local_clustering_coefficient`. The closed triads of all nodes
+    are counted at once with sparse matrix products, i.e. by the row sums of
+    :math:`(A A) \\circ A` for the binary adjacency matrix :math:`A`.
+
+    Parameters
+    ----------
+    network : Network
+
+        The network in which to calculate the local clustering coefficients
 
-    if network.directed and o[v] >= 2 or network.directed == False and d[v] >= 2:
-        k: int = 0
-        for edge in network.edges:
-            if (edge.v.uid != edge.w.uid and edge.v in network.successors[v] and
-                    edge.w in network.successors[v]):
-                k += 1
+    Returns
+    -------
+    np.ndarray
 
-        if network.directed:
-            lcc = k/(o[v]*(o[v]-1))
-        else:
-            lcc = 2*k/(d[v]*(d[v]-1))
+        Returns the coefficients ordered as ``network.nodes.index``.
 
-    return lcc
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'))
+    >>> pp.statistics.local_clustering_coefficients(net)
+    array([1.        , 1.        , 0.33333333, 0.        ])
+
+    """
+    A = _binary_adjacency(network)
+    return _coefficients(A, _closed_pairs(A, 0, A.shape[0]))
 
 
 def avg_clustering_coefficient(network: Network) -> float:
@@ -78,8 +105,38 @@ def avg_clustering_coefficient(network: Network) -> float:
         The network in which to calculate the local clustering coefficient.
 
     """
-    return np.mean([local_clustering_coefficient(network, v)
-                    for v in network.nodes.uids])
+    return np.mean(local_clustering_coefficients(network))
+
+
+def transitivity(network: Network) -> float:
+    """Calculates the transitivity (global clustering coefficient).
+
+    The transitivity is the fraction of closed triads among all connected
+    triads, i.e. for undirected networks three times the number of triangles
+    divided by the number of paths of length two.
+
+    Parameters
+    ----------
+
+    network : Network
+
+        The network in which to calculate the transitivity.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'))
+    >>> pp.statistics.transitivity(net)
+    0.6
+
+    """
+    A = _binary_adjacency(network)
+    d = np.diff(A.indptr).astype(float)
+    triads = np.sum(d*(d-1))
+    if triads == 0:
+        return 0.0
+    return float(np.sum(_closed_pairs(A, 0, A.shape[0])) / triads)
 
 
 def closed_triads(network: Network, v: str) -> Set:
@@ -95,8 +152,43 @@ def closed_triads(network: Network, v: str) -> Set:
 
     """
     ct: set = set()
-    for edge in network.edges:
-        if (edge.v in network.successors[v] and
-                edge.w in network.successors[v]):
-            ct.add(edge)
+    successors = network.successors[v]
+    outgoing = network.outgoing
+    for w in successors:
+        for edge in outgoing[w.uid]:
+            if edge.v in successors and edge.w in successors:
+                ct.add(edge)
     return ct
+
+
+def _binary_adjacency(network: Network) -> sparse.csr_matrix:
+    """Helper function returning the adjacency without loops and weights."""
+    A = network.adjacency_matrix()
+    A = sparse.csr_matrix(A - sparse.diags(A.diagonal()))
+    A.eliminate_zeros()
+    A.data[:] = 1.0
+    return A
+
+
+def _closed_pairs(A: sparse.csr_matrix, start: int, end: int) -> np.ndarray:
+    """Helper function counting the connected (out-)neighbors per node.
+
+    The matrix products are computed in blocks of rows to limit the memory
+    used for high degree nodes.
+
+    """
+    pairs = np.zeros(end - start)
+    for i in range(start, end, _BLOCK_ROWS):
+        B = A[i:min(i + _BLOCK_ROWS, end)]
+        pairs[i-start:i-start+B.shape[0]] = (B @ A).multiply(B).sum(axis=1).A1
+    return pairs
+
+
+def _coefficients(A: sparse.csr_matrix, pairs: np.ndarray,
+                  start: int = 0) -> np.ndarray:
+    """Helper function normalizing the closed pairs by the possible pairs."""
+    d = np.diff(A.indptr)[start:start+len(pairs)].astype(float)
+    cc = np.zeros(len(pairs))
+    mask = d >= 2
+    cc[mask] = pairs[mask] / (d[mask] * (d[mask] - 1))
+    return cc
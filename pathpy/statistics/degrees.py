@@ -17,6 +17,7 @@ import numpy as np
 
 from pathpy import logger
 from pathpy.core.network import BaseModel
+from pathpy.statistics.modularity import cluster_labels
 
 # pseudo load class for type checking
 if TYPE_CHECKING:
@@ -60,9 +61,18 @@ def degree_sequence(network: Network, weight: Weight = None) -> np.array:
     >>> s
     array([3.1, 2.1, 1.0])
     """
-    _degrees = np.zeros(network.number_of_nodes(), dtype=float)
-    for v in network.nodes.uids:
-        _degrees[network.nodes.index[v]] = network.degrees(weight=weight)[v]
+    csr = network.csr
+    n = csr.number_of_nodes()
+    weights = csr.edge_weights(weight)
+
+    # every edge contributes to the degrees of both end points, while
+    # self-loops are only counted once
+    _degrees = (np.bincount(csr.sources, weights=weights, minlength=n) +
+                np.bincount(csr.targets, weights=weights, minlength=n))
+    loops = csr.sources == csr.targets
+    if loops.any():
+        _degrees -= np.bincount(csr.sources[loops], weights=weights[loops],
+                                minlength=n)
     return _degrees
 
 
@@ -107,19 +117,13 @@ def degree_distribution(degrees: Union[Network, Iterable],
         dict({ 1.: 0.33333., 2.: 0.33333., 3.: 0.333333. })
     """
 
-    assert isinstance(degrees, (BaseModel, Iterable)), \
-        "degrees can only be Network instance or Iterable that contains degree sequence"
+    _degrees = _sequence(degrees, weight)
+    values, counts = np.unique(_degrees, return_counts=True)
 
+    # integral degrees are returned as int keys
     cnt: defaultdict = defaultdict(float)
-    if isinstance(degrees, BaseModel):
-        n = degrees.number_of_nodes()
-        for v in degrees.nodes.uids:
-            cnt[degrees.degrees(weight=weight)[v]] += 1.0 / n
-    else:
-        n = len(degrees)
-        for d in degrees:            
-            cnt[d] += 1.0 / n
-
+    for d, p in zip(values.tolist(), (counts / len(_degrees)).tolist()):
+        cnt[int(d) if float(d).is_integer() else d] = p
     return cnt
 
 
@@ -130,16 +134,13 @@ def mean_degree(network, weight: Weight = None) -> float:
 
 
 def mean_neighbor_degree(network, weight: Weight = None, exclude_neighbor = False) -> float:
-    """Calculates the mean (weighted degree of a network)
+    """Calculates the mean (weighted) degree of the successors of all nodes.
     """
-    neighbor_degrees = []
-    for v in network.nodes.uids:
-        for w in network.successors[v]:
-            if exclude_neighbor:
-                neighbor_degrees.append(network.degrees(weight=weight)[w.uid] - 1)
-            else:
-                neighbor_degrees.append(network.degrees(weight=weight)[w.uid])
-    return np.mean(neighbor_degrees)
+    _degrees = degree_sequence(network, weight=weight)
+    _, successors, _, _ = network.csr.simple()
+    if exclude_neighbor:
+        return float(np.mean(_degrees[successors] - 1))
+    return float(np.mean(_degrees[successors]))
 
 
 def degree_raw_moment(network: Network, k: int = 1,
@@ -154,11 +155,7 @@ def degree_raw_moment(network: Network, k: int = 1,
         The network in which to calculate the k-th raw moment
 
     """
-    p_k = degree_distribution(network, weight = weight)
-    mom = 0.
-    for x in p_k:
-        mom += x**k * p_k[x]
-    return mom
+    return float(np.mean(_sequence(network, weight)**k))
 
 
 def degree_central_moment(network: Network, k: int = 1,
@@ -173,12 +170,8 @@ def degree_central_moment(network: Network, k: int = 1,
         The network in which to calculate the k-th central moment
 
     """
-    p_k = degree_distribution(network, weight=weight)
-    mean = np.mean(degree_sequence(network))
-    m = 0.
-    for x in p_k:
-        m += (x - mean)**k * p_k[x]
-    return m
+    _degrees = _sequence(network, weight)
+    return float(np.mean((_degrees - np.mean(_degrees))**k))
 
 
 def degree_generating_function(degrees: Union[Network, Iterable], x: Union[float, list, np.ndarray],
@@ -258,25 +251,14 @@ def degree_generating_function(degrees: Union[Network, Iterable], x: Union[float
 
     assert isinstance(degrees, (BaseModel, Iterable)), \
         'degrees can only be Network or Iterable'
-    
-    p_k = degree_distribution(degrees, weight=weight)
 
-    if isinstance(x, float):
-        x_range = [x]
-    else:
-        x_range = x
+    # f(x) = sum_k p_k x^k evaluated for the distinct degrees only
+    values, counts = np.unique(_sequence(degrees, weight), return_counts=True)
+    p_k = counts / counts.sum()
 
-    values: defaultdict = defaultdict(float)
-    for k in p_k:
-        for v in x_range:
-            values[v] += p_k[k] * v**k
-
-    _values: Union[float, np.ndarray]
-    if len(x_range) > 1:
-        _values = np.fromiter(values.values(), dtype=float)
-    else:
-        _values = values[x]
-    return _values
+    if isinstance(x, float):
+        return float(np.power(x, values) @ p_k)
+    return np.power.outer(np.asarray(x, dtype=float), values) @ p_k
 
 
 def molloy_reed_fraction(network: Network, weight: Weight = False) -> float:
@@ -293,40 +275,170 @@ def molloy_reed_fraction(network: Network, weight: Weight = False) -> float:
         The network in which to calculate the Molloy-Reed fraction
 
     """
-    _mrf = (degree_raw_moment(network, k=2, weight=weight) /
-            degree_raw_moment(network, k=1, weight=weight))
-    return _mrf
+    _degrees = _sequence(network, weight)
+    return float(np.mean(_degrees**2) / np.mean(_degrees))
 
 
-def degree_assortativity(network: Network, mode: str = 'in', weight: Weight = None) -> float:
+def degree_assortativity(network: Network,
+                         mode: Union[str, Tuple[str, str]] = 'in',
+                         weight: Weight = None) -> float:
     """Calculates the degree assortativity coefficient of a network.
 
+    The assortativity coefficient is the Pearson correlation coefficient of
+    the degrees at both ends of the edges [1]_. It is computed in O(n + m)
+    from the entries of the adjacency matrix. For weighted networks, the
+    weighted degrees are used and every edge contributes with its weight.
+
     Parameters
     ----------
+    network : Network
+
+        The network in which to calculate the degree assortativity.
+
+    mode : str or tuple, optional (default = 'in')
+
+        Degrees used for directed networks, either ``'in'``, ``'out'`` or
+        ``'total'``. A tuple defines different degrees for the source and
+        the target of the edges, e.g. ``('out', 'in')``. Undirected
+        networks always use the degrees.
+
+    weight : bool, str or None, optional (default = None)
+
+        The edge attribute used as weight.
+
+    Returns
+    -------
+    float
+
+        Returns the degree assortativity coefficient in [-1, 1] or ``nan``
+        if the degrees do not vary.
+
+    References
+    ----------
+    .. [1] M. E. J. Newman, Mixing patterns in networks, Phys. Rev. E 67,
+       026126 (2003).
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edges(('a', 'b'), ('a', 'c'), ('a', 'd'))
+    >>> pp.statistics.degree_assortativity(net)
+    -1.0
+
+    """
+    A = network.adjacency_matrix(weight=weight).tocoo()
+    degrees = {'out': np.asarray(A.sum(axis=1), dtype=float).ravel(),
+               'in': np.asarray(A.sum(axis=0), dtype=float).ravel()}
+    degrees['total'] = degrees['out'] + degrees['in']
+
+    if not network.directed:
+        source = target = degrees['out']
+    else:
+        modes = (mode, mode) if isinstance(mode, str) else tuple(mode)
+        if len(modes) != 2 or any(m not in degrees for m in modes):
+            LOG.error('Mode "%s" is not supported, use "in", "out" or '
+                      '"total"', mode)
+            raise KeyError
+        source, target = degrees[modes[0]], degrees[modes[1]]
 
+    return _pearson(source[A.row], target[A.col], A.data)
+
+
+def attribute_assortativity(network: Network, attribute: str,
+                            weight: Weight = None) -> float:
+    """Calculates the attribute assortativity coefficient of a network.
+
+    The assortativity coefficient measures the tendency of edges to connect
+    nodes with the same value of a categorical node attribute [1]_. It is
+    computed from the mixing matrix of the attribute values in O(n + m).
+
+    Parameters
+    ----------
     network : Network
 
-        The network in which to calculate the Molloy-Reed fraction
+        The network in which to calculate the attribute assortativity.
+
+    attribute : str
+
+        The node attribute defining the categories. Nodes without the
+        attribute form a category of their own.
+
+    weight : bool, str or None, optional (default = None)
+
+        The edge attribute used as weight.
+
+    Returns
+    -------
+    float
+
+        Returns the attribute assortativity coefficient or ``nan`` if all
+        edges connect nodes of the same category.
+
+    References
+    ----------
+    .. [1] M. E. J. Newman, Mixing patterns in networks, Phys. Rev. E 67,
+       026126 (2003).
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edges(('a', 'b'), ('c', 'd'), ('b', 'c'))
+    >>> for v, color in zip('abcd', ['red', 'red', 'blue', 'blue']):
+    ...     net.nodes[v]['color'] = color
+    >>> round(pp.statistics.attribute_assortativity(net, 'color'), 4)
+    0.3333
+
     """
-    A = network.adjacency_matrix(weight=weight)
-    m = np.sum(A)
-    
-    d = network.degrees(weight)
-    if network.directed and mode == 'in':
-        d = network.indegrees(weight)
-    elif network.directed and mode == 'out':
-        d = network.outdegrees(weight)
-    elif not network.directed:
-        m = m/2.
-    idx = network.nodes.index
-
-    cov: float = 0.
-    var: float = 0.
-    for i in network.nodes.keys():
-        for j in network.nodes.keys():
-            cov += (A[idx[i], idx[j]] - (d[i]*d[j])/(2*m)) * d[i] * d[j]
-            if i != j:
-                var -= (d[i]*d[j])/(2*m) * d[i] * d[j]
-            else:
-                var += (d[i] - (d[i]*d[j])/(2*m)) * d[i] * d[j]
-    return cov/var
+    labels = cluster_labels(network, {
+        uid: node.attributes.get(attribute)
+        for uid, node in network.nodes.items()})
+    k = int(labels.max()) + 1 if len(labels) else 0
+
+    A = network.adjacency_matrix(weight=weight).tocoo()
+    total = A.data.sum()
+    if total == 0:
+        return float('nan')
+
+    mixing = np.bincount(labels[A.row] * k + labels[A.col], weights=A.data,
+                         minlength=k*k).reshape(k, k) / total
+    expected = mixing.sum(axis=1) @ mixing.sum(axis=0)
+    if np.isclose(expected, 1.0):
+        return float('nan')
+    return float((np.trace(mixing) - expected) / (1 - expected))
+
+
+def _sequence(degrees: Union[Network, Iterable],
+              weight: Weight = None) -> np.ndarray:
+    """Helper function returning the degree sequence of a network."""
+    assert isinstance(degrees, (BaseModel, Iterable)), \
+        "degrees can only be Network instance or Iterable that contains degree sequence"
+
+    if isinstance(degrees, BaseModel):
+        return degree_sequence(degrees, weight=weight)
+    return np.asarray(list(degrees), dtype=float)
+
+
+def _pearson(x: np.ndarray, y: np.ndarray, w: np.ndarray) -> float:
+    """Helper function returning the weighted Pearson correlation."""
+    total = w.sum()
+    if total == 0:
+        return float('nan')
+    x = x - (w @ x) / total
+    y = y - (w @ y) / total
+    var = np.sqrt((w @ x**2) * (w @ y**2))
+    if var == 0:
+        return float('nan')
+    return float((w @ (x * y)) / var)
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
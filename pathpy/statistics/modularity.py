@@ -9,7 +9,9 @@
 # Copyright (c) 2016-2020 Pathpy Developers
 # =============================================================================
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, Sequence, Tuple, Union
+
+import numpy as np
 
 from pathpy import logger
 
@@ -22,34 +24,69 @@ if TYPE_CHECKING:
 LOG = logger(__name__)
 
 
-def Q_modularity(network: Network, cluster_mapping: Dict) -> float:
+def Q_modularity(network: Network,
+                 cluster_mapping: Union[Dict, Sequence, np.ndarray]) -> float:
     """Computes the Q-modularity of a network for a given cluster mapping
+
+    The modularity is computed as
+
+    .. math::
+
+        Q = \\frac{1}{2m} \\sum_c \\left( A_c - \\frac{D_c^2}{2m} \\right)
+
+    where :math:`A_c` is the sum of the adjacency matrix entries within
+    cluster c and :math:`D_c` is the sum of the degrees of the nodes in
+    cluster c, i.e. it is evaluated in O(n + m) time.
+
+    Parameters
+    ----------
+    network : Network
+
+        The network for which the modularity is computed.
+
+    cluster_mapping : dict or array-like
+
+        Either a dictionary mapping node uids to cluster labels or a
+        sequence of cluster labels ordered as ``network.nodes.index``.
+
+    Examples
+    --------
+    >>> import pathpy as pp
+    >>> net = pp.Network(directed=False)
+    >>> net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'))
+    >>> pp.statistics.Q_modularity(net, {'a': 0, 'b': 0, 'c': 0, 'd': 1})
+    -0.03125
+    >>> pp.statistics.Q_modularity(net, [0, 0, 0, 1])
+    -0.03125
+
     """
-    A = network.adjacency_matrix()
+    within, degrees = _cluster_sums(network, cluster_mapping)
     m = network.number_of_edges()
-
-    q = 0.0
-    for v in network.nodes.uids:
-        for w in network.nodes.uids:
-            if cluster_mapping[v] == cluster_mapping[w]:
-                q += A[network.nodes.index[v], network.nodes.index[w]] - \
-                    network.degrees()[v] * network.degrees()[w]/(2*m)
-    return q/(2*m)
+    return (within - np.sum(degrees**2)/(2*m))/(2*m)
 
 
-def Q_max_modularity(network: Network, cluster_mapping: Dict) -> float:
+def Q_max_modularity(network: Network,
+                     cluster_mapping: Union[Dict, Sequence,
+                                            np.ndarray]) -> float:
     """Computes the maximum theoretically possible Q-modularity
 
     for a given network and cluster mapping
+
+    Parameters
+    ----------
+    network : Network
+
+        The network for which the modularity is computed.
+
+    cluster_mapping : dict or array-like
+
+        Either a dictionary mapping node uids to cluster labels or a
+        sequence of cluster labels ordered as ``network.nodes.index``.
+
     """
+    _, degrees = _cluster_sums(network, cluster_mapping)
     m = network.number_of_edges()
-    qmax: float = 2*m
-    for v in network.nodes.uids:
-        for w in network.nodes.uids:
-            if cluster_mapping[v] == cluster_mapping[w]:
-                qmax -= network.degrees()[v]*network.degrees()[w]/(2*m)
-
-    return qmax/(2*m)
+    return (2*m - np.sum(degrees**2)/(2*m))/(2*m)
 
 
 def Q_assortativity_coefficient(network: Network, cluster_mapping) -> float:
@@ -57,5 +94,70 @@ def Q_assortativity_coefficient(network: Network, cluster_mapping) -> float:
 
     for a given network and cluster mapping
     """
-    return (Q_modularity(network, cluster_mapping) /
-            Q_max_modularity(network, cluster_mapping))
+    within, degrees = _cluster_sums(network, cluster_mapping)
+    m = network.number_of_edges()
+    expected = np.sum(degrees**2)/(2*m)
+    return (within - expected) / (2*m - expected)
+
+
+def cluster_labels(network: Network,
+                   cluster_mapping: Union[Dict, Sequence,
+                                          np.ndarray]) -> np.ndarray:
+    """Returns consecutive integer cluster labels ordered by the node index.
+
+    Parameters
+    ----------
+    network : Network
+
+        The network of the clustered nodes.
+
+    cluster_mapping : dict or array-like
+
+        Either a dictionary mapping node uids to cluster labels or a
+        sequence of cluster labels ordered as ``network.nodes.index``.
+
+    Returns
+    -------
+    np.ndarray
+
+        Returns an integer array with labels in the range ``[0, k)``, where
+        k is the number of clusters.
+
+    """
+    if isinstance(cluster_mapping, dict):
+        codes: dict = {}
+        return np.fromiter(
+            (codes.setdefault(cluster_mapping[v], len(codes))
+             for v in network.nodes.keys()),
+            dtype=np.int64, count=network.number_of_nodes())
+
+    labels = np.asarray(cluster_mapping)
+    if len(labels) != network.number_of_nodes():
+        LOG.error('The number of labels does not match the number of nodes')
+        raise ValueError
+    return np.unique(labels, return_inverse=True)[1].reshape(-1)
+
+
+def _cluster_sums(network: Network,
+                  cluster_mapping: Union[Dict, Sequence, np.ndarray]
+                  ) -> Tuple[float, np.ndarray]:
+    """Helper function returning the edges within and degrees per cluster."""
+    labels = cluster_labels(network, cluster_mapping)
+
+    A = network.adjacency_matrix().tocoo()
+    within = float(np.sum(A.data[labels[A.row] == labels[A.col]]))
+
+    degrees = np.fromiter(network.degrees().values(), dtype=float,
+                          count=network.number_of_nodes())
+    return within, np.bincount(labels, weights=degrees)
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
@@ -9,6 +9,7 @@
 # =============================================================================
 
 import pytest
+import numpy as np
 from pathpy import Network
 import pathpy as pp
 
@@ -47,6 +48,42 @@ def test_adjacency_matrix():
     assert A2[1, 2] == 1.0
 
 
+def test_matrix_cache():
+    """Test the caching of the matrices of a network."""
+    net = Network()
+    net.add_edges(('a', 'b'), ('b', 'c'))
+
+    A = net.adjacency_matrix()
+    A[0, 1] = 5
+    assert net.adjacency_matrix()[0, 1] == 1.0
+    assert net.cache.info() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    net.edges['a', 'b']['weight'] = 3
+    assert net.adjacency_matrix(weight=True)[0, 1] == 3
+    net.edges['a', 'b']['weight'] = 4
+    assert net.adjacency_matrix(weight=True)[0, 1] == 4
+
+    net.add_edge('c', 'a')
+    assert net.adjacency_matrix().shape == (3, 3)
+    assert net.adjacency_matrix()[2, 0] == 1.0
+    assert net.cache.info()['size'] == 1
+
+
+def test_laplacian_matrix():
+    """Test the Laplacian matrix of a network."""
+    net = Network(directed=False)
+    net.add_edges(('a', 'b'), ('b', 'c'))
+
+    L = net.laplacian_matrix()
+    assert L[1, 1] == 2.0
+    assert L[0, 1] == -1.0
+    assert L.sum() == 0.0
+
+    L = net.laplacian_matrix(normalized=True)
+    assert L[0, 0] == 1.0
+    assert L[0, 1] == pytest.approx(-0.5**0.5)
+
+
 def test_distance_matrix():
     """Test the disance matrix of a network."""
     net = pp.Network()
@@ -63,6 +100,67 @@ def test_distance_matrix():
     assert net.distance_matrix()[0, 3] == 2
 
 
+def test_single_source_shortest_paths():
+    """Test the shortest paths from a single source."""
+    net = pp.Network()
+    net.add_edges(('a', 'x'), ('x', 'c'), ('a', 'y'), ('y', 'c'), ('d', 'a'))
+    dist, paths = pp.algorithms.shortest_paths.single_source_shortest_paths(
+        net, 'a')
+    assert list(dist) == [0, 1, 2, 1, float('inf')]
+    assert paths['c'] == ('a', 'x', 'c')
+    assert paths['d'] is None
+
+    net.edges['a', 'x']['weight'] = 3
+    dist, paths = pp.algorithms.shortest_paths.single_source_shortest_paths(
+        net, 'a', weight=True)
+    assert dist[net.nodes.index['c']] == 2
+    assert paths['c'] == ('a', 'y', 'c')
+
+    tree = pp.algorithms.shortest_paths.shortest_path_tree(net, 'a')
+    assert tree.number_of_edges() == 3
+
+
+@pytest.mark.parametrize('bidirectional', (False, True))
+def test_shortest_path(bidirectional):
+    """Test the shortest path between a pair of nodes."""
+    net = pp.Network()
+    net.add_edges(('a', 'x'), ('x', 'c'), ('a', 'y'), ('y', 'z'), ('z', 'c'))
+    shortest_path = pp.algorithms.shortest_paths.shortest_path
+
+    assert shortest_path(net, 'a', 'c', bidirectional=bidirectional) == (
+        2, ('a', 'x', 'c'))
+    assert shortest_path(net, 'c', 'a', bidirectional=bidirectional) == (
+        float('inf'), None)
+
+    net.edges['a', 'x']['weight'] = 5
+    assert shortest_path(net, 'a', 'c', weight=True,
+                         bidirectional=bidirectional) == (
+                             3, ('a', 'y', 'z', 'c'))
+
+
+def test_distance_matrix_memmap(tmp_path):
+    """Test the distance matrix written to a memory-mapped file."""
+    net = pp.Network(directed=False)
+    net.add_edges(('a', 'x'), ('x', 'y'), ('y', 'c'))
+    D = pp.algorithms.shortest_paths.distance_matrix(
+        net, out=str(tmp_path / 'distances.dat'))
+
+    assert isinstance(D, np.memmap)
+    assert (D == net.distance_matrix()).all()
+
+
+def test_eccentricity():
+    """Test the eccentricity of the nodes."""
+    net = pp.Network(directed=False)
+    net.add_edges(('a', 'x'), ('x', 'c'))
+    ecc = pp.algorithms.shortest_paths.eccentricity(net)
+    assert ecc == {'a': 2, 'x': 1, 'c': 2}
+
+    net.add_node('d')
+    ecc = pp.algorithms.shortest_paths.eccentricity(net)
+    assert ecc['a'] == np.inf
+
+
 def test_all_shortest_paths():
     """Test all shortest paths in a network."""
     net = pp.Network()
@@ -106,6 +204,46 @@ def test_betweenness_centrality(net):
     c = pp.algorithms.centralities.betweenness_centrality(net)
     assert c['x'] == 2
 
+    c = pp.algorithms.centralities.betweenness_centrality(net, endpoints=True)
+    assert c['x'] == 6
+    assert c['a'] == 4
+
+    net = pp.Network(directed=True)
+    net.add_edges(('a', 'b'), ('b', 'd'), ('a', 'c'), ('c', 'd'))
+    c = pp.algorithms.centralities.betweenness_centrality(net)
+    assert c['b'] == 0.5
+    net.edges['a', 'b']['weight'] = 2
+    c = pp.algorithms.centralities.betweenness_centrality(net, weight=True)
+    assert c['b'] == 0
+    assert c['c'] == 1
+
+    c = pp.algorithms.centralities.betweenness_centrality(net, k=2, seed=1)
+    assert c == pp.algorithms.centralities.betweenness_centrality(
+        net, k=2, seed=1)
+
+
+def test_parallel_centralities(net):
+    """Test the centralities computed by multiple processes."""
+    bw = pp.algorithms.centralities.betweenness_centrality(net, n_jobs=2)
+    assert bw == pp.algorithms.centralities.betweenness_centrality(net)
+
+    cl = pp.algorithms.centralities.closeness_centrality(net, n_jobs=2)
+    assert cl == pp.algorithms.centralities.closeness_centrality(net)
+
+    D = pp.algorithms.shortest_paths.distance_matrix(net, n_jobs=2)
+    assert (D == net.distance_matrix()).all()
+
+
+def test_edge_betweenness_centrality():
+    """Test the edge betweenness centrality of a network."""
+    net = pp.Network(directed=False)
+    net.add_edge('a', 'x', uid='e1')
+    net.add_edge('x', 'b', uid='e2')
+    net.add_edge('b', 'c', uid='e3')
+    c = pp.algorithms.centralities.edge_betweenness_centrality(net)
+    assert c['e1'] == 6
+    assert c['e2'] == 8
+
     # print(net.adjacency_matrix().todense())
     # c = pp.algorithms.centralities.betweenness_centrality(net)
     # print(c['b'])
@@ -132,6 +270,33 @@ def test_degree_centrality():
     assert c['a'] == 0
 
 
+@pytest.mark.parametrize('method', ('power', 'gauss-seidel'))
+def test_pagerank(method):
+    """Test the PageRank of the nodes."""
+    net = pp.Network(directed=True)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'))
+    pagerank = pp.algorithms.centralities.pagerank
+
+    # solution of the linear system with the dangling node d
+    alpha = 0.85
+    T = np.array([[0, 1, 0, 0], [0, 0, 1, 0], [.5, 0, 0, .5],
+                  [.25, .25, .25, .25]])
+    G = alpha * T + (1 - alpha) / 4
+    w, v = np.linalg.eig(G.T)
+    x = np.real(v[:, np.argmax(np.real(w))])
+    x /= x.sum()
+
+    pr = pagerank(net, alpha=alpha, method=method)
+    assert np.allclose([pr[v] for v in 'abcd'], x)
+    assert sum(pr.values()) == pytest.approx(1.0)
+
+    # the previous solution converges immediately
+    assert pagerank(net, x0=pr, max_iter=1, method=method) == pytest.approx(pr)
+
+    pr = pagerank(net, personalization={'a': 1}, method=method)
+    assert pr['a'] > pr['b'] > pr['c'] > pr['d']
+
+
 def test_rank_centralities():
     """Test the betweenness centrality of a network."""
     centralities = {'a': .2, 'b': .8, 'c': .5}
@@ -146,7 +311,24 @@ def test_find_connected_components():
     net.add_edge('b', 'c')
     net.add_edge('x', 'y')
     cn = pp.algorithms.components.find_connected_components(net)
-    # print(cn)
+    assert sorted(map(sorted, cn.values())) == [['a', 'b', 'c'], ['x', 'y']]
+
+    net = Network(directed=True)
+    net.add_edges(('a', 'b'), ('b', 'a'), ('b', 'c'))
+    k, labels = pp.algorithms.components.connected_components(net)
+    assert k == 2 and labels[0] == labels[1] != labels[2]
+    k, labels = pp.algorithms.components.connected_components(net, 'weak')
+    assert k == 1 and np.all(labels == 0)
+
+
+def test_connected_components_chain():
+    """Test the components of a chain deeper than the recursion limit."""
+    n = 20000
+    net = Network.from_arrays(np.arange(n-1), np.arange(1, n))
+    k, _ = pp.algorithms.components.connected_components(net)
+    assert k == n
+    k, _ = pp.algorithms.components.connected_components(net, 'weak')
+    assert k == 1
 
 
 def test_largest_connected_component():
@@ -156,7 +338,42 @@ def test_largest_connected_component():
     net.add_edge('b', 'c')
     net.add_edge('x', 'y')
     lcc = pp.algorithms.components.largest_connected_component(net)
-    # print(lcc)
+    assert isinstance(lcc, pp.core.api.NetworkView)
+    assert list(lcc.nodes.keys()) == ['a', 'b', 'c']
+    assert lcc.number_of_edges() == 2
+    assert lcc.nodes['a'] is net.nodes['a']
+    assert lcc.successors['b'] == {net.nodes['a'], net.nodes['c']}
+    assert lcc.adjacency_matrix().sum() == 4
+
+    with pytest.raises(AttributeError):
+        lcc.add_edge('c', 'x')
+
+
+@pytest.mark.parametrize('directed', (False, True))
+def test_modularity_maximisation(directed):
+    """Test the community detection of two connected triangles."""
+    net = Network(directed=directed)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'),
+                  ('d', 'e'), ('e', 'f'), ('f', 'd'), ('c', 'd'))
+    cd = pp.algorithms.community_detection
+
+    for func in (cd.modularity_maximisation, cd.louvain, cd.leiden):
+        mapping, q = func(net, seed=1)
+        assert mapping['a'] == mapping['b'] == mapping['c']
+        assert mapping['d'] == mapping['e'] == mapping['f']
+        assert mapping['a'] != mapping['d']
+        assert q == pytest.approx(
+            pp.statistics.modularity.Q_modularity(net, mapping))
+
+    if not directed:
+        assert q == pytest.approx(5/14)
+
+    colors = cd.color_map(net, mapping)
+    assert colors['a'] == colors['c'] != colors['d']
+
+    # larger resolution values result in smaller communities
+    mapping, _ = cd.louvain(net, resolution=10.0, seed=1)
+    assert len(set(mapping.values())) > 2
 
 # =============================================================================
 # eof
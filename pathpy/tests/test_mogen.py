@@ -0,0 +1,169 @@
+#!/usr/bin/python -tt
+# -*- coding: utf-8 -*-
+# =============================================================================
+# File      : test_mogen.py -- Test environment for MOGen models
+# Author    : agent <agent@local>
+# Time-stamp: <Fri 2026-10-16 20:30 agent>
+#
+# Copyright (c) 2016-2020 Pathpy Developers
+# =============================================================================
+
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+import numpy as np
+import pathpy as pp
+from pathpy.core.path import PathCollection
+from pathpy.models.MOGen import MultiOrderMatrix, StateTable
+
+
+@pytest.fixture
+def paths():
+    """Generate paths with frequencies."""
+    paths = PathCollection()
+    paths.add('a', 'b', 'c', frequency=2)
+    paths.add('a', 'b', frequency=1)
+    paths.add('c', 'b', 'c', 'a', frequency=1)
+    return paths
+
+
+def test_multi_order_transitions(paths):
+    """Test the counting of the multi-order transitions."""
+    model = pp.MOGen(paths, max_order=2)
+    source, target, counts = model._get_multi_order_transitions(
+        2, verbose=False)
+    states = model._states
+    transitions = dict(zip(zip(states.tuples(source), states.tuples(target)),
+                           counts))
+
+    assert transitions == {
+        (('*',), ('a',)): 3, (('a',), ('a', 'b')): 3,
+        (('a', 'b'), ('b', 'c')): 2, (('b', 'c'), ('b', 'c', '+')): 2,
+        (('a', 'b'), ('a', 'b', '+')): 1, (('*',), ('c',)): 1,
+        (('c',), ('c', 'b')): 1, (('c', 'b'), ('b', 'c')): 1,
+        (('b', 'c'), ('c', 'a')): 1, (('c', 'a'), ('c', 'a', '+')): 1}
+
+
+def test_state_table():
+    """Test the integer encoded multi-order states."""
+    table, ids = StateTable.from_tuples([('*',), ('a', 'b'), ('b',),
+                                         ('a', 'b', '+')])
+    assert table.tuples(ids) == [('*',), ('a', 'b'), ('b',), ('a', 'b', '+')]
+    assert list(table.order[ids]) == [1, 2, 1, 3]
+    assert table.add(ids[1], table.labels.index('b')) == len(table) - 1
+    assert table.tuples([len(table) - 1]) == [('a', 'b', 'b')]
+    assert list(table.find(ids[1], [table.labels.index('b'), table.END])) == [
+        len(table) - 1, ids[3]]
+    assert table.find(ids[2], table.END) == -1
+
+    order = table.sort(ids, ends_last=True)
+    assert table.tuples(order) == [('*',), ('b',), ('a', 'b'), ('a', 'b', '+')]
+
+    matrix = MultiOrderMatrix(np.eye(4), dict(zip(table.tuples(ids), range(4))))
+    assert matrix.node_id_dict[('a', 'b', '+')] == 3
+    assert matrix.nodes == [('*',), ('a',), ('b',), ('b', '+')]
+
+
+def test_multi_order_matrices(paths):
+    """Test the sparse multi-order adjacency and transition matrices."""
+    model = pp.MOGen(paths, max_order=2)
+    A = model._get_multi_order_adjacency_matrix(2, verbose=False)
+    T = model._get_multi_order_transition_matrix(2, A=A, verbose=False)
+
+    assert A.matrix.format == 'csr' and T.matrix.format == 'csr'
+    assert A.matrix.sum() == 2*4 + 3 + 5
+    assert A.matrix[A.node_id_dict[('a', 'b')], A.node_id_dict[('b', 'c')]] == 2
+    ends = T.states.ends(T.ids)
+    assert np.allclose(np.ravel(T.matrix.sum(axis=1))[~ends], 1)
+
+    I = T.integrate_zero_order()
+    assert I.matrix.format == 'csr'
+    assert ('*',) not in I.node_id_dict
+    assert np.allclose(I.matrix.sum(axis=1), 1)
+
+    # the first-order end states are not in the table of the second order
+    size = len(model._states)
+    F = T.to_first_order()
+    assert F.matrix.format == 'csr'
+    assert F.nodes == [('*',), ('a',), ('b',), ('c',), ('a', '+'),
+                       ('b', '+'), ('c', '+')]
+    assert T.nodes == F.nodes
+    assert len(model._states) == size
+
+
+def test_log_likelihood(paths):
+    """Test the log-likelihood of the paths given a multi-order model."""
+    model = pp.MOGen(paths, max_order=2)
+    A = model._get_multi_order_adjacency_matrix(2, verbose=False)
+    T = model._get_multi_order_transition_matrix(2, A=A, verbose=False)
+
+    log_L = model._compute_log_likelihood(2, T, verbose=False)
+    assert log_L == pytest.approx(
+        np.sum(A.matrix.data * np.log(T.matrix[A.matrix.nonzero()].A1)))
+    assert log_L == pytest.approx(3*np.log(3/4) + np.log(1/4) +
+                                  4*np.log(2/3) + 2*np.log(1/3))
+
+    # transitions which are not in the model have probability zero
+    T.matrix[T.node_id_dict[('a', 'b')], T.node_id_dict[('b', 'c')]] = 0
+    T.matrix.eliminate_zeros()
+    assert model._compute_log_likelihood(2, T, verbose=False) == -np.inf
+
+
+def test_incremental_orders(paths):
+    """Test the reuse of the transitions of the previous order."""
+    model = pp.MOGen(paths, max_order=3)
+    for order in (1, 2, 3):
+        A = model._get_multi_order_adjacency_matrix(order, verbose=False)
+        T = model._get_multi_order_transition_matrix(order, A=A, verbose=False)
+        log_L = model._compute_log_likelihood(order, T, verbose=False)
+
+        # counting all transitions of the paths from scratch
+        full = pp.MOGen(paths, max_order=3)
+        B = full._get_multi_order_adjacency_matrix(order, verbose=False)
+        assert A.node_id_dict == B.node_id_dict
+        assert (A.matrix != B.matrix).nnz == 0
+
+        transitions, model._transitions = model._transitions, None
+        assert model._compute_log_likelihood(
+            order, T, verbose=False) == pytest.approx(log_L)
+        model._transitions = transitions
+
+    # the AIC of the order 2 is larger than the AIC of the order 1
+    model = pp.MOGen(paths, max_order=4).fit(verbose=False,
+                                             early_stopping=True)
+    assert model.optimal_maximum_order == 1
+    assert sorted(model.models) == [1, 2]
+    assert len(str(model).splitlines()) == 7
+
+
+def test_shared_executor(paths):
+    """Test fitting and predicting with a reused worker pool."""
+    model = pp.MOGen(paths, max_order=2).fit(no_of_processes=1, verbose=False)
+    with ProcessPoolExecutor(2) as executor:
+        shared = pp.MOGen(paths, max_order=2).fit(verbose=False,
+                                                  executor=executor)
+        generated = shared.predict(200, max_order=2, seed=1,
+                                   executor=executor)
+        assert generated == shared.predict(200, max_order=2, seed=1,
+                                           executor=executor)
+
+    for order in (1, 2):
+        assert shared.models[order]['log_L'] == pytest.approx(
+            model.models[order]['log_L'])
+        assert (shared.models[order]['A'].matrix !=
+                model.models[order]['A'].matrix).nnz == 0
+    assert shared._shared is None
+
+    # only paths of the second order model are generated
+    assert sum(generated.values()) == 200
+    assert set(generated) <= {('a', 'b', 'c'), ('a', 'b'), ('c', 'b', 'c', 'a'),
+                              ('a', 'b', 'c', 'a'), ('c', 'b', 'c')}
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
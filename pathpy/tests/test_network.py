@@ -9,6 +9,7 @@
 # =============================================================================
 
 import pytest
+import numpy as np
 from pathpy import Node, Edge, Network
 
 # Test network
@@ -695,6 +696,210 @@ def test_isub_networks():
     assert net_2.number_of_edges() == 2
 
 
+def test_csr():
+    """Test the integer indexed view of the network."""
+    net = Network()
+    net.add_node('x')
+    net.add_edges(('a', 'b'), ('b', 'c'), ('a', 'c'))
+
+    csr = net.csr
+    idx = net.nodes.index
+    assert csr.number_of_nodes() == 4
+    assert csr.number_of_edges() == 3
+    assert csr.uids == ('x', 'a', 'b', 'c')
+    assert sorted(csr.successors(idx['a'])) == [idx['b'], idx['c']]
+    assert sorted(csr.predecessors(idx['c'])) == [idx['a'], idx['b']]
+    assert list(csr.outdegrees()) == [0, 2, 1, 0]
+    assert list(csr.indegrees()) == [0, 0, 1, 2]
+    assert net.csr is csr
+
+    with pytest.raises(ValueError):
+        csr.indices[0] = 0
+
+    net.remove_node('x')
+    net.remove_edge('a', 'b')
+    net.add_edge('c', 'a', weight=2)
+
+    csr = net.csr
+    idx = net.nodes.index
+    assert csr.uids == ('a', 'b', 'c')
+    assert list(csr.successors(idx['c'])) == [idx['a']]
+    assert list(csr.outdegrees(weight=True)) == [1, 1, 2]
+    assert (csr.to_scipy(weight=True) != net.adjacency_matrix(
+        weight=True)).nnz == 0
+
+    net = Network(directed=False)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'c'))
+    csr = net.csr
+    assert list(csr.outdegrees()) == [1, 2, 2]
+    assert sorted(csr.successors(net.nodes.index['b'])) == [0, 2]
+    assert csr.in_indices is csr.indices
+
+
+def test_from_arrays():
+    """Test to create a network from arrays."""
+    net = Network.from_arrays(['a', 'b', 'c'], ['b', 'c', 'a'],
+                              uids=['x', 'y', 'z'],
+                              attributes={'weight': [1, 2, 3]},
+                              name='test')
+
+    assert net.shape == (3, 3)
+    assert net['name'] == 'test'
+    assert net.edges['y'].v.uid == 'b'
+    assert net.edges['z']['weight'] == 3
+    assert net.successors['a'] == {net.nodes['b']}
+    assert net.indegrees() == {'a': 1, 'b': 1, 'c': 1}
+    assert net.adjacency_matrix(weight=True)[2, 0] == 3
+
+    with pytest.raises(Exception):
+        Network.from_arrays(['a', 'a'], ['b', 'b'])
+
+    net = Network.from_arrays(['a', 'a'], ['b', 'b'], multiedges=True)
+    assert net.number_of_edges() == 2
+    assert net.outdegrees()['a'] == 2
+
+
+def test_from_edgelist():
+    """Test to create a network from an edge list."""
+    net = Network.from_edgelist([('a', 'b'), ('b', 'c', {'weight': 2})],
+                                directed=False)
+
+    assert net.shape == (3, 2)
+    assert net.edges['c', 'b']['weight'] == 2
+    assert net.degrees() == {'a': 1, 'b': 2, 'c': 1}
+
+
+def test_from_dataframe():
+    """Test to create a network with repeated rows from a data frame."""
+    pd = pytest.importorskip('pandas')
+    from pathpy.io.io import from_dataframe
+
+    df = pd.DataFrame({'v': ['a', 'b', 'a'], 'w': ['b', 'c', 'b'],
+                       'weight': [1, 2, 3]})
+    net = from_dataframe(df)
+
+    assert not net.multiedges
+    assert net.number_of_edges() == 3
+    assert net.adjacency_matrix(weight=False)[0, 1] == 2
+    assert net.adjacency_matrix(weight=True)[0, 1] == 4
+
+
+def test_csr_edge_collection():
+    """Test the CSR view after modifying the edge collection directly."""
+    net = Network()
+    net.add_edges(('a', 'b'), ('b', 'c'))
+    assert net.adjacency_matrix()[0, 1] == 1
+
+    # replace an edge without changing the number of edges
+    net.edges.remove(net.edges['a', 'b'])
+    net.edges.add(Edge(net.nodes['c'], net.nodes['a']))
+
+    idx = net.nodes.index
+    assert list(net.csr.successors(idx['a'])) == []
+    assert list(net.csr.successors(idx['c'])) == [idx['a']]
+    A = net.adjacency_matrix()
+    assert A[idx['a'], idx['b']] == 0
+    assert A[idx['c'], idx['a']] == 1
+
+
+def test_index():
+    """Test the cached index of the nodes."""
+    net = Network()
+    net.add_edges(('a', 'b'), ('b', 'c'))
+
+    index = net.nodes.index
+    assert index == {'a': 0, 'b': 1, 'c': 2}
+
+    # the cached index cannot be modified
+    with pytest.raises(TypeError):
+        index['x'] = 3
+    assert 'x' not in net.nodes.index
+
+    net.remove_node('a')
+    assert net.nodes.index == {'b': 0, 'c': 1}
+
+
+def test_remove_multiedge():
+    """Test to remove one of multiple edges between the same nodes."""
+    net = Network(directed=False, multiedges=True)
+    net.add_edge('a', 'b', uid='e1')
+    net.add_edge('a', 'b', uid='e2')
+    net.remove_edge('e1')
+
+    assert net.successors['a'] == {net.nodes['b']}
+    assert net.neighbors['b'] == {net.nodes['a']}
+    assert net.degrees() == {'a': 1, 'b': 1}
+
+    net.remove_node('a')
+    assert net.number_of_edges() == 0
+    assert net.degrees() == {'b': 0}
+
+
+def test_add_edge_scaling(monkeypatch):
+    """Test that adding an edge does not depend on the network size."""
+    m = 10000
+    net = Network.from_arrays(np.arange(m) % 1000, np.arange(m))
+    csr = net.csr
+    successors = net._properties['successors']
+
+    # count the edges whose properties are updated and fail on rebuilds
+    updated = []
+    add_edge_properties = net._add_edge_properties
+
+    def count(edge):
+        updated.append(edge)
+        add_edge_properties(edge)
+
+    monkeypatch.setattr(net, '_add_edge_properties', count)
+    monkeypatch.setattr(net._storage, 'clear',
+                        lambda: pytest.fail('the storage was rebuilt'))
+    monkeypatch.setattr(type(net.edges), '__iter__',
+                        lambda self: pytest.fail('all edges were visited'))
+
+    for i in range(10):
+        net.add_edge('x{}'.format(i), 'y{}'.format(i))
+
+    assert len(updated) == 10
+    assert net._properties['successors'] is successors
+    monkeypatch.undo()
+    assert net.number_of_edges() == m + 10
+    assert net.csr.number_of_edges() == m + 10
+    assert csr.number_of_edges() == m
+
+
+def test_network_view():
+    """Test subgraph and filtered views of a network."""
+    net = Network(directed=True)
+    net.add_edge('a', 'b', uid='ab', weight=1)
+    net.add_edge('b', 'c', uid='bc', weight=5)
+    net.add_edge('c', 'd', uid='cd', weight=3)
+
+    view = net.subgraph(['b', 'c', 'd'])
+    assert view.number_of_nodes() == 3
+    assert view.number_of_edges() == 2
+    assert view.nodes['b'] is net.nodes['b']
+    assert view.adjacency_matrix().sum() == 2
+    assert view.successors['b'] == {net.nodes['c']}
+    assert set(view.edges.keys()) == {'bc', 'cd'}
+
+    view = net.filter(edges=lambda e: e['weight'] > 2)
+    assert view.number_of_nodes() == 4
+    assert set(view.csr.edges) == {net.edges['bc'], net.edges['cd']}
+    assert view.degrees()['a'] == 0
+
+    view = net.edge_subgraph(['ab'])
+    assert list(view.nodes.keys()) == ['a', 'b']
+
+    with pytest.raises(AttributeError):
+        view.add_edge('b', 'a')
+
+    copy = view.materialize()
+    assert not isinstance(copy, type(view))
+    assert copy.edges['ab'] is net.edges['ab']
+    copy.add_edge('b', 'a')
+    assert copy.number_of_edges() == 2
+    assert net.number_of_edges() == 3
+
 # =============================================================================
 # eof
 #
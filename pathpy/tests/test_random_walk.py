@@ -0,0 +1,130 @@
+#!/usr/bin/python -tt
+# -*- coding: utf-8 -*-
+# =============================================================================
+# File      : test_random_walk.py -- Test environment for random walks
+# Author    : agent <agent@local>
+# Time-stamp: <Fri 2026-10-16 20:20 agent>
+#
+# Copyright (c) 2016-2020 Pathpy Developers
+# =============================================================================
+
+import pytest
+import numpy as np
+import pathpy as pp
+from pathpy.processes.random_walk import RandomWalk, TeleportationMatrix
+
+
+@pytest.fixture
+def net():
+    """Generate a directed network with a dangling node."""
+    net = pp.Network(directed=True)
+    net.add_edge('a', 'b', weight=1)
+    net.add_edge('a', 'c', weight=3)
+    net.add_edge('b', 'c', weight=1)
+    net.add_edge('c', 'a', weight=1)
+    net.add_edge('c', 'd', weight=1)
+    return net
+
+
+def test_transition_matrix(net):
+    """Test the transition matrix of a random walk."""
+    T = RandomWalk.transition_matrix(net, weight=True)
+    assert np.allclose(T.toarray(), [[0, .25, .75, 0],
+                                     [0, 0, 1, 0],
+                                     [.5, 0, 0, .5],
+                                     [0, 0, 0, 0]])
+
+    T = RandomWalk.transition_matrix(net, restart_prob=0.2)
+    assert isinstance(T, TeleportationMatrix)
+    dense = T.toarray()
+    assert np.allclose(dense.sum(axis=1), 1)
+    assert np.allclose(dense[3], .25)
+    assert dense[0, 1] == pytest.approx(.8 * .5 + .2 / 4)
+
+    x = np.arange(4.)
+    assert np.allclose(T @ x, dense @ x)
+    assert np.allclose(T.transpose() @ x, dense.T @ x)
+    assert np.allclose(T.row(2), dense[2])
+
+
+@pytest.mark.parametrize('restart_prob', (0, 0.2))
+def test_next_nodes(net, restart_prob):
+    """Test the sampling of transitions of many walkers."""
+    rw = RandomWalk(net, weight=True, restart_prob=restart_prob, seed=1)
+    T = RandomWalk.transition_matrix(net, weight=True,
+                                     restart_prob=restart_prob).toarray()
+
+    for i in range(3):
+        nodes = rw.next_nodes(np.full(100000, i))
+        freq = np.bincount(nodes, minlength=4) / len(nodes)
+        assert np.allclose(freq, T[i], atol=0.01)
+
+    nodes = rw.next_nodes(np.full(10, 3))
+    if restart_prob == 0:
+        assert np.all(nodes == -1)
+    else:
+        assert np.all(nodes >= 0)
+
+
+def test_walk_seed(net):
+    """Test that seeded random walks are reproducible."""
+    walks = [list(RandomWalk(net, start_node='a', seed=42).walk(20))
+             for _ in range(2)]
+    assert walks[0] == walks[1]
+    assert walks[0][-1] == 'd' or len(walks[0]) == 20
+
+
+def test_stationary_probabilities():
+    """Test the stationary probabilities of a periodic random walk."""
+    net = pp.Network(directed=True)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'b'))
+    rw = RandomWalk(net)
+    assert rw._stationary_probabilities is None
+    assert np.allclose(rw.stationary_probabilities(), [.2, .4, .4])
+
+    pi = rw.stationary_probabilities(method='gauss-seidel')
+    assert np.allclose(pi, [.2, .4, .4])
+
+
+def test_simulate(net, tmp_path):
+    """Test the simulation of many walkers in lockstep."""
+    rw = RandomWalk(net, seed=1)
+    W = rw.simulate(1000, 5, start_nodes=['a']*1000)
+    assert W.shape == (1000, 6) and W.dtype == np.int32
+    assert np.all(W[:, 0] == 0)
+
+    # walkers in the dangling node d stop
+    stopped = W[:, 1:] < 0
+    assert np.all(stopped[:, :-1] <= stopped[:, 1:])
+    assert np.all(W[:, :-1][(W[:, 1:] < 0) & (W[:, :-1] >= 0)] == 3)
+
+    W = RandomWalk(net, seed=1).simulate(
+        1000, 5, start_nodes=['a']*1000, out=str(tmp_path / 'walks.dat'))
+    assert isinstance(W, np.memmap)
+
+    paths = rw.to_paths(W)
+    assert sum(p['frequency'] for p in paths) == 1000
+    for p in paths:
+        assert p.start is net.nodes['a']
+        assert len(p) <= 5
+        for e in p.edges:
+            assert e is net.edges[e.v.uid, e.w.uid]
+
+    # edges are only created for teleportations
+    rw = RandomWalk(net, restart_prob=0.5, seed=1)
+    paths = rw.to_paths(rw.simulate(100, 5, start_nodes=['d']*100))
+    edges = [e for p in paths for e in p.edges]
+    assert all(e is net.edges[e.v.uid, e.w.uid] for e in edges
+               if (e.v.uid, e.w.uid) in net.edges)
+    assert any(e not in net.edges for e in edges)
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End:
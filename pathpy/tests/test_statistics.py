@@ -54,6 +54,8 @@ def test_degree_distribution():
 
     s = pp.statistics.degrees.degree_distribution(net)
     assert s == {2: 1/3, 1: 2/3}
+    assert all(isinstance(k, int) for k in s)
+    assert s[7] == 0.0
 
     s = pp.statistics.degrees.degree_distribution(net, weight=True)
     assert s == {3.1: 1/3, 2.1: 1/3, 1.: 1/3}
@@ -69,6 +71,15 @@ def test_degree_raw_moment():
     assert s == 4/3
 
     s = pp.statistics.degrees.degree_raw_moment(net, weight=True)
+    assert s == pytest.approx(6.2/3)
+
+    s = pp.statistics.degrees.molloy_reed_fraction(net)
+    assert s == pytest.approx(2/(4/3))
+
+    s = pp.statistics.degrees.degree_generating_function(net, 0.5)
+    assert s == pytest.approx(2/3 * 0.5 + 1/3 * 0.25)
+    s = pp.statistics.degrees.degree_generating_function(net, [0., 1.])
+    assert np.allclose(s, [0., 1.])
 
 
 def test_degree_central_moment():
@@ -77,11 +88,11 @@ def test_degree_central_moment():
     net.add_edge('a', 'b', weight=2.1)
     net.add_edge('a', 'c', weight=1.0)
 
-    s = pp.statistics.degrees.degree_central_moment(net)
-    # print(s)
+    s = pp.statistics.degrees.degree_central_moment(net, k=2)
+    assert s == pytest.approx(np.var([2, 1, 1]))
 
-    s = pp.statistics.degrees.degree_central_moment(net, weight=True)
-    # print(s)
+    s = pp.statistics.degrees.degree_central_moment(net, k=2, weight=True)
+    assert s == pytest.approx(np.var([3.1, 2.1, 1.]))
 
 
 def test_degree_assortativity():
@@ -91,10 +102,44 @@ def test_degree_assortativity():
     net.add_edge('a', 'c', weight=1.0)
 
     s = pp.statistics.degrees.degree_assortativity(net)
-    # print(s)
+    assert s == pytest.approx(-1.0)
 
-    # s = pp.statistics.degrees.degree_central_moment(net, weight=True)
-    # # print(s)
+    net = pp.Network(directed=True)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'), ('a', 'd'))
+    assert pp.statistics.degree_assortativity(
+        net, mode='out') == pytest.approx(-1/np.sqrt(2))
+    assert np.isnan(pp.statistics.degree_assortativity(net, mode='in'))
+    with pytest.raises(KeyError):
+        pp.statistics.degree_assortativity(net, mode='both')
+
+
+def test_attribute_assortativity():
+    """Test the attribute assortativity of a network."""
+    net = pp.Network(directed=False)
+    net.add_edges(('a', 'b'), ('c', 'd'), ('b', 'c'))
+    for v, color in zip('abcd', ['red', 'red', 'blue', 'blue']):
+        net.nodes[v]['color'] = color
+
+    s = pp.statistics.attribute_assortativity(net, 'color')
+    assert s == pytest.approx(1/3)
+
+
+def test_modularity():
+    """Test the modularity of a clustered network."""
+    net = pp.Network(directed=False)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'),
+                  ('d', 'e'), ('e', 'f'), ('f', 'd'), ('c', 'd'))
+    mapping = {'a': 0, 'b': 0, 'c': 0, 'd': 1, 'e': 1, 'f': 1}
+
+    q = pp.statistics.Q_modularity(net, mapping)
+    assert q == pytest.approx(12/14 - 2*(7/14)**2)
+    assert pp.statistics.Q_modularity(net, [0, 0, 0, 1, 1, 1]) == q
+    assert pp.statistics.Q_modularity(net, np.array(['x']*3+['y']*3)) == q
+
+    q_max = pp.statistics.Q_max_modularity(net, mapping)
+    assert q_max == pytest.approx(1 - 2*(7/14)**2)
+    assert pp.statistics.Q_assortativity_coefficient(
+        net, mapping) == pytest.approx(q/q_max)
 
 
 def test_local_clustering_coefficient():
@@ -108,6 +153,26 @@ def test_local_clustering_coefficient():
     net.add_edge('e', 'b', weight=1.0)
 
     s = pp.statistics.clustering.local_clustering_coefficient(net, 'b')
+    assert s == pytest.approx(2/6)
+
+    c = pp.statistics.clustering.local_clustering_coefficients(net)
+    assert c[net.nodes.index['a']] == 1.0
+    assert c[net.nodes.index['b']] == pytest.approx(2/6)
+    assert pp.statistics.clustering.avg_clustering_coefficient(
+        net) == pytest.approx(np.mean(c))
+
+
+def test_transitivity():
+    """Test the transitivity of a network."""
+    net = pp.Network(directed=False)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'))
+    assert pp.statistics.clustering.transitivity(net) == pytest.approx(0.6)
+
+    net = pp.Network(directed=True)
+    net.add_edges(('a', 'b'), ('b', 'c'), ('a', 'c'))
+    assert pp.statistics.clustering.local_clustering_coefficient(
+        net, 'a') == 0.5
+    assert pp.statistics.clustering.transitivity(net) == 0.5
     # s = pp.statistics.degrees.degree_central_moment(net, weight=True)
     # # print(s)
 
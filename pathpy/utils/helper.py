@@ -7,6 +7,7 @@
 #
 # Copyright (c) 2016-2019 Pathpy Developers
 # =============================================================================
+import numpy as np
 
 
 def window(iterable, size=2):
@@ -21,6 +22,29 @@ def window(iterable, size=2):
         yield win
 
 
+def cumulative_rows(matrix):
+    """Cumulative probabilities of a sparse matrix offset by the row index.
+
+    The cumulative probabilities of the stored entries of row ``i`` lie in
+    ``(i, i + 1]``, such that the whole array is increasing and the entry of
+    any row can be sampled by a single binary search of ``i + u`` for a
+    uniform ``u`` in ``[0, 1)``. The matrix has to be in CSR format.
+
+    """
+    counts = np.diff(matrix.indptr)
+    rows = np.repeat(np.arange(matrix.shape[0]), counts)
+    cumulative = np.cumsum(matrix.data)
+    offset = np.concatenate(([0.], cumulative))[matrix.indptr[:-1]]
+    total = np.ravel(matrix.sum(axis=1))
+    cumulative = rows + np.divide(
+        cumulative - offset[rows], total[rows],
+        out=np.ones_like(cumulative, dtype=float), where=total[rows] > 0)
+    # the last entry of each row is exactly i + 1 despite rounding
+    last = matrix.indptr[1:][counts > 0] - 1
+    cumulative[last] = rows[last] + 1.0
+    return cumulative
+
+
 # =============================================================================
 # eof
 #
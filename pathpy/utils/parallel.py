@@ -0,0 +1,213 @@
+"""Parallel execution of algorithms over partitions of nodes."""
+# !/usr/bin/python -tt
+# -*- coding: utf-8 -*-
+# =============================================================================
+# File      : parallel.py -- Process pools sharing arrays via shared memory
+# Author    : agent <agent@local>
+# Time-stamp: <Fri 2026-10-16 19:51 agent>
+#
+# Copyright (c) 2016-2020 Pathpy Developers
+# =============================================================================
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from pathpy import logger
+
+# create logger
+LOG = logger(__name__)
+
+# arrays attached by a worker process, cached by the shared memory names
+_ATTACHED: Dict[Tuple[str, ...], Tuple[list, Dict[str, np.ndarray]]] = {}
+
+
+def cpu_count(n_jobs: Optional[int] = None) -> int:
+    """Returns the number of processes for the given ``n_jobs``.
+
+    ``None`` corresponds to a single process, while negative values count
+    backwards from the number of available CPUs, i.e. ``-1`` uses all CPUs.
+
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+class SharedArrays:
+    """Numpy arrays copied to shared memory blocks.
+
+    The arrays can be accessed by worker processes without pickling them,
+    based on the picklable ``spec`` of the shared memory blocks. Further
+    arrays can be added later, e.g. to reuse the blocks for multiple calls
+    of :py:func:`map_partitions`. The blocks are released when the object
+    is closed, e.g. at the end of a ``with`` statement.
+
+    Parameters
+    ----------
+    arrays : Dict[str, np.ndarray]
+
+        Arrays to share with the worker processes.
+
+    """
+
+    def __init__(self, arrays: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """Initialize the shared memory blocks."""
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.spec: List[Tuple[str, str, tuple, str]] = []
+        self.update(arrays or {})
+
+    def __enter__(self) -> SharedArrays:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._blocks
+
+    def update(self, arrays: Dict[str, np.ndarray]) -> None:
+        """Copy arrays to shared memory, replacing arrays with the same key."""
+        self.remove(*[key for key in arrays if key in self._blocks])
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(
+                create=True, size=max(1, array.nbytes))
+            shared = np.ndarray(array.shape, dtype=array.dtype,
+                                buffer=block.buf)
+            shared[...] = array
+            self._blocks[key] = block
+            self.arrays[key] = shared
+            self.spec.append((key, block.name, array.shape, array.dtype.str))
+
+    def remove(self, *keys: str) -> None:
+        """Release the shared memory blocks of the given keys."""
+        for key in keys:
+            # views have to be dropped before the block can be closed
+            del self.arrays[key]
+            block = self._blocks.pop(key)
+            block.close()
+            block.unlink()
+        self.spec = [s for s in self.spec if s[0] in self._blocks]
+
+    def close(self) -> None:
+        """Release the shared memory blocks."""
+        self.remove(*list(self._blocks))
+
+
+def attach(spec: List[Tuple[str, str, tuple, str]]) -> Dict[str, np.ndarray]:
+    """Returns the arrays of a shared memory specification.
+
+    The arrays are attached once per process and cached afterwards. The
+    shared memory blocks are owned and unlinked by the parent process.
+
+    """
+    key = tuple(name for _, name, _, _ in spec)
+    if key not in _ATTACHED:
+        blocks = []
+        arrays = {}
+        for name, block_name, shape, dtype in spec:
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        _ATTACHED.clear()
+        _ATTACHED[key] = (blocks, arrays)
+    return _ATTACHED[key][1]
+
+
+def _run(func: Callable, spec: list, part: np.ndarray, args: tuple) -> Any:
+    """Helper function executing a function in a worker process."""
+    return func(attach(spec), part, *args)
+
+
+def map_partitions(func: Callable,
+                   arrays: Union[Dict[str, np.ndarray], SharedArrays],
+                   items: np.ndarray, *args: Any, n_jobs: Optional[int] = None,
+                   executor: Optional[Executor] = None) -> List[Any]:
+    """Applies a function to partitions of items in parallel.
+
+    The function is called as ``func(arrays, part, *args)`` for disjoint
+    partitions ``part`` of the ``items``, e.g. of the source nodes of a
+    shortest path algorithm, and has to be defined on module level. If more
+    than one process is used, the ``arrays`` are shared with the worker
+    processes via shared memory instead of pickling them for every call.
+
+    Parameters
+    ----------
+    func : Callable
+
+        Function which is applied to the partitions.
+
+    arrays : Dict[str, np.ndarray] or SharedArrays
+
+        Arrays shared by all calls, e.g. the CSR arrays of a network. Arrays
+        which are already in shared memory are used without copying them.
+
+    items : np.ndarray
+
+        Items which are partitioned.
+
+    n_jobs : int, optional (default = None)
+
+        Number of processes used. If ``None`` or ``1`` the function is
+        called once in the current process, ``-1`` uses all CPUs.
+
+    executor : Executor, optional (default = None)
+
+        Executor used instead of creating a new process pool, e.g. a pool
+        which is reused for multiple calls.
+
+    Returns
+    -------
+    list
+
+        Returns the results of the partitions, which have to be reduced by
+        the caller.
+
+    """
+    processes = cpu_count(n_jobs)
+    if (executor is None and processes == 1) or len(items) == 0:
+        if isinstance(arrays, SharedArrays):
+            arrays = arrays.arrays
+        return [func(arrays, items, *args)]
+
+    if executor is not None:
+        processes = max(processes, getattr(executor, '_max_workers', 1))
+
+    # use multiple partitions per process to balance the load
+    parts = [p for p in np.array_split(items, 4 * processes) if len(p)]
+
+    if isinstance(arrays, SharedArrays):
+        return _submit(func, arrays.spec, parts, args, processes, executor)
+
+    with SharedArrays(arrays) as shared:
+        return _submit(func, shared.spec, parts, args, processes, executor)
+
+
+def _submit(func: Callable, spec: list, parts: List[np.ndarray], args: tuple,
+            processes: int, executor: Optional[Executor]) -> List[Any]:
+    """Helper function submitting the partitions to the executor."""
+    if executor is None:
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(_run, func, spec, p, args) for p in parts]
+            return [f.result() for f in futures]
+
+    futures = [executor.submit(_run, func, spec, p, args) for p in parts]
+    return [f.result() for f in futures]
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 79
+# End: